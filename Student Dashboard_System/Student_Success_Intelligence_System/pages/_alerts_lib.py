@@ -1,59 +1,111 @@
 import os
 import ssl
 import smtplib
+import threading
 from email.message import EmailMessage
 from datetime import datetime
 import streamlit as st
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, Iterable, List, Dict, Tuple, Optional, Sequence
+
+
+from pages._ui import rerun_fragment
+from utils import notification_store
+
+# (data version, rules version) pairs whose rule-engine notifications are already in the shared store
+# (or being written by a sync thread)
+_seeded_versions: set = set()
+_seeded_lock = threading.Lock()
 
 
 def _ensure_alerts_state() -> None:
-    """Ensure the session_state containers for alerts and interventions exist."""
-    if 'notifications' not in st.session_state:
-        st.session_state['notifications'] = {}  # student_id -> list[dict]
+    """Ensure the session_state containers for acknowledgements and interventions exist.
+
+    Notifications themselves live in the shared notification store (alerts.db).
+    """
     if 'alert_acknowledged' not in st.session_state:
         st.session_state['alert_acknowledged'] = set()
     if 'interventions' not in st.session_state:
         st.session_state['interventions'] = {}
 
 
+def _as_note(n: Dict) -> Dict:
+    return {
+        'id': n['id'],
+        'subject': n['subject'],
+        'message': n['message'] or '',
+        'advisor': n['advisor'] or 'Advisor',
+        'date': n['created_at'],
+        'acknowledged': n['acknowledged_at'] is not None,
+    }
+
+
 def add_alert(student_id: str, subject: str, message: str, advisor: str = 'Advisor') -> Dict:
     """Add an in-app alert/notification for a student and return the note dict."""
-    _ensure_alerts_state()
-    note = {
-        'subject': subject,
-        'message': message,
-        'advisor': advisor,
-        'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        'acknowledged': False,
-    }
-    st.session_state['notifications'].setdefault(student_id, []).append(note)
-    return note
+    return _as_note(notification_store.add_notification(student_id, subject, message, advisor))
+
+
+def _publish_notes(students_with_alerts: Iterable[Dict], rescored: Optional[set], version: Tuple) -> int:
+    if rescored is not None:
+        students_with_alerts = (s for s in students_with_alerts if s.get('student_id') in rescored)
+    try:
+        return notification_store.add_notifications(notification_store.alert_notes(students_with_alerts))
+    except Exception:
+        # Let the next page load try again
+        with _seeded_lock:
+            _seeded_versions.discard(version)
+        return 0
+
+
+def sync_rule_engine_alerts(students_with_alerts: Sequence[Dict], data_version: int,
+                            base_version: Optional[int] = None, rescored: Optional[Iterable[str]] = None,
+                            rules_version: str = '', published: bool = False) -> Optional[threading.Thread]:
+    """Publish rule-engine alerts as notifications, once per data and rules version per process.
+
+    Every session shares the result, so a new session does not regenerate
+    notifications for the whole cohort. When the snapshot was patched from
+    ``base_version`` and that version was already published, only the
+    ``rescored`` students are published. A ``published`` snapshot was
+    already notified by the batch job. The notes are built and written on a
+    background thread, so the page never reads the whole alert list;
+    returns that thread, or None when there is nothing to publish.
+    """
+    with _seeded_lock:
+        if (data_version, rules_version) in _seeded_versions:
+            return None
+        partial = (base_version, rules_version) in _seeded_versions and rescored is not None
+        _seeded_versions.add((data_version, rules_version))
+    if published:
+        return None
+    thread = threading.Thread(target=_publish_notes, name="alert-notes", daemon=True,
+                              args=(students_with_alerts, set(rescored) if partial else None,
+                                    (data_version, rules_version)))
+    thread.start()
+    return thread
 
 
 def get_alerts_for_student(student_id: str) -> List[Dict]:
-    _ensure_alerts_state()
-    return st.session_state['notifications'].get(student_id, [])
+    return [_as_note(n) for n in notification_store.notifications_for_student(student_id)]
 
 
-def acknowledge_alert(student_id: str, index: int) -> bool:
+def acknowledge_alert(student_id: str, notification_id: str) -> bool:
     """Mark an alert acknowledged and optionally record an intervention entry.
 
     Returns True if successful, False otherwise.
     """
     _ensure_alerts_state()
     try:
-        notes = st.session_state['notifications'].get(student_id, [])
-        if index < 0 or index >= len(notes):
+        note = notification_store.get_notification(notification_id)
+        if note is None or note['student_id'] != student_id:
+            return False
+        if not notification_store.acknowledge(notification_id, st.session_state.get('user')):
             return False
-        note = notes.pop(index)
         st.session_state['alert_acknowledged'].add(student_id)
 
         # record a short intervention entry automatically
         intervention = {
             'type': 'Notification Acknowledged',
-            'advisor': note.get('advisor', 'Advisor'),
-            'notes': note.get('message', ''),
+            'advisor': note.get('advisor') or 'Advisor',
+            'notes': note.get('message') or '',
             'date': datetime.now().strftime("%Y-%m-%d %H:%M")
         }
         st.session_state['interventions'].setdefault(student_id, []).append(intervention)
@@ -98,3 +150,26 @@ def send_email(to_address: str, subject: str, body: str) -> Tuple[bool, str]:
         return True, 'Email sent'
     except Exception as e:
         return False, f'Email error: {e}'
+
+
+def render_keyset_pages(state_key: str, fetch: Callable, render_rows: Callable) -> None:
+    """Render one page of a keyset-paginated reader with Newer/Older buttons.
+
+    ``fetch(after)`` returns ``(rows, next_cursor)`` (see utils.alert_queries);
+    the stack of cursors already visited lives in ``st.session_state[state_key]``.
+    """
+    stack = st.session_state.setdefault(state_key, [None])
+    rows, next_cursor = fetch(stack[-1])
+    render_rows(rows)
+
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if len(stack) > 1 and st.button("⬅️ Newer", key=f"{state_key}_newer"):
+            stack.pop()
+            rerun_fragment()
+    with col_info:
+        st.caption(f"Page {len(stack)}")
+    with col_next:
+        if next_cursor is not None and st.button("Older ➡️", key=f"{state_key}_older"):
+            stack.append(next_cursor)
+            rerun_fragment()
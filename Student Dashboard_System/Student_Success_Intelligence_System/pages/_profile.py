@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 from pages import student_detail
-from pages.advisor_dashboard import load_data
+from utils.data_store import get_dataset
 
 
 def render(navigate_to):
@@ -12,12 +12,9 @@ def render(navigate_to):
     </div>
     """, unsafe_allow_html=True)
 
-    df = load_data()
-    ids = df['student_id'].tolist()
-    names = df['name'].tolist()
-    mapping = dict(zip([f"{i} - {n}" for i,n in zip(ids,names)], ids))
+    labels, mapping = get_dataset().selector_options()
 
-    choice = st.selectbox("Select student to view profile", options=["Choose..."] + list(mapping.keys()))
+    choice = st.selectbox("Select student to view profile", options=["Choose..."] + labels)
     if choice and choice != "Choose...":
         sid = mapping[choice]
         navigate_to('student-detail', sid)
@@ -0,0 +1,41 @@
+import re
+from pathlib import Path
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+
+THEME_PATH = Path(__file__).resolve().parent.parent / "static" / "theme.css"
+
+
+def _full_rerun_fragment(func=None, **_kwargs):
+    """Fallback for Streamlit versions without fragments: run as plain function."""
+    if func is None:
+        return lambda f: f
+    return func
+
+
+# st.fragment (1.37+), st.experimental_fragment (1.33-1.36) or a no-op decorator.
+# A fragment reruns on its own when one of its widgets is used, so an
+# interaction costs only that fragment's render instead of the whole page.
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or _full_rerun_fragment
+
+
+def rerun_fragment() -> None:
+    """Rerun just the calling fragment; falls back to a full rerun where that is not allowed."""
+    try:
+        st.rerun(scope="fragment")
+    except (TypeError, StreamlitAPIException):
+        st.rerun()
+
+
+def _minify_css(css: str) -> str:
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    return re.sub(r'\s*([{};:,>])\s*', r'\1', css).strip()
+
+
+@st.cache_resource(show_spinner=False)
+def theme_css() -> str:
+    """The app theme as one minified ``<style>`` block, read from static/theme.css once per process."""
+    return f"<style>{_minify_css(THEME_PATH.read_text(encoding='utf-8'))}</style>"
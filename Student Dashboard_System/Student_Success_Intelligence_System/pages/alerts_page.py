@@ -1,8 +1,67 @@
+import html
 import streamlit as st
 import pandas as pd
 from pages import student_detail
-from pages._alerts_lib import _ensure_alerts_state, get_alerts_for_student, acknowledge_alert, send_email
+from pages._alerts_lib import _ensure_alerts_state, get_alerts_for_student, acknowledge_alert, send_email, render_keyset_pages
+from pages._ui import fragment, rerun_fragment
 from utils.alert_logic import AlertSystem
+from utils import alert_queries, alert_store, notification_store
+
+
+@fragment
+def _render_rule_engine_alerts(navigate_to):
+    """Open rule-engine alerts from alerts.db, one keyset page at a time.
+
+    Runs as a fragment: paging, filtering and acknowledging rerun only this section.
+    """
+    st.markdown("### 🚨 Open Rule-Engine Alerts")
+    try:
+        open_counts = alert_queries.count_open_by_severity()
+        daily = alert_queries.counts_per_day()
+    except Exception as e:
+        st.warning(f"Alert log unavailable: {e}")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Critical", open_counts.get('critical', 0))
+    with col2:
+        st.metric("Warning", open_counts.get('warning', 0))
+    with col3:
+        st.metric("Total Open", sum(open_counts.values()))
+
+    if daily:
+        per_day = pd.DataFrame(daily).pivot(index='day', columns='alert_type', values='count').fillna(0)
+        st.bar_chart(per_day, height=220)
+
+    severity = st.radio("Severity", ["critical", "warning"], horizontal=True, key="open_alert_severity")
+    state_key = f"open_alerts_cursor_{severity}"
+
+    def render_rows(rows):
+        if not rows:
+            st.info("No open alerts")
+        for a in rows:
+            color = AlertSystem.get_alert_color(a['severity'])
+            message = html.escape(a['message'] or a['alert_type'] or '')
+            col_msg, col_view, col_ack = st.columns([4, 1, 1])
+            with col_msg:
+                st.markdown(f"""
+                <div style="border-left: 6px solid {color}; padding: 6px 12px; background: #fafafa; border-radius: 6px;">
+                    <strong>{html.escape(str(a['student_id']))}</strong> • {html.escape(a['alert_type'] or '')} — {message}<br/>
+                    <small>first seen {a['created_at'][:16]} • last seen {(a['last_seen_at'] or a['created_at'])[:16]} • {a['occurrence_count']}×</small>
+                </div>
+                """, unsafe_allow_html=True)
+            with col_view:
+                if st.button("View", key=f"open_alert_view_{a['id']}"):
+                    navigate_to('student-detail', a['student_id'])
+            with col_ack:
+                if st.button("Acknowledge", key=f"open_alert_ack_{a['id']}"):
+                    alert_store.acknowledge(a['student_id'], a['alert_type'],
+                                            acknowledged_by=st.session_state.get('user'))
+                    st.session_state.pop(state_key, None)
+                    rerun_fragment()
+
+    render_keyset_pages(state_key, lambda after: alert_queries.open_alerts(severity, after=after, limit=10), render_rows)
 
 
 def render(navigate_to):
@@ -13,20 +72,30 @@ def render(navigate_to):
     </div>
     """, unsafe_allow_html=True)
 
-    _ensure_alerts_state()
+    _render_rule_engine_alerts(navigate_to)
+
+    st.divider()
+    _render_notifications(navigate_to)
 
-    notifications = st.session_state.get('notifications', {})
 
-    if not notifications:
+@fragment
+def _render_notifications(navigate_to):
+    """Open notifications grouped by student; acknowledging reruns only this section."""
+    st.markdown("### 📬 Notifications")
+
+    _ensure_alerts_state()
+
+    if notification_store.count_open() == 0:
         st.info("No alerts at the moment")
         return
 
-    # Flatten notifications with student info
-    for student_id, notes in notifications.items():
-        if not notes:
-            continue
-        st.markdown(f"### Student {student_id}")
-        for i, n in enumerate(notes):
+    def render_notes(notes):
+        current_student = None
+        for n in notes:
+            student_id = n['student_id']
+            if student_id != current_student:
+                st.markdown(f"### Student {student_id}")
+                current_student = student_id
             # Severity inference from subject suffix created in advisor_dashboard (e.g., "GPA - CRITICAL")
             subj = n.get('subject', '')
             sev = 'warning'
@@ -36,30 +105,33 @@ def render(navigate_to):
                 sev = 'info'
 
             color = AlertSystem.get_alert_color(sev)
+            message = n['message'] or subj
             box = st.container()
             with box:
                 st.markdown(f"""
                 <div style="border-left: 6px solid {color}; padding: 8px 12px; background: #fafafa; border-radius: 6px;">
-                    <div><strong>{subj}</strong> — <small>{n['date']}</small></div>
-                    <div style="margin-top:6px;">{n['message']}</div>
+                    <div><strong>{html.escape(subj)}</strong> — <small>{n['created_at']}</small></div>
+                    <div style="margin-top:6px;">{html.escape(message)}</div>
                 </div>
                 """, unsafe_allow_html=True)
             col1, col2, col3 = st.columns([1,1,1])
             with col1:
-                if st.button("View Student", key=f"alert_view_{student_id}_{i}"):
+                if st.button("View Student", key=f"alert_view_{n['id']}"):
                     navigate_to('student-detail', student_id)
             with col2:
-                if st.button("Acknowledge", key=f"alert_ack_{student_id}_{i}"):
-                    ok = acknowledge_alert(student_id, i)
+                if st.button("Acknowledge", key=f"alert_ack_{n['id']}"):
+                    ok = acknowledge_alert(student_id, n['id'])
                     if ok:
-                        st.rerun()
+                        rerun_fragment()
                     else:
                         st.error("Failed to acknowledge")
             with col3:
-                if st.button("Resend Email", key=f"alert_resend_{student_id}_{i}"):
+                if st.button("Resend Email", key=f"alert_resend_{n['id']}"):
                     to_email = f"{student_id.lower()}@example.edu"
-                    sent, info = send_email(to_email, subj, n['message'])
+                    sent, info = send_email(to_email, subj, message)
                     if sent:
                         st.success(f"Email sent to {to_email}")
                     else:
                         st.warning(f"Email not sent: {info}")
+
+    render_keyset_pages("notifications_cursor", lambda after: notification_store.open_notifications(after=after, limit=20), render_notes)
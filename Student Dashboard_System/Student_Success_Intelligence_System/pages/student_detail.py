@@ -1,36 +1,37 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from pages._alerts_lib import get_alerts_for_student, acknowledge_alert
-
-@st.cache_data
-def load_data():
-    """Load student data from CSV or return mock data"""
-    try:
-        df = pd.read_csv("./data/student_performance_dataset.csv")
-        if len(df) == 0:
-            raise ValueError("CSV is empty")
-        return df
-    except:
-        # Mock data fallback
-        return pd.DataFrame({
-            'student_id': ['S001', 'S002', 'S003', 'S004', 'S005', 'S006', 'S007', 'S008'],
-            'name': ['John Smith', 'Emily Davis', 'Michael Chen', 'Sarah Johnson', 'David Martinez', 'Jessica Williams', 'Alex Brown', 'Lisa Anderson'],
-            'major': ['Engineering', 'Business', 'Computer Science', 'Arts', 'Engineering', 'Business', 'Computer Science', 'Arts'],
-            'gpa': [2.1, 2.4, 2.8, 3.0, 3.2, 3.5, 2.9, 3.1],
-            'year': ['Junior', 'Sophomore', 'Senior', 'Junior', 'Senior', 'Junior', 'Sophomore', 'Senior'],
-            'credits': [78, 65, 110, 95, 120, 88, 72, 105],
-        })
-
-def get_student_data(student_id, df):
-    """Get specific student data"""
-    if 'student_id' not in df.columns:
-        return None
-    student = df[df['student_id'] == student_id]
-    if len(student) > 0:
-        return student.iloc[0]
-    return None
+from pages._alerts_lib import get_alerts_for_student, acknowledge_alert, render_keyset_pages
+from pages._ui import fragment, rerun_fragment
+from utils import alert_queries
+from utils.figure_cache import cached_figure
+from utils.data_store import get_dataset
+from utils.lru import LRUCache
+
+SECTIONS = [
+    "📚 Academic Performance",
+    "📋 Attendance & Engagement",
+    "💰 Financial Overview",
+    "🔧 Intervention History",
+]
+
+# Per-student views shared by every session, keyed by (data version, student id),
+# and the worker that fills them ahead of Previous/Next navigation. At most
+# _MAX_PREFETCH views are queued or building at once; further requests are dropped.
+_views = LRUCache(1024)
+_prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-prefetch")
+_MAX_PREFETCH = 8
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+
+def get_student_data(student_id, dataset=None):
+    """Get specific student data (constant-time lookup on the dataset's id index)"""
+    return (dataset if dataset is not None else get_dataset()).student(student_id)
 
 def risk_level_from_gpa(gpa):
     """Determine risk level from GPA.
@@ -47,19 +48,276 @@ def risk_level_from_gpa(gpa):
         return "Medium"
     return "Low"
 
+def build_gpa_trend():
+    """Mock GPA trend line chart with the warning and at-risk lines"""
+    gpa_trend = pd.DataFrame({
+        'Semester': ['Fall 22', 'Spring 23', 'Fall 23', 'Spring 24', 'Fall 24', 'Spring 25'],
+        'GPA': [2.8, 2.7, 2.5, 2.3, 2.1, 2.1]
+    })
+
+    fig_gpa = px.line(
+        gpa_trend,
+        x='Semester',
+        y='GPA',
+        markers=True,
+        line_shape='linear',
+        color_discrete_sequence=['#002855'],
+        height=300
+    )
+    fig_gpa.add_hline(y=2.0, line_dash="dash", line_color="red", annotation_text="Academic Warning Line", annotation_position="right")
+    fig_gpa.add_hline(y=2.5, line_dash="dash", line_color="orange", annotation_text="At-Risk Line", annotation_position="right")
+    fig_gpa.update_layout(
+        hovermode='x unified',
+        margin=dict(l=0, r=0, t=30, b=0),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Arial, sans-serif", color="#002855")
+    )
+    fig_gpa.update_traces(marker=dict(size=8, color='#F5B700'))
+    return fig_gpa
+
+def build_attendance_bar():
+    """Mock attendance-by-course bar chart"""
+    attendance_df = pd.DataFrame({
+        'Course': ['MATH 301', 'CS 401', 'ENG 201', 'PHYS 350'],
+        'Attendance %': [75, 68, 92, 78]
+    })
+
+    fig_att = px.bar(
+        attendance_df,
+        x='Course',
+        y='Attendance %',
+        color='Attendance %',
+        color_continuous_scale=['#EF4444', '#F59E0B', '#10B981'],
+        height=300
+    )
+    fig_att.update_layout(
+        hovermode='x unified',
+        margin=dict(l=0, r=0, t=30, b=0),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(family="Arial, sans-serif", color="#002855")
+    )
+    return fig_att
+
+def build_student_view(dataset, student_id):
+    """Everything the header and sections derive from one student row (None if unknown)"""
+    student = dataset.student(student_id)
+    if student is None:
+        return None
+
+    safe_gpa = student.get('gpa', None)
+    has_gpa = safe_gpa is not None and pd.notna(safe_gpa)
+    base_gpa = float(safe_gpa) if has_gpa else 2.5
+    display_name = student.get('name', student.get('student_id', 'Student'))
+    if has_gpa:
+        academic_status = "Good Standing" if float(safe_gpa) >= 2.5 else "Academic Warning"
+    else:
+        academic_status = "Unknown"
+
+    return {
+        'student': student,
+        'student_id': student.get('student_id', ''),
+        'display_name': display_name,
+        'initials': "".join([p[0] for p in str(display_name).split()[:2]]) or "S",
+        'major': student.get('major', ''),
+        'year': student.get('year', ''),
+        'credits': int(student.get('credits', 0)),
+        'gpa_text': f"{float(safe_gpa):.2f}" if has_gpa else "N/A",
+        'risk_level': risk_level_from_gpa(safe_gpa),
+        'academic_status': academic_status,
+        'attendance_pct': min(100, max(50, int(75 + (base_gpa - 2.5) * 10))),
+        'engagement_score': min(100, max(20, int(60 + (base_gpa - 2.0) * 15))),
+    }
+
+
+def student_view(dataset, student_id):
+    """``build_student_view`` cached per data version and student"""
+    return _views.get_or_compute((dataset.version, student_id), lambda: build_student_view(dataset, student_id))
+
+
+def prefetch_students(dataset, student_ids):
+    """Warm the view cache for ``student_ids`` on the background worker (bounded, never blocks)"""
+    for sid in student_ids:
+        key = (dataset.version, sid)
+        if sid is None or key in _views:
+            continue
+        with _inflight_lock:
+            if key in _inflight or len(_inflight) >= _MAX_PREFETCH:
+                continue
+            _inflight.add(key)
+        future = _prefetcher.submit(student_view, dataset, sid)
+        future.add_done_callback(lambda _, key=key: _prefetch_done(key))
+
+
+def _prefetch_done(key):
+    with _inflight_lock:
+        _inflight.discard(key)
+
+
+def advisor_neighbours(student_id):
+    """Previous and next student ids in the advisor's current list order (None at either end)"""
+    order = st.session_state.get('advisor_order')
+    if order is None or len(order) == 0:
+        return None, None
+    hits = np.flatnonzero(order == student_id)
+    if len(hits) == 0:
+        return None, None
+    i = int(hits[0])
+    prev_id = order[i - 1] if i > 0 else None
+    next_id = order[i + 1] if i + 1 < len(order) else None
+    return prev_id, next_id
+
+
+def _render_header(view):
+    col1, col2, col3, col4, col5, col6 = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1.5])
+
+    risk_level = view['risk_level']
+    if risk_level == "High":
+        badge_html = '<span class="risk-badge high">🔴 High Risk</span>'
+    elif risk_level == "Medium":
+        badge_html = '<span class="risk-badge medium">🟡 Medium Risk</span>'
+    else:
+        badge_html = '<span class="risk-badge low">🟢 Low Risk</span>'
+
+    with col1:
+        st.markdown(f"<div style='font-size: 32px; text-align: center;'>{view['initials']}</div>", unsafe_allow_html=True)
+
+    with col2:
+        st.markdown(f"""
+        <div>
+            <h3 style='margin: 0; color: #002855;'>{view['display_name']}</h3>
+            <p style='margin: 5px 0; font-size: 13px; color: #666;'>{view['student_id']} • {view['major']}</p>
+            <p style='margin: 5px 0; font-size: 13px; color: #666;'>{view['year']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        st.markdown(badge_html, unsafe_allow_html=True)
+
+    with col3:
+        st.metric("GPA", view['gpa_text'])
+
+    with col4:
+        st.metric("Credits", view['credits'])
+
+    with col5:
+        st.metric("Year", view['year'])
+
+    with col6:
+        st.metric("Major", str(view['major'])[:10])
+
+
+def _render_academic(view, data_version):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Current GPA", view['gpa_text'])
+
+    with col2:
+        st.metric("Credits Completed", view['credits'])
+
+    with col3:
+        st.metric("Academic Status", view['academic_status'])
+
+    st.markdown("---")
+
+    # Mock GPA trend
+    st.markdown("### 📈 GPA Trend Over Time")
+    fig_gpa = cached_figure('student_gpa_trend', data_version, (), build_gpa_trend)
+    st.plotly_chart(fig_gpa, use_container_width=True)
+
+    # Current courses
+    st.markdown("### 📖 Current Courses (Spring 2025)")
+    courses_df = pd.DataFrame({
+        'Course': ['MATH 301', 'CS 401', 'ENG 201', 'PHYS 350'],
+        'Grade': ['B-', 'C+', 'A-', 'B'],
+        'Credits': [3, 4, 3, 3],
+        'Status': ['In Progress', 'In Progress', 'In Progress', 'In Progress']
+    })
+    st.dataframe(courses_df, use_container_width=True, hide_index=True)
+
+
+def _render_engagement(view, data_version):
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Attendance Rate", f"{view['attendance_pct']}%")
+
+    with col2:
+        st.metric("Engagement Score", view['engagement_score'])
+
+    with col3:
+        st.metric("Late Submissions", "2")
+
+    st.markdown("---")
+
+    # Mock attendance by course
+    st.markdown("### 📊 Attendance by Course")
+    fig_att = cached_figure('student_attendance', data_version, (), build_attendance_bar)
+    st.plotly_chart(fig_att, use_container_width=True)
+
+    # Engagement activities
+    st.markdown("### 🎯 Recent Engagement")
+    engagement_items = [
+        ("Study Group Participation", "Feb 10, 2025", "✓"),
+        ("Office Hours Visit", "Feb 8, 2025", "✓"),
+        ("Tutoring Session", "Feb 5, 2025", "✓"),
+        ("Library Lab Usage", "Daily Average", "Active"),
+    ]
+    for activity, date, status in engagement_items:
+        st.markdown(f"• **{activity}** — {date} ({status})")
+
+
+def _render_financial():
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Outstanding Balance", "$0")
+
+    with col2:
+        st.metric("Aid Status", "Current")
+
+    with col3:
+        st.metric("Enrollment Status", "Full-Time")
+
+    st.markdown("---")
+
+    # Payment history
+    st.markdown("### 💳 Payment History")
+    payment_df = pd.DataFrame({
+        'Date': ['2025-01-15', '2024-12-10', '2024-11-05'],
+        'Description': ['Spring 2025 Tuition', 'Fall 2024 Balance', 'Fall 2024 Tuition'],
+        'Amount': ['$5,000.00', '$2,500.00', '$5,000.00'],
+        'Status': ['Paid', 'Paid', 'Paid']
+    })
+    st.dataframe(payment_df, use_container_width=True, hide_index=True)
+
+    # Funding sources
+    st.markdown("### 📋 Funding Sources")
+    funding_df = pd.DataFrame({
+        'Type': ['Federal Loan', 'Institutional Grant', 'State Grant'],
+        'Amount': ['$4,000', '$1,500', '$2,000'],
+        'Status': ['Active', 'Active', 'Active']
+    })
+    st.dataframe(funding_df, use_container_width=True, hide_index=True)
+
+
 def render(student_id, navigate_to):
     """Render Student Detail View"""
     
     # Load data
-    df = load_data()
-    student = get_student_data(student_id, df)
+    dataset = get_dataset()
+    view = student_view(dataset, student_id)
 
-    if student is None:
+    if view is None:
         st.error(f"❌ Student {student_id} not found")
         if st.button("⬅️ Back to Advisor Dashboard"):
             navigate_to("advisor")
         return
 
+    # Warm the neighbours in the advisor's list while this student renders
+    prev_id, next_id = advisor_neighbours(student_id)
+    prefetch_students(dataset, (prev_id, next_id))
+
     # Header
     st.markdown("""
     <div class="header-container">
@@ -69,8 +327,16 @@ def render(student_id, navigate_to):
     """, unsafe_allow_html=True)
 
     # Navigation Bar
-    if st.button("⬅️ Back to Advisor Dashboard", use_container_width=True):
-        navigate_to("advisor")
+    col_prev, col_back, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if prev_id is not None and st.button("⬅️ Previous Student", use_container_width=True, key="detail_prev_student"):
+            navigate_to("student-detail", prev_id)
+    with col_back:
+        if st.button("⬅️ Back to Advisor Dashboard", use_container_width=True):
+            navigate_to("advisor")
+    with col_next:
+        if next_id is not None and st.button("Next Student ➡️", use_container_width=True, key="detail_next_student"):
+            navigate_to("student-detail", next_id)
 
     st.divider()
 
@@ -80,277 +346,114 @@ def render(student_id, navigate_to):
         st.markdown("### 🔔 Notifications")
         for i, n in enumerate(notes):
             st.warning(f"**{n['subject']}** — {n['date']}\n\n{n['message']}")
-            ack_key = f"ack_note_{student_id}_{i}"
+            ack_key = f"ack_note_{n['id']}"
             if st.button("Acknowledge", key=ack_key):
-                ok = acknowledge_alert(student_id, i)
+                ok = acknowledge_alert(student_id, n['id'])
                 if ok:
                     st.rerun()
                 else:
                     st.error("Could not acknowledge notification")
 
     # Student Header Info
-    col1, col2, col3, col4, col5, col6 = st.columns([0.5, 2, 1.5, 1.5, 1.5, 1.5])
+    _render_header(view)
 
-    gpa_val = student.get('gpa', None) if isinstance(student, pd.Series) else None
-    risk_level = risk_level_from_gpa(gpa_val)
-    if risk_level == "High":
-        badge_html = '<span class="risk-badge high">🔴 High Risk</span>'
-    elif risk_level == "Medium":
-        badge_html = '<span class="risk-badge medium">🟡 Medium Risk</span>'
-    else:
-        badge_html = '<span class="risk-badge low">🟢 Low Risk</span>'
-
-    with col1:
-        display_name = student.get('name', student.get('student_id', 'Student')) if isinstance(student, pd.Series) else 'Student'
-        initials = "".join([p[0] for p in str(display_name).split()[:2]]) or "S"
-        st.markdown(f"<div style='font-size: 32px; text-align: center;'>{initials}</div>", unsafe_allow_html=True)
+    st.divider()
 
-    with col2:
-        st.markdown(f"""
-        <div>
-            <h3 style='margin: 0; color: #002855;'>{student.get('name', student.get('student_id', 'Student'))}</h3>
-            <p style='margin: 5px 0; font-size: 13px; color: #666;'>{student.get('student_id', '')} • {student.get('major', '')}</p>
-            <p style='margin: 5px 0; font-size: 13px; color: #666;'>{student.get('year', '')}</p>
-        </div>
-        """, unsafe_allow_html=True)
-        st.markdown(badge_html, unsafe_allow_html=True)
+    # Sections: only the selected one is built (the choice sticks while
+    # flipping between students)
+    section = st.radio("Section", SECTIONS, horizontal=True, key="detail_section", label_visibility="collapsed")
 
-    with col3:
-        gpa_display = f"{float(student.get('gpa', 0.0)):.2f}" if pd.notna(student.get('gpa', None)) else "N/A"
-        st.metric("GPA", gpa_display)
+    if section == SECTIONS[0]:
+        _render_academic(view, dataset.version)
+    elif section == SECTIONS[1]:
+        _render_engagement(view, dataset.version)
+    elif section == SECTIONS[2]:
+        _render_financial()
+    else:
+        _render_intervention_history(student_id)
 
-    with col4:
-        st.metric("Credits", int(student.get('credits', 0)))
+    st.divider()
 
-    with col5:
-        st.metric("Year", student.get('year', ''))
+    # Back button
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col2:
+        if st.button("⬅️ Back to Advisor Dashboard", use_container_width=True, key="back_button_detail"):
+            navigate_to("advisor")
 
-    with col6:
-        major_val = str(student.get('major', ''))
-        st.metric("Major", major_val[:10])
 
-    st.divider()
+@fragment
+def _render_intervention_history(student_id):
+    """Alert history and intervention record; saving or paging reruns only this tab."""
+    st.markdown("### 🚨 Alert History")
+
+    def render_alert_rows(rows):
+        if not rows:
+            st.write("No rule-engine alerts logged for this student.")
+            return
+        st.dataframe(pd.DataFrame([{
+            'Type': a['alert_type'],
+            'Severity': a['severity'],
+            'Message': a['message'],
+            'First Seen': a['created_at'][:16],
+            'Last Seen': (a['last_seen_at'] or a['created_at'])[:16],
+            'Times Seen': a['occurrence_count'],
+        } for a in rows]), use_container_width=True, hide_index=True)
 
-    # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📚 Academic Performance",
-        "📋 Attendance & Engagement",
-        "💰 Financial Overview",
-        "🔧 Intervention History"
-    ])
+    try:
+        render_keyset_pages(
+            f"alert_history_cursor_{student_id}",
+            lambda after: alert_queries.alerts_for_student(student_id, after=after, limit=10),
+            render_alert_rows,
+        )
+    except Exception as e:
+        st.warning(f"Alert log unavailable: {e}")
 
-    # =========================================================================
-    # TAB 1: ACADEMIC PERFORMANCE
-    # =========================================================================
-    with tab1:
-        col1, col2, col3 = st.columns(3)
+    st.markdown("---")
+    st.markdown("### 📝 Intervention Record")
 
-        # Safe GPA access
-        safe_gpa = student.get('gpa', None)
-        gpa_text = f"{float(safe_gpa):.2f}" if (safe_gpa is not None and pd.notna(safe_gpa)) else "N/A"
+    # Display existing interventions
+    if student_id in st.session_state['interventions']:
+        for intervention in st.session_state['interventions'][student_id]:
+            st.info(f"**{intervention['type']}** (by {intervention['advisor']}) - {intervention['date']}\n\n{intervention['notes']}")
+    else:
+        st.write("No interventions recorded yet.")
 
-        with col1:
-            st.metric("Current GPA", gpa_text)
+    st.markdown("---")
 
-        with col2:
-            st.metric("Credits Completed", int(student.get('credits', 0)))
+    # Add new intervention form
+    st.markdown("### ➕ Create New Intervention")
 
-        with col3:
-            if safe_gpa is not None and pd.notna(safe_gpa):
-                academic_status = "Good Standing" if float(safe_gpa) >= 2.5 else "Academic Warning"
-            else:
-                academic_status = "Unknown"
-            st.metric("Academic Status", academic_status)
-
-        st.markdown("---")
-
-        # Mock GPA trend
-        st.markdown("### 📈 GPA Trend Over Time")
-        gpa_trend = pd.DataFrame({
-            'Semester': ['Fall 22', 'Spring 23', 'Fall 23', 'Spring 24', 'Fall 24', 'Spring 25'],
-            'GPA': [2.8, 2.7, 2.5, 2.3, 2.1, 2.1]
-        })
-
-        fig_gpa = px.line(
-            gpa_trend,
-            x='Semester',
-            y='GPA',
-            markers=True,
-            line_shape='linear',
-            color_discrete_sequence=['#002855'],
-            height=300
-        )
-        fig_gpa.add_hline(y=2.0, line_dash="dash", line_color="red", annotation_text="Academic Warning Line", annotation_position="right")
-        fig_gpa.add_hline(y=2.5, line_dash="dash", line_color="orange", annotation_text="At-Risk Line", annotation_position="right")
-        fig_gpa.update_layout(
-            hovermode='x unified',
-            margin=dict(l=0, r=0, t=30, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Arial, sans-serif", color="#002855")
-        )
-        fig_gpa.update_traces(marker=dict(size=8, color='#F5B700'))
-        st.plotly_chart(fig_gpa, use_container_width=True)
-
-        # Current courses
-        st.markdown("### 📖 Current Courses (Spring 2025)")
-        courses_df = pd.DataFrame({
-            'Course': ['MATH 301', 'CS 401', 'ENG 201', 'PHYS 350'],
-            'Grade': ['B-', 'C+', 'A-', 'B'],
-            'Credits': [3, 4, 3, 3],
-            'Status': ['In Progress', 'In Progress', 'In Progress', 'In Progress']
-        })
-        st.dataframe(courses_df, use_container_width=True, hide_index=True)
-
-    # =========================================================================
-    # TAB 2: ATTENDANCE & ENGAGEMENT
-    # =========================================================================
-    with tab2:
-        col1, col2, col3 = st.columns(3)
+    with st.form(f"intervention_form_{student_id}"):
+        col1, col2 = st.columns(2)
 
         with col1:
-            base_gpa = float(safe_gpa) if (safe_gpa is not None and pd.notna(safe_gpa)) else 2.5
-            attendance_pct = min(100, max(50, int(75 + (base_gpa - 2.5) * 10)))
-            st.metric("Attendance Rate", f"{attendance_pct}%")
+            int_type = st.selectbox(
+                "Intervention Type",
+                ["Academic Support", "Financial Aid", "Attendance Outreach", "Mental Health Referral", "Career Counseling", "Other"],
+                key=f"int_type_{student_id}"
+            )
 
         with col2:
-            base_gpa2 = float(safe_gpa) if (safe_gpa is not None and pd.notna(safe_gpa)) else 2.5
-            engagement_score = min(100, max(20, int(60 + (base_gpa2 - 2.0) * 15)))
-            st.metric("Engagement Score", engagement_score)
-
-        with col3:
-            st.metric("Late Submissions", "2")
-
-        st.markdown("---")
-
-        # Mock attendance by course
-        st.markdown("### 📊 Attendance by Course")
-        attendance_df = pd.DataFrame({
-            'Course': ['MATH 301', 'CS 401', 'ENG 201', 'PHYS 350'],
-            'Attendance %': [75, 68, 92, 78]
-        })
-
-        fig_att = px.bar(
-            attendance_df,
-            x='Course',
-            y='Attendance %',
-            color='Attendance %',
-            color_continuous_scale=['#EF4444', '#F59E0B', '#10B981'],
-            height=300
-        )
-        fig_att.update_layout(
-            hovermode='x unified',
-            margin=dict(l=0, r=0, t=30, b=0),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Arial, sans-serif", color="#002855")
-        )
-        st.plotly_chart(fig_att, use_container_width=True)
-
-        # Engagement activities
-        st.markdown("### 🎯 Recent Engagement")
-        engagement_items = [
-            ("Study Group Participation", "Feb 10, 2025", "✓"),
-            ("Office Hours Visit", "Feb 8, 2025", "✓"),
-            ("Tutoring Session", "Feb 5, 2025", "✓"),
-            ("Library Lab Usage", "Daily Average", "Active"),
-        ]
-        for activity, date, status in engagement_items:
-            st.markdown(f"• **{activity}** — {date} ({status})")
-
-    # =========================================================================
-    # TAB 3: FINANCIAL OVERVIEW
-    # =========================================================================
-    with tab3:
-        col1, col2, col3 = st.columns(3)
-
-        with col1:
-            st.metric("Outstanding Balance", "$0")
+            advisor_name = st.text_input("Advisor Name", key=f"advisor_{student_id}")
 
-        with col2:
-            st.metric("Aid Status", "Current")
-
-        with col3:
-            st.metric("Enrollment Status", "Full-Time")
-
-        st.markdown("---")
-
-        # Payment history
-        st.markdown("### 💳 Payment History")
-        payment_df = pd.DataFrame({
-            'Date': ['2025-01-15', '2024-12-10', '2024-11-05'],
-            'Description': ['Spring 2025 Tuition', 'Fall 2024 Balance', 'Fall 2024 Tuition'],
-            'Amount': ['$5,000.00', '$2,500.00', '$5,000.00'],
-            'Status': ['Paid', 'Paid', 'Paid']
-        })
-        st.dataframe(payment_df, use_container_width=True, hide_index=True)
-
-        # Funding sources
-        st.markdown("### 📋 Funding Sources")
-        funding_df = pd.DataFrame({
-            'Type': ['Federal Loan', 'Institutional Grant', 'State Grant'],
-            'Amount': ['$4,000', '$1,500', '$2,000'],
-            'Status': ['Active', 'Active', 'Active']
-        })
-        st.dataframe(funding_df, use_container_width=True, hide_index=True)
-
-    # =========================================================================
-    # TAB 4: INTERVENTION HISTORY
-    # =========================================================================
-    with tab4:
-        st.markdown("### 📝 Intervention Record")
-
-        # Display existing interventions
-        if student_id in st.session_state['interventions']:
-            for intervention in st.session_state['interventions'][student_id]:
-                st.info(f"**{intervention['type']}** (by {intervention['advisor']}) - {intervention['date']}\n\n{intervention['notes']}")
-        else:
-            st.write("No interventions recorded yet.")
-
-        st.markdown("---")
-
-        # Add new intervention form
-        st.markdown("### ➕ Create New Intervention")
-
-        with st.form(f"intervention_form_{student_id}"):
-            col1, col2 = st.columns(2)
-
-            with col1:
-                int_type = st.selectbox(
-                    "Intervention Type",
-                    ["Academic Support", "Financial Aid", "Attendance Outreach", "Mental Health Referral", "Career Counseling", "Other"],
-                    key=f"int_type_{student_id}"
-                )
-
-            with col2:
-                advisor_name = st.text_input("Advisor Name", key=f"advisor_{student_id}")
-
-            notes = st.text_area("Notes", placeholder="Describe the intervention and recommended actions...", key=f"notes_{student_id}")
-
-            submitted = st.form_submit_button("✅ Save Intervention", use_container_width=True)
-
-            if submitted:
-                if advisor_name.strip() == "":
-                    st.error("Please enter advisor name")
-                else:
-                    if student_id not in st.session_state['interventions']:
-                        st.session_state['interventions'][student_id] = []
-
-                    intervention = {
-                        'type': int_type,
-                        'advisor': advisor_name,
-                        'notes': notes,
-                        'date': datetime.now().strftime("%Y-%m-%d %H:%M")
-                    }
-
-                    st.session_state['interventions'][student_id].append(intervention)
-                    st.success(f"✅ Intervention recorded for {student['student_id'] if isinstance(student, pd.Series) else student_id}")
-                    st.rerun()
+        notes = st.text_area("Notes", placeholder="Describe the intervention and recommended actions...", key=f"notes_{student_id}")
 
-    st.divider()
+        submitted = st.form_submit_button("✅ Save Intervention", use_container_width=True)
 
-    # Back button
-    col1, col2, col3 = st.columns([1, 1, 1])
-    with col2:
-        if st.button("⬅️ Back to Advisor Dashboard", use_container_width=True, key="back_button_detail"):
-            navigate_to("advisor")
+        if submitted:
+            if advisor_name.strip() == "":
+                st.error("Please enter advisor name")
+            else:
+                if student_id not in st.session_state['interventions']:
+                    st.session_state['interventions'][student_id] = []
+
+                intervention = {
+                    'type': int_type,
+                    'advisor': advisor_name,
+                    'notes': notes,
+                    'date': datetime.now().strftime("%Y-%m-%d %H:%M")
+                }
+
+                st.session_state['interventions'][student_id].append(intervention)
+                st.success(f"✅ Intervention recorded for {student_id}")
+                rerun_fragment()
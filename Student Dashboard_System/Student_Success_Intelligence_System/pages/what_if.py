@@ -0,0 +1,127 @@
+import streamlit as st
+
+from pages._ui import fragment, rerun_fragment
+from utils.data_store import get_dataset
+from utils.what_if import Policy, WhatIfModel, what_if_model
+
+
+KEY_PREFIX = "what_if_"
+WEIGHT_NAMES = ("Academic", "Financial", "Engagement")
+
+
+def _slider(label, low, high, default, step, key):
+    """st.slider backed by session state; a remembered value is clamped into the current range."""
+    value = st.session_state.get(key, default)
+    if isinstance(value, tuple):
+        value = tuple(min(max(v, low), high) for v in value)
+    else:
+        value = min(max(value, low), high)
+    st.session_state[key] = value
+    return st.slider(label, low, high, step=step, key=key)
+
+
+def _weight_sliders(title, key, defaults, cutoffs):
+    """Component weights and (Medium, High) cut-offs of one risk score."""
+    st.markdown(f"#### {title}")
+    weights = tuple(
+        _slider(f"{name} weight", 0.0, 1.0, float(w), 0.05, f"{KEY_PREFIX}{key}_w{i}")
+        for i, (name, w) in enumerate(zip(WEIGHT_NAMES, defaults))
+    )
+    if sum(weights) == 0:
+        st.caption("All weights are zero; every score is 0.")
+    elif abs(sum(weights) - 1) > 1e-9:
+        st.caption("Weights are scaled to sum to 1: "
+                   + " / ".join(f"{w / sum(weights):.2f}" for w in weights))
+    levels = _slider("Medium / High risk from score", 0, 100, tuple(int(c) for c in cutoffs), 1,
+                     f"{KEY_PREFIX}{key}_cutoffs")
+    return weights, levels
+
+
+@fragment
+def _render_simulator(model: WhatIfModel):
+    """Policy controls and the live diff; moving a slider reruns only this section."""
+    if st.button("↺ Reset to current policy", key="what_if_reset"):
+        for key in [k for k in st.session_state if str(k).startswith(KEY_PREFIX)]:
+            del st.session_state[key]
+        rerun_fragment()
+
+    col_controls, col_results = st.columns([1, 2])
+
+    with col_controls:
+        st.markdown("#### Alert thresholds")
+        overrides = []
+        for control in model.thresholds:
+            value = _slider(control.label, control.low, control.high, control.value, control.step,
+                            f"{KEY_PREFIX}{model.plan.digest}_{control.atom}")
+            if value != control.value:
+                overrides.append((control.atom, value))
+        default = Policy()
+        risk_weights, risk_cutoffs = _weight_sliders("Advisor risk score", "risk",
+                                                     default.risk_weights, default.risk_cutoffs)
+        overall_weights, overall_cutoffs = _weight_sliders("Alert risk score", "overall",
+                                                           default.overall_weights, default.overall_cutoffs)
+
+    policy = Policy(tuple(overrides), risk_weights, risk_cutoffs, overall_weights, overall_cutoffs)
+    diff = model.diff(policy)
+
+    with col_results:
+        st.caption(f"Re-scored {model.size:,} students in {diff.seconds * 1000:.0f} ms")
+        summary = diff.summary.set_index('Metric')
+        m1, m2, m3, m4 = st.columns(4)
+        for col, metric, label in ((m1, "High risk (advisor score)", "High Risk"),
+                                   (m2, "Medium risk (advisor score)", "Medium Risk"),
+                                   (m3, "Students with a critical alert", "Critical Alerts"),
+                                   (m4, "Students with any alert", "Any Alert")):
+            with col:
+                st.metric(label, f"{summary.at[metric, 'What-if']:,}",
+                          delta=int(summary.at[metric, 'Change']), delta_color="inverse")
+
+        st.markdown("#### Current vs what-if")
+        st.dataframe(diff.summary, use_container_width=True, hide_index=True)
+
+        st.markdown("#### Students matching each threshold")
+        st.dataframe(diff.rules, use_container_width=True, hide_index=True)
+
+        st.markdown("#### Advisor risk level moves")
+        st.dataframe(diff.transitions, use_container_width=True)
+
+        st.markdown(f"#### Students changing advisor risk level ({diff.changed_count:,})")
+        if diff.changed_count:
+            if diff.changed_count > len(diff.changed):
+                st.caption(f"Showing the {len(diff.changed)} highest what-if scores")
+            st.dataframe(diff.changed, use_container_width=True, hide_index=True)
+        else:
+            st.info("No student changes advisor risk level under this policy.")
+
+
+def render(navigate_to):
+    """Render the What-If Policy Simulator"""
+
+    # Header
+    st.markdown("""
+    <div class="header-container">
+        <div class="header-title">🧪 What-If Policy Simulator</div>
+        <div class="header-subtitle">Move risk thresholds and weights and see the whole cohort re-scored</div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Navigation Bar
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("⬅️ Back to Home", use_container_width=True, key="what_if_home"):
+            navigate_to("institutional")
+    with col2:
+        if st.button("👨‍🏫 Advisor Dashboard", use_container_width=True, key="what_if_advisor"):
+            navigate_to("advisor")
+    with col3:
+        pass
+    with col4:
+        pass
+
+    st.divider()
+
+    # Sorted feature indexes and score components, built once per data and rule version
+    model = what_if_model(get_dataset())
+    st.caption("Changes here are a simulation only; the live rules are in config/alert_rules.json.")
+
+    _render_simulator(model)
@@ -0,0 +1,88 @@
+"""
+Precompute the risk snapshot outside Streamlit (e.g. from cron after the nightly SIS export)
+
+Loads the dataset, runs profile synthesis, weighted risk and the alert
+rules, logs the alerts and their notifications to alerts.db, and writes a
+versioned snapshot under data/snapshots (see utils.snapshot_store). The
+dashboard then opens that snapshot instead of rescoring.
+
+    python precompute_snapshot.py [--data CSV] [--rules JSON] [--out DIR] [--db SQLITE]
+
+Exits 0 when a snapshot for the current data and rules exists afterwards,
+1 when the dataset or rules cannot be read.
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from utils import alert_store, notification_store, parallel, snapshot_store
+from utils.data_store import DATASET_PATH, load_version
+from utils.risk_snapshot import build_snapshot
+from utils.rule_engine import RULES_PATH, RuleConfigError, load_rules
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Score the cohort and write a risk snapshot for the dashboard.")
+    parser.add_argument('--data', type=Path, default=DATASET_PATH, help="student CSV (default: %(default)s)")
+    parser.add_argument('--rules', type=Path, default=RULES_PATH, help="alert rules (default: %(default)s)")
+    parser.add_argument('--out', type=Path, default=snapshot_store.SNAPSHOT_DIR,
+                        help="snapshot directory (default: %(default)s)")
+    parser.add_argument('--db', type=Path, default=alert_store.DB_PATH, help="alerts database (default: %(default)s)")
+    parser.add_argument('--no-db', action='store_true', help="write the snapshot only; leave alerts.db alone")
+    parser.add_argument('--keep', type=int, default=snapshot_store.KEEP,
+                        help="snapshots to keep (default: %(default)s)")
+    parser.add_argument('--force', action='store_true', help="rescore even if this data and rules are already stored")
+    parser.add_argument('--backend', choices=parallel.BACKENDS, help="scoring backend (default: SCORING_BACKEND)")
+    parser.add_argument('--workers', type=int, help="scoring workers (default: SCORING_WORKERS)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.backend:
+        parallel.BACKEND = args.backend
+    if args.workers:
+        parallel.WORKERS = args.workers
+
+    try:
+        dataset = load_version(args.data)
+        plan = load_rules(args.rules)
+    except (OSError, ValueError, RuleConfigError) as e:
+        print(f"precompute_snapshot: {e}", file=sys.stderr)
+        return 1
+
+    existing = snapshot_store.find_snapshot(dataset.digest, plan.digest, args.out)
+    if existing is not None and not args.force:
+        print(f"Up to date: {existing}")
+        return 0
+
+    started = time.perf_counter()
+    snapshot = build_snapshot(dataset, plan, persist=False)
+    scored = time.perf_counter() - started
+
+    published = False
+    if not args.no_db:
+        created_at = datetime.now().isoformat()
+        alert_store.write_alerts(
+            [(s['student_id'], a['type'], a.get('severity'), a.get('message'), 'rule_engine', created_at)
+             for s in snapshot.students_with_alerts for a in s['alerts']],
+            args.db,
+        )
+        notification_store.add_notifications(notification_store.alert_notes(snapshot.students_with_alerts), args.db)
+        published = True
+
+    directory = snapshot_store.write_snapshot(snapshot, dataset, plan, args.out, alerts_published=published,
+                                              seconds=scored)
+    snapshot_store.prune(args.out, args.keep)
+    print(f"Wrote {directory}: {len(snapshot.students):,} students, "
+          f"{len(snapshot.students_with_alerts):,} with alerts ({snapshot.total_alerts:,} alerts), "
+          f"scored in {scored:.1f}s, total {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""
+Shared test setup: import the app's packages from the project root and keep
+every database and snapshot the code under test writes in a temporary
+directory, never in data/.
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_ROOT))
+
+# Read at import time by utils.alert_store and utils.snapshot_store
+_SCRATCH = Path(tempfile.mkdtemp(prefix="ssis-tests-"))
+os.environ['ALERTS_DB_PATH'] = str(_SCRATCH / "alerts.db")
+os.environ['SNAPSHOT_DIR'] = str(_SCRATCH / "snapshots")
+
+
+
+@pytest.fixture(scope='session')
+def dataset():
+    """The bundled student CSV as a StudentDataset (read once)."""
+    from utils.data_store import DATASET_PATH, load_version
+    return load_version(DATASET_PATH)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.alert_logic import AlertSystem, rank_alerted, score_cents
+from utils.risk_snapshot import alert_input_frame
+
+
+def test_rank_alerted_orders_by_critical_total_then_score():
+    critical = np.array([0, 1, 1, 2, 0, 1])
+    total = np.array([0, 3, 2, 2, 1, 3])
+    score = np.array([99.0, 40.0, 80.0, 10.0, 50.0, 40.0])
+    # row 0 has no alerts; rows 1 and 5 tie on every key and keep row order
+    assert rank_alerted(critical, total, score).tolist() == [3, 1, 5, 2, 4]
+
+
+def test_rank_alerted_compares_scores_in_hundredths():
+    critical = np.array([1, 1])
+    total = np.array([1, 1])
+    assert rank_alerted(critical, total, np.array([50.004, 50.0])).tolist() == [0, 1]
+    assert score_cents(np.array([50.004, 50.006])).tolist() == [5000, 5001]
+
+
+@pytest.mark.parametrize('k', [0, 1, 2, 5, 50, 399, 400, 1000])
+def test_top_k_is_a_prefix_of_the_full_ranking(k):
+    rng = np.random.default_rng(k)
+    critical = rng.integers(0, 3, 400)
+    total = critical + rng.integers(0, 3, 400)
+    score = rng.choice([10.0, 45.5, 45.51, 90.0], 400)  # plenty of ties
+    full = rank_alerted(critical, total, score)
+    assert rank_alerted(critical, total, score, k).tolist() == full[:k].tolist()
+
+
+@pytest.fixture(scope='module')
+def ranked_frame(dataset):
+    from utils.student_profiles import enriched_students
+    return alert_input_frame(enriched_students(dataset))
+
+
+def test_ranked_alerts_match_the_built_list(ranked_frame):
+    full, total = AlertSystem.get_students_with_alerts(ranked_frame, persist=False)
+    ranked = AlertSystem.rank_students_with_alerts(ranked_frame)
+    assert ranked.top(5) == full[:5]  # before the full order exists: partial selection
+    assert len(ranked) == len(full) and ranked.total_alerts == total
+    assert list(ranked) == full
+    assert ranked[-1] == full[-1] and ranked[3:40:7] == full[3:40:7]
+    assert ranked.top(5) == full[:5]
+    assert ranked.student_ids().tolist() == [s['student_id'] for s in full]
+    keys = ranked.keys()
+    assert keys[:, 1].tolist() == [len(s['alerts']) for s in full]
+    assert keys[:, 0].tolist() == [sum(a['severity'] == 'critical' for a in s['alerts']) for s in full]
+
+
+def test_ranked_alerts_of_an_empty_frame():
+    ranked = AlertSystem.rank_students_with_alerts(pd.DataFrame({'student_id': []}))
+    assert len(ranked) == 0 and list(ranked) == [] and ranked.top(5) == []
+    assert ranked.keys().shape == (0, 3) and ranked.total_alerts == 0
+    with pytest.raises(IndexError):
+        ranked[0]
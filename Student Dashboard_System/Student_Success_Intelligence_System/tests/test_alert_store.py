@@ -0,0 +1,65 @@
+import random
+import shutil
+import sqlite3
+
+from utils import alert_queries, alert_store
+from utils.data_store import DATA_DIR
+
+# The counters alert_store keeps in trigger-maintained tables, computed from scratch
+OPEN_SQL = """
+    SELECT a.severity, COUNT(*) FROM alert_logs a WHERE NOT EXISTS (
+        SELECT 1 FROM acknowledgements k WHERE k.student_id = a.student_id AND k.alert_type = a.alert_type
+          AND k.acknowledged_at >= a.created_at)
+    GROUP BY a.severity"""
+DAY_SQL = "SELECT substr(created_at, 1, 10), alert_type, COUNT(*) FROM alert_logs GROUP BY 1, 2 ORDER BY 1, 2"
+
+
+def _assert_counters(db):
+    conn = sqlite3.connect(db)
+    try:
+        assert alert_queries.count_open_by_severity(db) == {s or 'none': n for s, n in conn.execute(OPEN_SQL)}
+        assert alert_queries.counts_per_day(db_path=db) == [
+            {'day': d, 'alert_type': t, 'count': n} for d, t, n in conn.execute(DAY_SQL)]
+    finally:
+        conn.close()
+
+
+def test_counters_follow_writes_and_acknowledgements(tmp_path):
+    db = tmp_path / "alerts.db"
+    rnd = random.Random(0)
+    for day in range(3):
+        alert_store.write_alerts([
+            (f"S{rnd.randrange(100)}", rnd.choice(['GPA', 'Financial']), rnd.choice(['critical', 'warning', None]),
+             f"msg {rnd.randrange(3)}", 'rule_engine', f"2026-09-{10 + day:02d}T0{rnd.randrange(9)}:00:00")
+            for _ in range(500)], db)
+        for _ in range(20):
+            alert_store.acknowledge(f"S{rnd.randrange(100)}", rnd.choice(['GPA', 'Financial']), 'advisor', db_path=db)
+        _assert_counters(db)
+
+
+def test_counters_after_migrating_the_bundled_database(tmp_path):
+    db = tmp_path / "legacy.db"
+    shutil.copy(DATA_DIR / "alerts.db", db)
+    alert_store.init_db(db)
+    _assert_counters(db)
+
+
+def test_recurrence_after_acknowledgement_reopens(tmp_path):
+    db = tmp_path / "alerts.db"
+    row = ('S1', 'GPA', 'critical', 'GPA 1.9', 'rule_engine')
+    alert_store.write_alerts([(*row, "2026-09-10T08:00:00")] * 2, db)
+    assert alert_store.count_alerts(db) == 1
+    alert_store.acknowledge('S1', 'GPA', 'advisor', db_path=db)
+    assert alert_queries.count_open_by_severity(db) == {}
+
+    alert_store.write_alerts([(*row, "2099-01-01T08:00:00")], db)
+    alert_store.write_alerts([(*row, "2099-01-02T08:00:00")], db)
+    conn = sqlite3.connect(db)
+    try:
+        rows = conn.execute("SELECT created_at, closed_at IS NULL, occurrence_count FROM alert_logs "
+                            "ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("2026-09-10T08:00:00", 0, 2), ("2099-01-01T08:00:00", 1, 2)]
+    assert alert_queries.count_open_by_severity(db) == {'critical': 1}
+    _assert_counters(db)
@@ -0,0 +1,36 @@
+import threading
+import time
+
+from utils import alert_store
+from utils.alert_writer import AlertWriter
+
+
+def test_writer_survives_bad_rows(tmp_path):
+    writer = AlertWriter(db_path=tmp_path / "alerts.db")
+    try:
+        writer.enqueue([('S1',)])  # too short for an alert row
+        assert writer.flush(10)
+        writer.enqueue([('S2', 'GPA', 'critical', 'ok', 'rule_engine', '2026-09-01T00:00:00')])
+        writer.enqueue_pass((f'P{i}', 'GPA', 'warning', 'pass', 'rule_engine', '2026-09-01T00:00:00')
+                            for i in range(5))
+        assert writer.flush(10)
+        stats = writer.stats()
+        assert stats['failed'] == 1 and stats['written'] == 6 and stats['enqueued'] == 7
+        assert alert_store.count_alerts(tmp_path / "alerts.db") == 6
+    finally:
+        writer.stop()
+
+
+def test_stop_gives_up_on_a_full_queue(tmp_path, monkeypatch):
+    writer = AlertWriter(max_queue=1, db_path=tmp_path / "alerts.db")
+    release = threading.Event()
+    monkeypatch.setattr(writer, '_write', lambda batch: release.wait(10) and batch.clear())
+    try:
+        writer.enqueue([('S1', 'GPA', 'critical', 'a', 'rule_engine', '2026-09-01T00:00:00')])
+        writer.enqueue([('S2', 'GPA', 'critical', 'b', 'rule_engine', '2026-09-01T00:00:00')])
+        start = time.monotonic()
+        writer.stop(timeout=0.2)  # returns instead of blocking on the full queue
+        assert time.monotonic() - start < 5
+    finally:
+        release.set()
+        writer.stop()
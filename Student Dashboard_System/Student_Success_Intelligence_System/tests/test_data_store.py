@@ -0,0 +1,72 @@
+import pandas as pd
+
+from utils.data_store import StudentDataset
+
+
+def _frame(ids, gpa):
+    return pd.DataFrame({'student_id': ids, 'gpa': gpa})
+
+
+def test_frame_views_do_not_leak_writes():
+    dataset = StudentDataset(_frame(['S1', 'S2'], [3.0, 2.0]), 1, 'a', None, None)
+    view = dataset.frame
+    view.loc[0, 'gpa'] = 0.0
+    view['extra'] = 1
+    assert dataset.frame['gpa'].tolist() == [3.0, 2.0] and 'extra' not in dataset.frame.columns
+
+
+def test_derived_values_are_built_once_per_version():
+    dataset = StudentDataset(_frame(['S1'], [3.0]), 1, 'a', None, None)
+    calls = []
+    for _ in range(3):
+        assert dataset.derived('count', lambda ds: calls.append(1) or len(ds)) == 1
+    assert calls == [1] and dataset.peek('count') == 1 and dataset.peek('other') is None
+
+
+def test_student_lookups_by_id():
+    frame = pd.DataFrame({'student_id': ['S2', 'S1', 'S2'], 'name': ['Bo', None, 'Bo again'], 'gpa': [1.0, 2.0, 3.0]})
+    dataset = StudentDataset(frame, 1, 'a', None, None)
+    assert dataset.position('S1') == 1 and dataset.position('S2') == 0  # first row of a duplicated id
+    assert dataset.position('S9') is None and dataset.student('S9') is None
+    assert dataset.student('S2')['gpa'] == 1.0
+    labels, mapping = dataset.selector_options()
+    assert labels == sorted(labels) and mapping['S1'] == 'S1' and mapping['S2 - Bo'] == 'S2'
+
+
+def _reload(old: pd.DataFrame, new: pd.DataFrame):
+    previous = StudentDataset(old, 1, 'a', None, None)
+    return StudentDataset(new, 2, 'b', None, None, previous=previous)
+
+
+def test_changes_classify_rows_by_id_and_content():
+    old = _frame(['S1', 'S2', 'S3', 'S4'], [3.0, 2.0, 1.0, 4.0])
+    new = _frame(['S4', 'S2', 'S5', 'S1'], [4.0, 2.5, 3.3, 3.0])  # reordered, S2 updated, S3 gone, S5 new
+    changes = _reload(old, new).changes()
+    assert changes.kept_new.tolist() == [0, 3] and changes.kept_old.tolist() == [3, 0]
+    assert changes.changed.tolist() == [1, 2]
+    assert changes.deleted == frozenset({'S3'})
+    assert len(changes) == 3
+
+
+def test_patch_matches_a_full_recompute():
+    def score(df):
+        return pd.DataFrame({'student_id': df['student_id'].to_numpy(), 'score': (4 - df['gpa']).to_numpy() * 25})
+
+    old = _frame(['S1', 'S2', 'S3', 'S4'], [3.0, 2.0, 1.0, 4.0])
+    new = _frame(['S4', 'S2', 'S5', 'S1'], [4.0, 2.5, 3.3, 3.0])
+    dataset = _reload(old, new)
+    changes = dataset.changes()
+    patched = changes.patch(score(old), score(new.iloc[changes.changed]))
+    pd.testing.assert_frame_equal(patched, score(new))
+
+
+def test_patch_with_nothing_left():
+    changes = _reload(_frame(['S1'], [3.0]), _frame(['S2'], [2.0])).changes()
+    empty = changes.patch(_frame(['S1'], [3.0]).iloc[:0], _frame([], []))
+    assert empty.empty and list(empty.columns) == ['student_id', 'gpa']
+
+
+def test_no_changes_without_matchable_rows():
+    assert _reload(_frame(['S1'], [3.0]), _frame(['S1', 'S1'], [3.0, 2.0])).changes() is None
+    assert _reload(_frame(['S1'], [3.0]), pd.DataFrame({'student_id': ['S1'], 'credits': [3]})).changes() is None
+    assert StudentDataset(_frame(['S1'], [3.0]), 1, 'a', None, None).changes() is None
@@ -0,0 +1,16 @@
+from utils import notification_store
+
+
+def test_manual_notifications_get_unique_ids(tmp_path):
+    db = tmp_path / "alerts.db"
+    first = notification_store.add_notification('S1', 'Check in', 'same text', db_path=db)
+    second = notification_store.add_notification('S1', 'Check in', 'same text', db_path=db)
+    assert first['id'] != second['id']
+    assert len(notification_store.notifications_for_student('S1', db_path=db)) == 2
+
+
+def test_rule_engine_notes_are_deduplicated(tmp_path):
+    db = tmp_path / "alerts.db"
+    entries = [{'student_id': 'S1', 'alerts': [{'type': 'GPA', 'severity': 'critical', 'message': 'Critical GPA: 1.5'}]}]
+    assert notification_store.add_notifications(notification_store.alert_notes(entries), db) == 1
+    assert notification_store.add_notifications(notification_store.alert_notes(entries), db) == 0
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import parallel
+
+
+def double(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({'x': df['x'].to_numpy() * 2, 'label': df['label'].to_numpy()})
+
+
+def die_in_worker(df: pd.DataFrame) -> pd.DataFrame:
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return double(df)
+
+
+@pytest.fixture
+def frame(monkeypatch):
+    monkeypatch.setattr(parallel, 'MIN_ROWS', 0)
+    return pd.DataFrame({'x': np.arange(101), 'label': [f"s{i}" for i in range(101)]},
+                        index=np.arange(1000, 1101))
+
+
+@pytest.fixture
+def expected(frame):
+    result = double(frame)
+    result.index = frame.index
+    return result
+
+
+def test_chunk_bounds_cover_the_rows_in_order():
+    assert parallel.chunk_bounds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert parallel.chunk_bounds(2, 8) == [(0, 1), (1, 2)]
+    assert parallel.chunk_bounds(0, 4) == []
+
+
+def test_resolve():
+    assert parallel.resolve(10, 'threads', 4) == ('inline', 1)  # below MIN_ROWS
+    assert parallel.resolve(10 ** 9, 'processes', 1) == ('inline', 1)
+    assert parallel.resolve(10 ** 9, 'threads', 4) == ('threads', 4)
+    with pytest.raises(ValueError):
+        parallel.resolve(10, 'gpu')
+
+
+@pytest.mark.parametrize('backend', parallel.BACKENDS)
+def test_backends_match_inline(frame, expected, backend):
+    pd.testing.assert_frame_equal(parallel.map_frame(double, frame, backend=backend, workers=3), expected)
+
+
+def test_broken_pool_is_replaced(frame, expected):
+    pool = parallel._pool('processes', 2)
+    with pytest.raises(Exception):
+        pool.submit(os._exit, 1).result()
+    pd.testing.assert_frame_equal(parallel.map_frame(double, frame, backend='processes', workers=2), expected)
+    assert parallel._pools['processes:2'] is not pool
+
+
+def test_pool_that_keeps_breaking_falls_back_inline(frame, expected):
+    result = parallel.map_frame(die_in_worker, frame, backend='processes', workers=2)
+    pd.testing.assert_frame_equal(result, expected)
+    assert 'processes:2' not in parallel._pools
+    pd.testing.assert_frame_equal(parallel.map_frame(double, frame, backend='processes', workers=2), expected)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.data_store import StudentDataset
+from utils.risk_snapshot import RiskSnapshot, build_snapshot
+from utils.rule_engine import rule_plan
+
+
+def assert_same_snapshot(snapshot: RiskSnapshot, expected: RiskSnapshot) -> None:
+    pd.testing.assert_frame_equal(snapshot.students, expected.students, check_dtype=False)
+    pd.testing.assert_frame_equal(snapshot.report, expected.report, check_dtype=False)
+    assert list(snapshot.students_with_alerts) == list(expected.students_with_alerts)
+    np.testing.assert_array_equal(snapshot.alert_keys, expected.alert_keys)
+    assert snapshot.top_alerts(5) == expected.top_alerts(5)
+    assert (snapshot.total_alerts, snapshot.auto_flagged) == (expected.total_alerts, expected.auto_flagged)
+
+
+def edited(frame: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """``frame`` with 30 students updated, 4 deleted and 3 inserted."""
+    rng = np.random.default_rng(seed)
+    frame = frame.copy()
+    rows = rng.choice(len(frame), 30, replace=False)
+    frame.loc[rows, 'prior_gpa'] = rng.uniform(0, 4, len(rows)).round(2)
+    frame = frame.drop(index=frame.index[rng.choice(len(frame), 4, replace=False)])
+    added = frame.sample(3, random_state=seed).assign(student_id=lambda f: f['student_id'] + f'-new{seed}')
+    return pd.concat([added, frame], ignore_index=True)
+
+
+def assert_patched_reloads_match(dataset: StudentDataset, base: RiskSnapshot, steps: int = 3) -> None:
+    """Reload ``dataset`` ``steps`` times on top of ``base``; every patched snapshot equals a full build."""
+    plan = rule_plan()
+    key = f'risk_snapshot:{plan.digest}'
+    current = StudentDataset(dataset.frame, 100, 'v0', None, None)
+    current.derived(key, lambda ds: base)
+    previous = base
+    for step in range(1, steps + 1):
+        current = StudentDataset(edited(current.frame, step), 100 + step, f'v{step}', None, None, previous=current)
+        patched = current.derived(key, lambda ds: build_snapshot(ds, plan, persist=False))
+        assert patched.base_version == previous.version and len(patched.rescored) >= 33
+        previous = patched
+        rebuilt = build_snapshot(StudentDataset(current.frame, 0, 'x', None, None), plan, persist=False)
+        assert_same_snapshot(patched, rebuilt)
+
+
+@pytest.fixture(scope='module')
+def full_snapshot(dataset):
+    return build_snapshot(dataset, persist=False)
+
+
+def test_full_build(dataset, full_snapshot):
+    assert len(full_snapshot.students) == len(full_snapshot.report) == len(dataset)
+    assert full_snapshot.base_version is None and full_snapshot.rules_version == rule_plan().digest
+    assert full_snapshot.total_alerts == int(full_snapshot.alert_keys[:, 1].sum())
+
+
+def test_patched_reloads_match_a_full_rebuild(dataset, full_snapshot):
+    assert_patched_reloads_match(dataset, full_snapshot)
@@ -0,0 +1,133 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from utils.rule_engine import (RULES_PATH, RuleConfigError, compile_rules, load_rules, rule_plan,
+                               rules_error)
+
+
+def _alert(**spec):
+    return {'type': 'GPA', 'severity': 'warning', 'field': 'gpa', 'op': '<', 'threshold': 2.5,
+            'message': 'GPA {gpa}', **spec}
+
+
+def _severity_and_message(plan, alert_type, columns):
+    n = len(next(iter(columns.values())))
+    severity, rule = plan.severity(alert_type, columns, n)
+    return [(int(s), plan.message(alert_type, int(r), columns, i) if s else '')
+            for i, (s, r) in enumerate(zip(severity, rule))]
+
+
+def test_bundled_rules_compile():
+    plan = load_rules(RULES_PATH)
+    assert plan.digest and plan.alert_types
+    assert 'academic_high_risk' in plan.flag_names
+
+
+@pytest.mark.parametrize('config, error', [
+    ([], "must hold an object"),
+    ({'alerts': {}}, "'alerts' must be a list"),
+    ({'alerts': ['GPA']}, r"alerts\[0\]: must be an object"),
+    ({'alerts': [_alert(severity='severe')]}, "severity must be one of"),
+    ({'alerts': [{k: v for k, v in _alert().items() if k != 'type'}]}, "missing 'type'"),
+    ({'alerts': [_alert(op='=<')]}, "unknown comparator"),
+    ({'alerts': [_alert(threshold='2.5')]}, "must be a number"),
+    ({'alerts': [_alert(threshold=True)]}, "must be a number"),
+    ({'alerts': [_alert(field='is_freshman', threshold=1)]}, "must be true or false"),
+    ({'alerts': [_alert(field='housing', op='<', threshold='Off')]}, "can only be compared"),
+    ({'alerts': [_alert(field='nickname', threshold=[1])]}, "must be a number, string or boolean"),
+    ({'alerts': [{**_alert(), 'any': []}]}, "'any' must be a non-empty list"),
+    ({'alerts': [{k: v for k, v in _alert().items() if k != 'threshold'}]}, "missing 'threshold'"),
+    ({'alerts': [_alert(message='GPA {gpa:d}')]}, "bad message template"),
+    ({'alerts': [_alert(message='GPA {0}')]}, "bad message template"),
+    ({'flags': [{'field': 'gpa', 'op': '<', 'threshold': 2}]}, "missing 'name'"),
+])
+def test_compile_errors(config, error):
+    with pytest.raises(RuleConfigError, match=error):
+        compile_rules(config)
+
+
+def test_int_fields_accept_integer_formats():
+    plan = compile_rules({'alerts': [_alert(type='Warnings', field='warnings', op='>', threshold=0,
+                                            message='{warnings:d} warning(s)')]})
+    assert _severity_and_message(plan, 'Warnings', {'warnings': np.array([0, 3])}) == [(0, ''), (1, '3 warning(s)')]
+
+
+def test_any_and_all_conditions():
+    plan = compile_rules({'alerts': [
+        {'type': 'Financial', 'severity': 'critical', 'message': 'owed {unpaid_fees}',
+         'any': [{'field': 'unpaid_fees', 'op': '>', 'threshold': 500},
+                 {'field': 'aid_delayed', 'op': '==', 'threshold': True}]},
+        {'type': 'Credits', 'severity': 'critical', 'message': 'dropout',
+         'all': [{'field': 'credits', 'op': '<', 'threshold': 30},
+                 {'field': 'is_freshman', 'op': '==', 'threshold': True}]},
+    ]})
+    columns = {'unpaid_fees': np.array([600.0, 0.0, 0.0]), 'aid_delayed': np.array([False, True, False]),
+               'credits': np.array([10.0, 10.0, 40.0]), 'is_freshman': np.array([True, False, True])}
+    severity, _ = plan.evaluate(columns, 3)
+    assert severity['Financial'].tolist() == [2, 2, 0]
+    assert severity['Credits'].tolist() == [2, 0, 0]
+
+
+def test_most_severe_rule_wins_then_file_order():
+    plan = compile_rules({'alerts': [
+        _alert(threshold=3.0, message='first warning'),
+        _alert(threshold=3.5, message='second warning'),
+        _alert(severity='critical', threshold=2.0, message='critical'),
+    ]})
+    rows = _severity_and_message(plan, 'GPA', {'gpa': np.array([1.5, 2.5, 3.2, 3.9])})
+    assert rows == [(2, 'critical'), (1, 'first warning'), (1, 'second warning'), (0, '')]
+
+
+def test_conditions_are_shared_between_rules_and_flags():
+    plan = compile_rules({'alerts': [_alert(threshold=2.0)],
+                          'flags': [{'name': 'low_gpa', 'field': 'gpa', 'op': '<', 'threshold': 2.0}]})
+    assert len(plan.atoms) == 1
+    assert plan.flags({'gpa': np.array([1.0, 3.0])}, 2)['low_gpa'].tolist() == [True, False]
+
+
+def test_missing_input_never_matches():
+    plan = compile_rules({'alerts': [_alert()]})
+    severity, rule = plan.severity('GPA', {}, 2)
+    assert severity.tolist() == [0, 0] and rule.tolist() == [-1, -1]
+
+
+@pytest.mark.parametrize('value, text', [(0.0, 'GPA 0'), (0, 'GPA 0'), (1.5, 'GPA 1.5'),
+                                         (np.float64(2.0), 'GPA 2.0'), (np.int64(2), 'GPA 2')])
+def test_message_values(value, text):
+    plan = compile_rules({'alerts': [_alert(threshold=5.0)]})
+    assert plan.message('GPA', 0, {'gpa': np.array([value])}, 0) == text
+
+
+def _write(path, config):
+    path.write_text(json.dumps(config), encoding='utf-8')
+    # a fresh mtime even on filesystems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_hot_reload_keeps_last_good_plan(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, {'version': 1, 'alerts': [_alert()]})
+    first = rule_plan(path)
+    assert rule_plan(path) is first and rules_error(path) is None
+
+    _write(path, {'version': 2, 'alerts': [_alert(threshold='low')]})
+    assert rule_plan(path) is first
+    assert 'must be a number' in rules_error(path)
+
+    path.write_text("{not json", encoding='utf-8')
+    assert rule_plan(path) is first and rules_error(path)
+
+    _write(path, {'version': 3, 'alerts': [_alert(threshold=3.0)]})
+    fixed = rule_plan(path)
+    assert fixed is not first and fixed.version == '3' and rules_error(path) is None
+
+
+def test_first_load_of_a_bad_file_raises(tmp_path):
+    path = tmp_path / "rules.json"
+    _write(path, {'alerts': [_alert(severity='urgent')]})
+    with pytest.raises(RuleConfigError):
+        rule_plan(path)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.search_index import SearchIndex, normalize
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    first = ['Ana', 'Bo', 'Chen', 'Dana', 'Émile', 'Zoë', None]
+    last = ['Smith', 'Lee', 'Okafor', 'Nguyen', 'St. Clair']
+    majors = ['Computer Science', 'Biology', 'Art History', 'Data  Science', None]
+    n = 500
+    return pd.DataFrame({
+        'student_id': [f"S{i:05d}" for i in rng.permutation(n)],
+        'name': [None if f is None else f"{f} {rng.choice(last)}" for f in rng.choice(first, n)],
+        'major': rng.choice(majors, n),
+    })
+
+
+def _contains(frame, query):
+    """Rows with ``query`` in any normalized search field (the brute-force reference)."""
+    q = normalize(query)
+    return {i for i, row in enumerate(frame.itertuples(index=False))
+            if any(pd.notna(v) and q in normalize(v) for v in row)}
+
+
+@pytest.mark.parametrize('query', ['a', 'é', 'ë', '1', '0', 'an', 'SC', '12', 'ce', 'zz', 'ta', 's0001', 'ist', 'st. c'])
+def test_every_substring_match_is_found(query):
+    frame = _frame()
+    found = SearchIndex(frame).search(query, limit=10**6, fuzzy=False)
+    assert len(set(found.tolist())) == len(found)
+    assert set(found.tolist()) == _contains(frame, query)
+
+
+@pytest.mark.parametrize('query', ['a', '7', 'on', 'S00'])
+def test_limit_applies_after_the_mask(query):
+    frame = _frame()
+    index = SearchIndex(frame)
+    mask = np.random.default_rng(1).random(len(frame)) < 0.3
+    full = index.search(query, limit=10**6, fuzzy=False).tolist()
+    assert index.search(query, limit=20, mask=mask, fuzzy=False).tolist() == [p for p in full if mask[p]][:20]
+
+
+def test_exact_id_and_prefixes_rank_first():
+    frame = pd.DataFrame({'student_id': ['S2', 'S1', 'X9'], 'name': ['Sam Stone', 'Ann Sa', 'Bo S1'],
+                          'major': ['Art', 'Math', 'Sales']})
+    index = SearchIndex(frame)
+    assert index.search('s1').tolist()[0] == 1
+    assert index.search('sa').tolist() == [0, 1, 2]  # value prefix, then word prefixes in key order
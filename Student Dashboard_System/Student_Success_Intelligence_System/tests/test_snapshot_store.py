@@ -0,0 +1,43 @@
+import pytest
+
+from utils import snapshot_store
+from utils.risk_snapshot import build_snapshot
+from utils.rule_engine import rule_plan
+
+from test_risk_snapshot import assert_patched_reloads_match, assert_same_snapshot
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture(scope='module')
+def full_snapshot(dataset):
+    return build_snapshot(dataset, persist=False)
+
+
+def test_round_trip(tmp_path, dataset, full_snapshot):
+    plan = rule_plan()
+    directory = snapshot_store.write_snapshot(full_snapshot, dataset, plan, tmp_path, alerts_published=True)
+    assert snapshot_store.find_snapshot(dataset.digest, plan.digest, tmp_path) == directory
+    assert snapshot_store.find_snapshot(dataset.digest, 'other-rules', tmp_path) is None
+
+    stored = snapshot_store.load_snapshot(dataset, plan, tmp_path)
+    assert stored is not None and stored.published and stored.version == dataset.version
+    assert_same_snapshot(stored, full_snapshot)
+    entries = stored.students_with_alerts
+    assert entries[-1] == full_snapshot.students_with_alerts[-1]
+    assert entries[10:3:-2] == full_snapshot.students_with_alerts[10:3:-2]
+
+
+def test_prune_keeps_the_newest_and_latest(tmp_path, dataset, full_snapshot):
+    plan = rule_plan()
+    written = [snapshot_store.write_snapshot(full_snapshot, dataset, plan, tmp_path) for _ in range(4)]
+    removed = snapshot_store.prune(tmp_path, keep=2)
+    assert sorted(removed) == sorted(written[:2])
+    assert sorted(snapshot_store.snapshot_dirs(tmp_path)) == sorted(written[2:])
+    assert (tmp_path / snapshot_store.LATEST).read_text(encoding='utf-8') == written[-1].name
+
+
+def test_patched_reloads_on_a_stored_snapshot(tmp_path, dataset, full_snapshot):
+    plan = rule_plan()
+    snapshot_store.write_snapshot(full_snapshot, dataset, plan, tmp_path)
+    assert_patched_reloads_match(dataset, snapshot_store.load_snapshot(dataset, plan, tmp_path))
@@ -0,0 +1,40 @@
+import threading
+
+import pandas as pd
+
+from pages import student_detail
+from utils.data_store import StudentDataset
+
+
+def _dataset(version, n=20):
+    frame = pd.DataFrame({'student_id': [f"S{i}" for i in range(n)], 'name': [f"Student {i}" for i in range(n)],
+                          'gpa': [1.5 + i / 10 for i in range(n)], 'credits': [30] * n})
+    return StudentDataset(frame, version, str(version), None, None)
+
+
+def _drain():
+    student_detail._prefetcher.submit(lambda: None).result(timeout=10)
+
+
+def test_prefetch_warms_views_per_data_version():
+    first, second = _dataset(101), _dataset(102)
+    student_detail.prefetch_students(first, ('S1', None, 'S2'))
+    _drain()
+    assert (101, 'S1') in student_detail._views and (101, 'S2') in student_detail._views
+    assert (102, 'S1') not in student_detail._views
+    assert student_detail.student_view(second, 'S1')['gpa_text'] == "1.60"
+    assert student_detail.student_view(first, 'S9') is student_detail.student_view(first, 'S9')
+
+
+def test_prefetch_is_bounded():
+    dataset = _dataset(103)
+    gate = threading.Event()
+    student_detail._prefetcher.submit(gate.wait, 10)  # hold the worker
+    try:
+        student_detail.prefetch_students(dataset, [f"S{i}" for i in range(20)])
+        assert len(student_detail._inflight) == student_detail._MAX_PREFETCH
+    finally:
+        gate.set()
+    _drain()
+    assert not student_detail._inflight
+    assert sum((103, f"S{i}") in student_detail._views for i in range(20)) == student_detail._MAX_PREFETCH
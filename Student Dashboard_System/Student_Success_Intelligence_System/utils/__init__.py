@@ -4,5 +4,6 @@ Clean, optimized utilities for alert logic and data management
 """
 
 from .alert_logic import AlertSystem
+from .data_store import StudentDataset, get_dataset, load_data, data_version
 
-__all__ = ['AlertSystem']
+__all__ = ['AlertSystem', 'StudentDataset', 'get_dataset', 'load_data', 'data_version']
@@ -0,0 +1,120 @@
+"""
+Aggregate Cube - materialized counts behind the institutional KPIs and charts
+
+Students are grouped once per data version into cells of
+program x risk band x graduation year x performance, each holding the
+student count, prior-GPA sum/count and the number of students under 30
+credits. KPIs and charts roll up the cells matching the current filters,
+so their cost depends on the number of cells, not the number of students.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_store import StudentDataset
+
+
+DIMENSIONS = ('program', 'risk_band', 'graduation_year', 'student_performance')
+MEASURES = ('count', 'gpa_sum', 'gpa_count', 'low_credits')
+
+
+def risk_bands(prior_gpa) -> np.ndarray:
+    """Vectorized risk band from prior GPA: < 2.5 High, < 3.4 Medium, else Low (missing is Medium)."""
+    gpa = pd.to_numeric(pd.Series(prior_gpa), errors='coerce').to_numpy(dtype=float)
+    return np.select([gpa < 2.5, gpa < 3.4, gpa >= 3.4], ['High', 'Medium', 'Low'], 'Medium').astype(object)
+
+
+def build_cells(frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per populated cell; missing dimension values are kept as NA."""
+    n = len(frame)
+    gpa = pd.to_numeric(frame['prior_gpa'], errors='coerce') if 'prior_gpa' in frame.columns else pd.Series(np.nan, index=frame.index)
+    keys = pd.DataFrame({
+        'program': frame['program'].astype(object) if 'program' in frame.columns else None,
+        'risk_band': risk_bands(gpa) if 'prior_gpa' in frame.columns else None,
+        'graduation_year': pd.to_numeric(frame['graduation_year'], errors='coerce') if 'graduation_year' in frame.columns else np.nan,
+        'student_performance': frame['student_performance'].astype(object) if 'student_performance' in frame.columns else None,
+    }, index=frame.index)
+    credits = pd.to_numeric(frame['credits'], errors='coerce') if 'credits' in frame.columns else pd.Series(np.nan, index=frame.index)
+    keys['count'] = np.ones(n, dtype='int64')
+    keys['gpa_sum'] = gpa.fillna(0.0).to_numpy()
+    keys['gpa_count'] = gpa.notna().to_numpy().astype('int64')
+    keys['low_credits'] = (credits < 30).to_numpy().astype('int64')
+    cells = keys.groupby(list(DIMENSIONS), dropna=False, sort=True)[list(MEASURES)].sum().reset_index()
+    return cells
+
+
+class AggregateCube:
+    """Cells of one dataset version plus roll-ups for the institutional dashboard."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.cells = build_cells(frame)
+        self.has_risk = 'prior_gpa' in frame.columns
+        self.has_years = 'graduation_year' in frame.columns
+        self.has_credits = 'credits' in frame.columns
+
+    @property
+    def programs(self) -> List[str]:
+        """Distinct programs, sorted (the options of the program filter)."""
+        return sorted(str(p) for p in self.cells['program'].dropna().unique())
+
+    @property
+    def year_bounds(self) -> Optional[Tuple[int, int]]:
+        """First and last graduation year; None when there are none."""
+        years = self.cells['graduation_year'].dropna() if self.has_years else ()
+        return (int(years.min()), int(years.max())) if len(years) else None
+
+    def slice(self, program: Optional[str] = None, risk: Optional[str] = None,
+              year_range: Optional[Tuple[int, int]] = None) -> pd.DataFrame:
+        """Cells matching the filters; None means "no filter" and years are inclusive."""
+        cells = self.cells
+        keep = np.ones(len(cells), dtype=bool)
+        if program is not None:
+            keep &= (cells['program'] == program).to_numpy()
+        if risk is not None and self.has_risk:
+            keep &= (cells['risk_band'] == risk).to_numpy()
+        if year_range is not None and self.has_years:
+            years = cells['graduation_year']
+            keep &= ((years >= year_range[0]) & (years <= year_range[1])).to_numpy()
+        return cells[keep]
+
+    def kpis(self, cells: Optional[pd.DataFrame] = None) -> Dict:
+        """Total, at-risk (prior GPA < 2.5), average prior GPA and under-30-credit counts."""
+        cells = self.cells if cells is None else cells
+        gpa_count = int(cells['gpa_count'].sum())
+        return {
+            'total': int(cells['count'].sum()),
+            'at_risk': int(cells.loc[cells['risk_band'] == 'High', 'count'].sum()) if self.has_risk else 0,
+            'prior_gpa': float(cells['gpa_sum'].sum()) / gpa_count if self.has_risk and gpa_count else None,
+            'financial_risk': int(cells['low_credits'].sum()) if self.has_credits else 0,
+        }
+
+    @staticmethod
+    def pass_rate_by_program(cells: pd.DataFrame) -> pd.DataFrame:
+        """``program`` / ``Pass Rate (%)`` per program with at least one student."""
+        cells = cells[cells['program'].notna()]
+        passed = cells['count'].where(cells['student_performance'] == 'Pass', 0)
+        grouped = pd.DataFrame({'program': cells['program'], 'passed': passed, 'count': cells['count']}).groupby('program', sort=True).sum()
+        return pd.DataFrame({
+            'program': grouped.index.astype(object),
+            'Pass Rate (%)': (grouped['passed'] / grouped['count'] * 100).to_numpy(),
+        })
+
+    @staticmethod
+    def failing_by_program(cells: pd.DataFrame) -> pd.Series:
+        """Failing students per program, largest first."""
+        failing = cells[(cells['student_performance'] == 'Fail') & cells['program'].notna()]
+        return failing.groupby('program', sort=True)['count'].sum().sort_values(ascending=False, kind='stable')
+
+    @staticmethod
+    def risk_distribution(cells: pd.DataFrame) -> pd.Series:
+        """Students per risk category (Fail -> High, Pass -> Low), largest first."""
+        category = cells['student_performance'].map({'Fail': 'High', 'Pass': 'Low'})
+        counts = cells['count'][category.notna()].groupby(category[category.notna()]).sum()
+        return counts.sort_values(ascending=False, kind='stable').rename_axis(None)
+
+
+def aggregate_cube(dataset: StudentDataset) -> AggregateCube:
+    """The dataset's aggregate cube, built once per data version."""
+    return dataset.derived('aggregate_cube', lambda ds: AggregateCube(ds.frame))
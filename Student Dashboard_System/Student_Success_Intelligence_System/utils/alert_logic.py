@@ -1,214 +1,449 @@
 """
 Alert Logic & Risk Calculation System - Fast & Optimized
+
+Alert thresholds, severities and messages come from config/alert_rules.json
+through utils.rule_engine; this module computes the rule inputs and scores.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import parallel
+from .rule_engine import SEVERITY_NAMES, RulePlan, rule_plan
+
+
+# Severity codes used by the batch API (index into SEVERITY_NAMES)
+SEVERITY_NONE = 0
+SEVERITY_WARNING = 1
+SEVERITY_CRITICAL = 2
+
+# Overall score: (academic, financial, engagement) weights and (Medium, High) cut-offs
+OVERALL_WEIGHTS = (0.4, 0.3, 0.3)
+RISK_CUTOFFS = (40, 70)
+
+# Per-row arrays of a score_batch result (besides the per-type and input dicts)
+_BATCH_COLUMNS = ('overall_score', 'risk_level', 'academic_score', 'financial_score', 'engagement_score',
+                  'critical_alert_count', 'warning_alert_count')
+
+_RISK_LEVELS = np.array(['Low', 'Medium', 'High'], dtype=object)
+_COLORS = ('#2ca02c', '#ff7f0e', '#d62728')
+
+# Entries built per step when an AlertEntryList is iterated
+_MATERIALIZE_BLOCK = 10_000
+
+
+def _to_float(value) -> float:
+    """Scalar coercion used by the thin wrappers: NaN when not numeric."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _numeric_column(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    """Column as float64; missing, empty, zero or unparseable values become ``default``."""
+    if column not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+    values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.where(np.isnan(values) | (values == 0), default, values)
+
+
+def score_cents(overall_score: np.ndarray) -> np.ndarray:
+    """Overall scores (rounded to 2 decimals) as exact integer hundredths, for ranking keys."""
+    return np.rint(np.asarray(overall_score, dtype=np.float64) * 100).astype(np.int64)
+
+
+def rank_alerted(critical: np.ndarray, total: np.ndarray, overall_score: np.ndarray,
+                 k: Optional[int] = None) -> np.ndarray:
+    """Row positions of students with alerts, most urgent first.
+    
+    Ordered by critical alerts, then total alerts, then overall score (all
+    descending); ties keep row order. With ``k``, only the first ``k`` are
+    returned: the three keys are packed into one int64, the k-th largest is
+    found by partial selection (O(n)) and only the winners are sorted.
+    """
+    critical = np.asarray(critical, dtype=np.int64)
+    total = np.asarray(total, dtype=np.int64)
+    cents = score_cents(overall_score)
+    alerted = np.flatnonzero(total)
+    if k is not None and k < len(alerted):
+        if k <= 0:
+            return alerted[:0]
+        c, t, s = critical[alerted], total[alerted], cents[alerted]
+        key = (c * (int(t.max()) + 1) + t) * (int(s.max()) + 1) + s
+        kth = np.partition(key, len(key) - k)[len(key) - k]
+        above = alerted[key > kth]
+        alerted = np.concatenate((above, alerted[key == kth][:k - len(above)]))  # ties: lowest rows
+    order = np.lexsort((alerted, -cents[alerted], -total[alerted], -critical[alerted]))
+    return alerted[order]
+
+
+class AlertEntryList(Sequence):
+    """``get_students_with_alerts`` entries in rank order, built only when read.
+
+    Subclasses provide ``__len__``, ``take`` (the entries at some ranks),
+    ``keys`` and ``student_ids``; indexing, slicing and iteration build
+    dicts for the requested ranks only.
+    """
+
+    def take(self, ranks: np.ndarray) -> List[Dict]:
+        raise NotImplementedError
+
+    def keys(self) -> np.ndarray:
+        """Ranking keys per entry as an (n, 3) int64 array: critical alerts, total alerts, score cents."""
+        raise NotImplementedError
+
+    def student_ids(self) -> np.ndarray:
+        """Student id of each entry, in rank order."""
+        raise NotImplementedError
+
+    @property
+    def total_alerts(self) -> int:
+        return int(self.keys()[:, 1].sum())
+
+    def top(self, k: int) -> List[Dict]:
+        """The ``k`` most urgent entries."""
+        return self[:k]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(np.arange(len(self), dtype=np.intp)[index])
+        position = index + len(self) if index < 0 else index
+        if not 0 <= position < len(self):
+            raise IndexError("alert entry index out of range")
+        return self.take(np.array([position], dtype=np.intp))[0]
+
+    def __iter__(self) -> Iterator[Dict]:
+        for start in range(0, len(self), _MATERIALIZE_BLOCK):
+            yield from self.take(np.arange(start, min(start + _MATERIALIZE_BLOCK, len(self)), dtype=np.intp))
+
+
+class RankedAlerts(AlertEntryList):
+    """Alerted students of one ``score_batch`` pass, ranked by ``rank_alerted``.
+
+    The full ranking is computed on first use; ``top(k)`` before that only
+    selects the ``k`` winners.
+    """
+
+    def __init__(self, df: pd.DataFrame, batch: Dict):
+        self._df = df
+        self._batch = batch
+        self._critical = np.asarray(batch['critical_alert_count'], dtype=np.int64)
+        self._total = self._critical + np.asarray(batch['warning_alert_count'], dtype=np.int64)
+        self._len = int(np.count_nonzero(self._total))
+        self._order: Optional[np.ndarray] = None
+        self._keys: Optional[np.ndarray] = None
+
+    @property
+    def total_alerts(self) -> int:
+        return int(self._total.sum())
+
+    def _positions(self) -> np.ndarray:
+        if self._order is None:
+            self._order = rank_alerted(self._critical, self._total, self._batch['overall_score'])
+        return self._order
+
+    def __len__(self) -> int:
+        return self._len
+
+    def take(self, ranks: np.ndarray) -> List[Dict]:
+        return AlertSystem._alert_entries(self._df, self._batch, self._positions()[ranks])
+
+    def top(self, k: int) -> List[Dict]:
+        if self._order is not None or k >= self._len:
+            return self[:k]
+        return AlertSystem._alert_entries(
+            self._df, self._batch, rank_alerted(self._critical, self._total, self._batch['overall_score'], k))
+
+    def keys(self) -> np.ndarray:
+        if self._keys is None:
+            p = self._positions()
+            self._keys = np.column_stack((self._critical[p], self._total[p],
+                                          score_cents(self._batch['overall_score'][p])))
+        return self._keys
+
+    def student_ids(self) -> np.ndarray:
+        return self._df['student_id'].to_numpy(dtype=object)[self._positions()]
 
 
 class AlertSystem:
     """Fast alert generation and risk scoring system"""
     
-    GPA_CRITICAL = 2.0
-    GPA_WARNING = 2.5
-    ATTENDANCE_WARNING = 80
-    UNPAID_FEES_CRITICAL = 500
-    CREDITS_FRESHMAN = 30
-    COUNSELING_VISITS_MIN = 1
-    WARNINGS_CRITICAL = 2
-    ENGAGEMENT_LOW = 50
+    # ------------------------------------------------------------------
+    # Vectorized rules: each takes NumPy arrays and returns severity codes
+    # from the compiled rule plan (config/alert_rules.json)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _severity(alert_type: str, **columns: np.ndarray) -> np.ndarray:
+        n = len(next(iter(columns.values())))
+        return rule_plan().severity(alert_type, columns, n)[0]
+    
+    @staticmethod
+    def gpa_severity(gpa: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('GPA', gpa=gpa)
+    
+    @staticmethod
+    def financial_severity(unpaid_fees: np.ndarray, aid_delayed: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('Financial', unpaid_fees=unpaid_fees, aid_delayed=aid_delayed)
     
+    @staticmethod
+    def attendance_severity(attendance_pct: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('Attendance', attendance=attendance_pct)
+    
+    @staticmethod
+    def engagement_severity(engagement_score: np.ndarray, counseling_visits: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('Engagement', engagement_score=engagement_score, counseling_visits=counseling_visits)
+    
+    @staticmethod
+    def credits_severity(credits: np.ndarray, is_freshman: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('Credits', credits=credits, is_freshman=is_freshman)
+    
+    @staticmethod
+    def warnings_severity(warnings_count: np.ndarray) -> np.ndarray:
+        return AlertSystem._severity('Warnings', warnings=warnings_count)
+    
+    @staticmethod
+    def rule_inputs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Coerced rule inputs of a cohort (the columns the alert rules and scores read)."""
+        n = len(df)
+        credits = _numeric_column(df, 'credits', 60)
+        if 'financial_aid_status' in df.columns:
+            aid_delayed = (df['financial_aid_status'].fillna('Active').astype(str).str.lower() == 'delayed').to_numpy(dtype=bool)
+        else:
+            aid_delayed = np.zeros(n, dtype=bool)
+        return {
+            'gpa': _numeric_column(df, 'gpa', 3.0),
+            'credits': credits,
+            'warnings': np.trunc(_numeric_column(df, 'warnings', 0)).astype(np.int64),
+            'unpaid_fees': _numeric_column(df, 'unpaid_fees', 0),
+            'attendance': _numeric_column(df, 'attendance', 90),
+            'counseling_visits': np.trunc(_numeric_column(df, 'counseling_visits', 0)).astype(np.int64),
+            'engagement_score': _numeric_column(df, 'engagement_score', 70),
+            'aid_delayed': aid_delayed,
+            'is_freshman': credits < 30,
+        }
+    
+    @staticmethod
+    def component_scores(inputs: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Unrounded academic, financial and engagement scores (0..100) from ``rule_inputs``."""
+        gpa_score = np.clip((4.0 - inputs['gpa']) / 4.0 * 100, 0, 100)
+        credits_score = np.clip((120 - inputs['credits']) / 120 * 100, 0, 100)
+        warnings_score = np.minimum(100, inputs['warnings'] * 50)
+        academic_score = gpa_score * 0.5 + credits_score * 0.3 + warnings_score * 0.2
+        
+        fees_score = np.minimum(100, inputs['unpaid_fees'] / 500 * 100)
+        aid_score = np.where(inputs['aid_delayed'], 50, 0)
+        financial_score = fees_score * 0.6 + aid_score * 0.4
+        
+        attendance_score = np.clip(100 - inputs['attendance'], 0, 100)
+        counseling_score = np.where(inputs['counseling_visits'] < 1, 50, 0)
+        engagement_component = np.clip(100 - inputs['engagement_score'], 0, 100)
+        engagement_score = attendance_score * 0.4 + counseling_score * 0.3 + engagement_component * 0.3
+        return academic_score, financial_score, engagement_score
+    
+    @staticmethod
+    def score_batch(df: pd.DataFrame, plan: Optional[RulePlan] = None) -> Dict:
+        """Score a whole cohort with NumPy array operations.
+
+        Expects the same columns ``calculate_comprehensive_risk_score`` reads
+        from a student dict. Returns a dict of arrays aligned with ``df`` rows:
+        ``academic_score``, ``financial_score``, ``engagement_score``,
+        ``overall_score``, ``risk_level``, ``critical_alert_count``,
+        ``warning_alert_count``, ``severity`` (alert type -> int8 severity
+        codes; ``severity[t] == SEVERITY_CRITICAL`` is that rule's mask),
+        ``rule`` (alert type -> index of the matched rule), ``plan`` (the
+        rule plan used) and ``inputs`` (the coerced rule inputs, used to
+        format messages).
+
+        Large cohorts are scored in chunks on the ``utils.parallel`` backend.
+        """
+        plan = plan or rule_plan()
+        if parallel.resolve(len(df))[0] == 'inline':
+            return AlertSystem._score_batch(df, plan)
+        table = parallel.map_frame(AlertSystem._score_table, df, plan)
+        batch = {k: table[k].to_numpy() for k in _BATCH_COLUMNS}
+        for group in ('severity', 'rule', 'inputs'):
+            prefix = f'{group}:'
+            batch[group] = {c[len(prefix):]: table[c].to_numpy() for c in table.columns if c.startswith(prefix)}
+        batch['plan'] = plan
+        return batch
+    
+    @staticmethod
+    def _score_table(df: pd.DataFrame, plan: RulePlan) -> pd.DataFrame:
+        """``score_batch`` of one chunk as a flat, row-aligned frame (what a parallel worker returns)."""
+        batch = AlertSystem._score_batch(df, plan)
+        columns = {k: batch[k] for k in _BATCH_COLUMNS}
+        for group in ('severity', 'rule', 'inputs'):
+            columns.update({f'{group}:{k}': v for k, v in batch[group].items()})
+        return pd.DataFrame(columns)
+    
+    @staticmethod
+    def _score_batch(df: pd.DataFrame, plan: RulePlan) -> Dict:
+        n = len(df)
+        inputs = AlertSystem.rule_inputs(df)
+        academic_score, financial_score, engagement_score_calc = AlertSystem.component_scores(inputs)
+        
+        w_acad, w_fin, w_eng = OVERALL_WEIGHTS
+        overall_score = academic_score * w_acad + financial_score * w_fin + engagement_score_calc * w_eng
+        risk_level = _RISK_LEVELS[(overall_score >= RISK_CUTOFFS[0]).astype(np.int8) + (overall_score >= RISK_CUTOFFS[1])]
+        
+        severity, rule = plan.evaluate(inputs, n)
+        stacked = np.stack([severity[t] for t in plan.alert_types]) if n and plan.alert_types \
+            else np.zeros((0, n), dtype=np.int8)
+        
+        return {
+            'overall_score': np.round(overall_score, 2),
+            'risk_level': risk_level,
+            'academic_score': np.round(academic_score, 2),
+            'financial_score': np.round(financial_score, 2),
+            'engagement_score': np.round(engagement_score_calc, 2),
+            'severity': severity,
+            'rule': rule,
+            'plan': plan,
+            'critical_alert_count': (stacked == SEVERITY_CRITICAL).sum(axis=0),
+            'warning_alert_count': (stacked == SEVERITY_WARNING).sum(axis=0),
+            'inputs': inputs,
+        }
+    
+    @staticmethod
+    def build_alerts(batch: Dict, positions) -> Dict[int, List[Dict]]:
+        """Materialize alert dicts for the given row positions of a ``score_batch`` result."""
+        positions = np.asarray(positions, dtype=np.intp)
+        alerts: Dict[int, List[Dict]] = {int(p): [] for p in positions}
+        plan, inputs = batch['plan'], batch['inputs']
+        for alert_type in plan.alert_types:
+            sev = batch['severity'][alert_type][positions]
+            hit = sev != SEVERITY_NONE
+            rules = batch['rule'][alert_type][positions][hit]
+            for p, s, r in zip(positions[hit].tolist(), sev[hit].tolist(), rules.tolist()):
+                alerts[p].append({
+                    'type': alert_type,
+                    'severity': SEVERITY_NAMES[s],
+                    'message': plan.message(alert_type, r, inputs, p),
+                })
+        return alerts
+    
+    @staticmethod
+    def _scalar_alert(alert_type: str, **inputs) -> Tuple[str, str, str]:
+        """(severity, message, color) of one alert type for a single student."""
+        plan = rule_plan()
+        columns = {k: np.array([v]) for k, v in inputs.items()}
+        sev, rule = plan.severity(alert_type, columns, 1)
+        sev = int(sev[0])
+        return SEVERITY_NAMES[sev], plan.message(alert_type, int(rule[0]), columns, 0) if sev else '', _COLORS[sev]
+    
+    # ------------------------------------------------------------------
+    # Scalar API: thin wrappers over the vectorized rules
+    # ------------------------------------------------------------------
     @staticmethod
     def calculate_gpa_alert(gpa: float) -> Tuple[str, str, str]:
-        try:
-            gpa_val = float(gpa)
-        except (ValueError, TypeError):
+        gpa_val = _to_float(gpa)
+        if np.isnan(gpa_val):
             return 'none', '', '#999'
-        if gpa_val < 2.0:
-            return 'critical', f'Critical GPA: {gpa_val}', '#d62728'
-        elif gpa_val < 2.5:
-            return 'warning', f'Warning GPA: {gpa_val}', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        return AlertSystem._scalar_alert('GPA', gpa=gpa_val)
     
     @staticmethod
     def calculate_financial_alert(unpaid_fees: float, aid_status: str = 'Active') -> Tuple[str, str, str]:
-        try:
-            fees = float(unpaid_fees) if unpaid_fees else 0
-        except (ValueError, TypeError):
-            fees = 0
-        if fees > 500 or aid_status.lower() == 'delayed':
-            return 'critical', f'Financial risk: ${fees}', '#d62728'
-        elif fees > 100:
-            return 'warning', f'Outstanding: ${fees}', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        fees = _to_float(unpaid_fees) if unpaid_fees else 0
+        fees = 0 if np.isnan(fees) else fees
+        return AlertSystem._scalar_alert('Financial', unpaid_fees=float(fees), aid_delayed=aid_status.lower() == 'delayed')
     
     @staticmethod
     def calculate_attendance_alert(attendance_pct: float) -> Tuple[str, str, str]:
-        try:
-            att = float(attendance_pct)
-        except (ValueError, TypeError):
+        att = _to_float(attendance_pct)
+        if np.isnan(att):
             return 'none', '', '#999'
-        if att < 80:
-            return 'warning', f'Attendance: {att}%', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        return AlertSystem._scalar_alert('Attendance', attendance=att)
     
     @staticmethod
     def calculate_engagement_alert(engagement_score: float, counseling_visits: int = 0) -> Tuple[str, str, str]:
-        try:
-            eng = float(engagement_score)
-        except (ValueError, TypeError):
-            eng = 50
-        if counseling_visits < 1:
-            return 'warning', 'No counseling visits', '#ff7f0e'
-        elif eng < 50:
-            return 'warning', f'Low engagement: {eng}', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        eng = _to_float(engagement_score)
+        eng = 50 if np.isnan(eng) else eng
+        return AlertSystem._scalar_alert('Engagement', engagement_score=eng, counseling_visits=counseling_visits)
     
     @staticmethod
     def calculate_credits_alert(credits: float, is_freshman: bool = False) -> Tuple[str, str, str]:
-        try:
-            cred = float(credits)
-        except (ValueError, TypeError):
-            cred = 0
-        if cred < 30 and is_freshman:
-            return 'critical', f'Dropout risk: {cred} credits', '#d62728'
-        elif cred < 30:
-            return 'warning', f'Low credits: {cred}', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        cred = _to_float(credits)
+        cred = 0 if np.isnan(cred) else cred
+        return AlertSystem._scalar_alert('Credits', credits=cred, is_freshman=bool(is_freshman))
     
     @staticmethod
     def calculate_warnings_alert(warnings_count: int) -> Tuple[str, str, str]:
-        if warnings_count >= 2:
-            return 'critical', f'{warnings_count} warnings', '#d62728'
-        elif warnings_count > 0:
-            return 'warning', f'{warnings_count} warning(s)', '#ff7f0e'
-        return 'none', '', '#2ca02c'
+        count = _to_float(warnings_count)
+        count = 0.0 if np.isnan(count) else count
+        return AlertSystem._scalar_alert('Warnings', warnings=int(count) if count.is_integer() else count)
     
     @staticmethod
     def calculate_comprehensive_risk_score(student_data: Dict) -> Dict:
-        """Fast risk score calculation"""
-        gpa = float(student_data.get('gpa', 3.0)) if student_data.get('gpa') else 3.0
-        credits = float(student_data.get('credits', 60)) if student_data.get('credits') else 60
-        warnings = int(student_data.get('warnings', 0)) if student_data.get('warnings') else 0
-        unpaid = float(student_data.get('unpaid_fees', 0)) if student_data.get('unpaid_fees') else 0
-        aid_status = student_data.get('financial_aid_status', 'Active')
-        attendance = float(student_data.get('attendance', 90)) if student_data.get('attendance') else 90
-        counseling = int(student_data.get('counseling_visits', 0)) if student_data.get('counseling_visits') else 0
-        engagement = float(student_data.get('engagement_score', 70)) if student_data.get('engagement_score') else 70
-        
-        gpa_score = min(100, max(0, (4.0 - gpa) / 4.0 * 100))
-        credits_score = min(100, max(0, (120 - credits) / 120 * 100))
-        warnings_score = min(100, warnings * 50)
-        academic_score = (gpa_score * 0.5 + credits_score * 0.3 + warnings_score * 0.2)
-        
-        fees_score = min(100, (unpaid / 500 * 100)) if unpaid and 500 > 0 else 0
-        aid_score = 50 if aid_status.lower() == 'delayed' else 0
-        financial_score = (fees_score * 0.6 + aid_score * 0.4)
-        
-        attendance_score = min(100, max(0, (100 - attendance) / 100 * 100))
-        counseling_score = 50 if counseling < 1 else 0
-        engagement_score_component = min(100, max(0, (100 - engagement) / 100 * 100))
-        engagement_score_calc = (attendance_score * 0.4 + counseling_score * 0.3 + engagement_score_component * 0.3)
-        
-        overall_score = (academic_score * 0.4 + financial_score * 0.3 + engagement_score_calc * 0.3)
-        
-        if overall_score >= 70:
-            risk_level = 'High'
-        elif overall_score >= 40:
-            risk_level = 'Medium'
-        else:
-            risk_level = 'Low'
-        
-        alerts = []
-        gpa_sev, gpa_msg, _ = AlertSystem.calculate_gpa_alert(gpa)
-        if gpa_sev != 'none':
-            alerts.append({'type': 'GPA', 'severity': gpa_sev, 'message': gpa_msg})
-        
-        fin_sev, fin_msg, _ = AlertSystem.calculate_financial_alert(unpaid, aid_status)
-        if fin_sev != 'none':
-            alerts.append({'type': 'Financial', 'severity': fin_sev, 'message': fin_msg})
-        
-        att_sev, att_msg, _ = AlertSystem.calculate_attendance_alert(attendance)
-        if att_sev != 'none':
-            alerts.append({'type': 'Attendance', 'severity': att_sev, 'message': att_msg})
-        
-        eng_sev, eng_msg, _ = AlertSystem.calculate_engagement_alert(engagement, counseling)
-        if eng_sev != 'none':
-            alerts.append({'type': 'Engagement', 'severity': eng_sev, 'message': eng_msg})
-        
-        cred_sev, cred_msg, _ = AlertSystem.calculate_credits_alert(credits, is_freshman=(credits < 30))
-        if cred_sev != 'none':
-            alerts.append({'type': 'Credits', 'severity': cred_sev, 'message': cred_msg})
-        
-        warn_sev, warn_msg, _ = AlertSystem.calculate_warnings_alert(warnings)
-        if warn_sev != 'none':
-            alerts.append({'type': 'Warnings', 'severity': warn_sev, 'message': warn_msg})
-        
+        """Fast risk score calculation (single-row view of ``score_batch``)"""
+        batch = AlertSystem.score_batch(pd.DataFrame([student_data]))
         return {
-            'overall_score': round(overall_score, 2),
-            'risk_level': risk_level,
-            'academic_score': round(academic_score, 2),
-            'financial_score': round(financial_score, 2),
-            'engagement_score': round(engagement_score_calc, 2),
-            'alerts': alerts,
-            'critical_alert_count': len([a for a in alerts if a['severity'] == 'critical']),
-            'warning_alert_count': len([a for a in alerts if a['severity'] == 'warning'])
+            'overall_score': float(batch['overall_score'][0]),
+            'risk_level': batch['risk_level'][0],
+            'academic_score': float(batch['academic_score'][0]),
+            'financial_score': float(batch['financial_score'][0]),
+            'engagement_score': float(batch['engagement_score'][0]),
+            'alerts': AlertSystem.build_alerts(batch, [0])[0],
+            'critical_alert_count': int(batch['critical_alert_count'][0]),
+            'warning_alert_count': int(batch['warning_alert_count'][0])
         }
     
     @staticmethod
-    def get_students_with_alerts(df: pd.DataFrame) -> Tuple[List[Dict], int]:
-        """Get students with alerts - optimized for speed"""
-        if df.empty:
-            return [], 0
+    def _alert_entries(df: pd.DataFrame, batch: Dict, positions: np.ndarray) -> List[Dict]:
+        """One ``get_students_with_alerts`` dict per row position, in the given order."""
+        alerts_by_row = AlertSystem.build_alerts(batch, positions)
+        
+        def column(name: str) -> List:
+            return df[name].iloc[positions].tolist() if name in df.columns else [None] * len(positions)
         
-        students_with_alerts = []
-        total_alerts = 0
+        student_ids, names, advisors = column('student_id'), column('name'), column('advisor')
+        risk_levels = batch['risk_level'][positions].tolist()
+        overall = batch['overall_score'][positions].tolist()
+        return [
+            {
+                'student_id': student_ids[i],
+                'name': names[i],
+                'advisor': advisors[i],
+                'alerts': alerts_by_row[p],
+                'risk_level': risk_levels[i],
+                'overall_score': float(overall[i])
+            }
+            for i, p in enumerate(positions.tolist())
+        ]
+    
+    @staticmethod
+    def rank_students_with_alerts(df: pd.DataFrame, plan: Optional[RulePlan] = None) -> RankedAlerts:
+        """Score ``df`` and return its alerted students as a lazily built ``RankedAlerts``.
         
-        alert_store = None
-        try:
-            from . import alert_store as _alert_store
-            alert_store = _alert_store
-            alert_store.init_db()
-        except Exception:
-            pass
+        Nothing is handed to the alert writer; ``top(k)`` builds dicts for
+        the ``k`` winners only.
+        """
+        return RankedAlerts(df, AlertSystem.score_batch(df, plan))
+    
+    @staticmethod
+    def get_students_with_alerts(df: pd.DataFrame, plan: Optional[RulePlan] = None,
+                                 persist: bool = True) -> Tuple[List[Dict], int]:
+        """Get students with alerts - optimized for speed
         
-        for _, row in df.iterrows():
-            student_data = row.to_dict()
-            risk_assessment = AlertSystem.calculate_comprehensive_risk_score(student_data)
-            
-            if risk_assessment['alerts']:
-                sid = row.get('student_id')
-                students_with_alerts.append({
-                    'student_id': sid,
-                    'name': row.get('name'),
-                    'advisor': row.get('advisor'),
-                    'alerts': risk_assessment['alerts'],
-                    'risk_level': risk_assessment['risk_level'],
-                    'overall_score': risk_assessment['overall_score']
-                })
-                total_alerts += len(risk_assessment['alerts'])
-                
-                if alert_store:
-                    for a in risk_assessment['alerts']:
-                        try:
-                            alert_store.log_alert(
-                                student_id=sid,
-                                alert_type=a.get('type'),
-                                severity=a.get('severity'),
-                                message=a.get('message'),
-                                source='rule_engine'
-                            )
-                        except Exception:
-                            pass
+        Every alerted student, ranked by ``rank_alerted``; returns the list and
+        the total number of alerts. With ``persist`` the alerts are also
+        handed to the background alert writer.
+        """
+        if df.empty:
+            return [], 0
         
-        students_with_alerts.sort(
-            key=lambda x: (
-                -len([a for a in x['alerts'] if a['severity'] == 'critical']),
-                -len(x['alerts'])
-            )
-        )
+        ranked = AlertSystem.rank_students_with_alerts(df, plan)
+        students_with_alerts = list(ranked)
+        if persist:
+            try:
+                from . import alert_writer
+                alert_writer.enqueue_entries(students_with_alerts)
+            except Exception:
+                pass
         
-        return students_with_alerts, total_alerts
+        return students_with_alerts, ranked.total_alerts
     
     @staticmethod
     def get_alert_color(severity: str) -> str:
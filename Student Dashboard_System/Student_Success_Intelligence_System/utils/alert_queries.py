@@ -0,0 +1,127 @@
+"""
+Alert Queries - indexed, keyset-paginated readers over alerts.db
+
+Every paged reader returns ``(rows, next_cursor)``; pass ``next_cursor`` back
+as ``after`` to fetch the following page, ``None`` means there are no more
+rows. Keyset pagination keeps each page an index range scan no matter how
+deep the caller pages, unlike OFFSET.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from .alert_store import AlertLog, _connection, init_db
+
+
+# (last_seen_at, id) or (created_at, id) of the last row on a page
+Cursor = Tuple[str, int]
+Page = Tuple[List[AlertLog], Optional[Cursor]]
+
+DEFAULT_PAGE_SIZE = 25
+
+# An alert is open until someone acknowledges its type for that student
+# after the alert was first raised (``closed_at`` is maintained by triggers).
+_OPEN = "a.closed_at IS NULL"
+
+
+class DailyCount(TypedDict):
+    day: str
+    alert_type: str
+    count: int
+
+
+def _page(sql: str, params: list, limit: int, key: str, db_path: Optional[Path]) -> Page:
+    init_db(db_path)
+    rows = _connection(db_path).execute(sql, params + [limit + 1]).fetchall()
+    alerts = [AlertLog(**dict(r)) for r in rows[:limit]]
+    cursor = (alerts[-1][key], alerts[-1]['id']) if len(rows) > limit else None
+    return alerts, cursor
+
+
+def alerts_for_student(student_id: str, after: Optional[Cursor] = None,
+                       limit: int = DEFAULT_PAGE_SIZE, db_path: Optional[Path] = None) -> Page:
+    """A student's alerts, most recently seen first."""
+    sql = "SELECT a.* FROM alert_logs a WHERE a.student_id = ?"
+    params: list = [student_id]
+    if after is not None:
+        sql += " AND (a.last_seen_at, a.id) < (?, ?)"
+        params += list(after)
+    sql += " ORDER BY a.last_seen_at DESC, a.id DESC LIMIT ?"
+    return _page(sql, params, limit, 'last_seen_at', db_path)
+
+
+def alerts_in_window(start: str, end: str, alert_type: Optional[str] = None,
+                     after: Optional[Cursor] = None, limit: int = DEFAULT_PAGE_SIZE,
+                     db_path: Optional[Path] = None) -> Page:
+    """Alerts first raised in ``[start, end)`` (ISO timestamps), newest first."""
+    sql = "SELECT a.* FROM alert_logs a WHERE a.created_at >= ? AND a.created_at < ?"
+    params: list = [start, end]
+    if alert_type is not None:
+        sql += " AND a.alert_type = ?"
+        params.append(alert_type)
+    if after is not None:
+        sql += " AND (a.created_at, a.id) < (?, ?)"
+        params += list(after)
+    sql += " ORDER BY a.created_at DESC, a.id DESC LIMIT ?"
+    return _page(sql, params, limit, 'created_at', db_path)
+
+
+def open_alerts(severity: Optional[str] = None, after: Optional[Cursor] = None,
+                limit: int = DEFAULT_PAGE_SIZE, db_path: Optional[Path] = None) -> Page:
+    """Unacknowledged alerts, optionally of one severity, most recently seen first."""
+    sql = f"SELECT a.* FROM alert_logs a WHERE {_OPEN}"
+    params: list = []
+    if severity is not None:
+        sql += " AND a.severity = ?"
+        params.append(severity)
+    if after is not None:
+        sql += " AND (a.last_seen_at, a.id) < (?, ?)"
+        params += list(after)
+    sql += " ORDER BY a.last_seen_at DESC, a.id DESC LIMIT ?"
+    return _page(sql, params, limit, 'last_seen_at', db_path)
+
+
+def count_open_by_severity(db_path: Optional[Path] = None) -> Dict[str, int]:
+    """Open alerts per severity, read from the trigger-maintained counter table."""
+    init_db(db_path)
+    rows = _connection(db_path).execute(
+        "SELECT severity, count FROM alert_open_counts WHERE count > 0")
+    return {sev or 'none': n for sev, n in rows}
+
+
+def counts_per_day(start: Optional[str] = None, end: Optional[str] = None,
+                   db_path: Optional[Path] = None) -> List[DailyCount]:
+    """Number of alerts first raised per day and type.
+
+    Without bounds the answer comes from the trigger-maintained daily counter
+    table; a window is answered from the created_at index.
+    """
+    init_db(db_path)
+    if start is None and end is None:
+        rows = _connection(db_path).execute(
+            "SELECT day, alert_type, count FROM alert_daily_counts WHERE count > 0 ORDER BY day, alert_type")
+        return [DailyCount(**dict(r)) for r in rows]
+    sql = "SELECT substr(created_at, 1, 10) AS day, alert_type, COUNT(*) AS count FROM alert_logs"
+    clauses, params = [], []
+    if start is not None:
+        clauses.append("created_at >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("created_at < ?")
+        params.append(end)
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " GROUP BY day, alert_type ORDER BY day, alert_type"
+    return [DailyCount(**dict(r)) for r in _connection(db_path).execute(sql, params)]
+
+
+def counts_by_type(student_id: Optional[str] = None, db_path: Optional[Path] = None) -> Dict[str, int]:
+    init_db(db_path)
+    if student_id is None:
+        rows = _connection(db_path).execute(
+            "SELECT alert_type, COUNT(*) FROM alert_logs GROUP BY alert_type")
+    else:
+        rows = _connection(db_path).execute(
+            "SELECT alert_type, COUNT(*) FROM alert_logs WHERE student_id = ? GROUP BY alert_type",
+            (student_id,))
+    return {t: n for t, n in rows}
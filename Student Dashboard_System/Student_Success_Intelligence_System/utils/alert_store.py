@@ -0,0 +1,388 @@
+"""
+Alert Store - SQLite persistence for rule-engine alerts, acknowledgements and interventions
+
+Alerts are written in batches: ``write_alerts`` upserts a whole scoring pass
+in one transaction (utils.alert_writer feeds it from a background thread).
+Alert logging is idempotent: each alert has a fingerprint (student, type,
+severity, message template) and re-logging it while it is open only bumps
+``last_seen_at`` and ``occurrence_count``, so the table grows with distinct
+alerts rather than with page views. Once acknowledged, the next recurrence
+of the same fingerprint is logged as a new, open alert.
+Open alerts per severity and alerts raised per day are kept in small summary
+tables by triggers on alert_logs and acknowledgements, so the dashboard
+counters never scan the log.
+Set ALERTS_DB_PATH to point the store at a different database file.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from .data_store import DATA_DIR
+
+
+DB_PATH = Path(os.environ.get('ALERTS_DB_PATH', DATA_DIR / "alerts.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    severity TEXT,
+    message TEXT,
+    source TEXT,
+    created_at TEXT NOT NULL,
+    fingerprint TEXT,
+    last_seen_at TEXT,
+    occurrence_count INTEGER NOT NULL DEFAULT 1,
+    closed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS acknowledgements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    acknowledged_by TEXT,
+    acknowledged_at TEXT NOT NULL,
+    note TEXT
+);
+CREATE TABLE IF NOT EXISTS interventions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    alert_type TEXT,
+    assigned_to TEXT,
+    priority TEXT,
+    notes TEXT,
+    status TEXT,
+    created_at TEXT NOT NULL,
+    due_date TEXT
+);
+CREATE TABLE IF NOT EXISTS alert_open_counts (
+    severity TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS alert_daily_counts (
+    day TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, alert_type)
+);
+"""
+
+# Covering indexes for the readers in alert_queries (per student, per type,
+# per severity and time-window scans); rowid rides along in every index.
+INDEXES = """
+CREATE INDEX IF NOT EXISTS ix_alert_logs_student_seen ON alert_logs (student_id, last_seen_at, id);
+CREATE INDEX IF NOT EXISTS ix_alert_logs_severity_seen ON alert_logs (severity, last_seen_at, id);
+CREATE INDEX IF NOT EXISTS ix_alert_logs_type_created ON alert_logs (alert_type, created_at);
+CREATE INDEX IF NOT EXISTS ix_alert_logs_created_type ON alert_logs (created_at, alert_type);
+CREATE INDEX IF NOT EXISTS ix_acknowledgements_student_type ON acknowledgements (student_id, alert_type, acknowledged_at);
+CREATE INDEX IF NOT EXISTS ix_interventions_student_created ON interventions (student_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_interventions_type_created ON interventions (alert_type, created_at);
+"""
+
+# An alert is open until someone acknowledges its type for that student at or
+# after the time it was first raised; ``closed_at`` records that moment, and
+# the triggers keep the two counter tables in step with every insert,
+# delete and acknowledgement.
+TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS tr_alert_logs_insert AFTER INSERT ON alert_logs BEGIN
+    UPDATE alert_logs SET closed_at = (
+        SELECT MIN(k.acknowledged_at) FROM acknowledgements k
+        WHERE k.student_id = NEW.student_id AND k.alert_type = NEW.alert_type
+          AND k.acknowledged_at >= NEW.created_at)
+    WHERE id = NEW.id AND EXISTS (
+        SELECT 1 FROM acknowledgements k
+        WHERE k.student_id = NEW.student_id AND k.alert_type = NEW.alert_type
+          AND k.acknowledged_at >= NEW.created_at);
+    INSERT INTO alert_open_counts (severity, count)
+        SELECT coalesce(NEW.severity, ''), 1 WHERE NOT EXISTS (
+            SELECT 1 FROM acknowledgements k
+            WHERE k.student_id = NEW.student_id AND k.alert_type = NEW.alert_type
+              AND k.acknowledged_at >= NEW.created_at)
+        ON CONFLICT (severity) DO UPDATE SET count = count + 1;
+    INSERT INTO alert_daily_counts (day, alert_type, count)
+        VALUES (substr(NEW.created_at, 1, 10), NEW.alert_type, 1)
+        ON CONFLICT (day, alert_type) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_alert_logs_delete AFTER DELETE ON alert_logs BEGIN
+    UPDATE alert_open_counts SET count = count - 1
+    WHERE OLD.closed_at IS NULL AND severity = coalesce(OLD.severity, '');
+    UPDATE alert_daily_counts SET count = count - 1
+    WHERE day = substr(OLD.created_at, 1, 10) AND alert_type = OLD.alert_type;
+END;
+CREATE TRIGGER IF NOT EXISTS tr_acknowledgements_insert AFTER INSERT ON acknowledgements BEGIN
+    UPDATE alert_open_counts SET count = count - (
+        SELECT COUNT(*) FROM alert_logs a
+        WHERE a.student_id = NEW.student_id AND a.alert_type = NEW.alert_type
+          AND a.closed_at IS NULL AND a.created_at <= NEW.acknowledged_at
+          AND coalesce(a.severity, '') = alert_open_counts.severity);
+    UPDATE alert_logs SET closed_at = NEW.acknowledged_at
+    WHERE student_id = NEW.student_id AND alert_type = NEW.alert_type
+      AND closed_at IS NULL AND created_at <= NEW.acknowledged_at;
+END;
+"""
+
+# Applied to every connection. WAL lets readers proceed while a pass is being
+# written; NORMAL sync is durable at checkpoint and much cheaper per commit.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8000",
+)
+
+# Numbers inside a message (GPA, fees, percentages) are not part of its identity
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+class AlertLog(TypedDict):
+    id: int
+    student_id: str
+    alert_type: str
+    severity: Optional[str]
+    message: Optional[str]
+    source: Optional[str]
+    created_at: str
+    fingerprint: Optional[str]
+    last_seen_at: Optional[str]
+    occurrence_count: int
+    closed_at: Optional[str]
+
+
+class Acknowledgement(TypedDict):
+    id: int
+    student_id: str
+    alert_type: str
+    acknowledged_by: Optional[str]
+    acknowledged_at: str
+    note: Optional[str]
+
+
+class Intervention(TypedDict):
+    id: int
+    student_id: str
+    alert_type: Optional[str]
+    assigned_to: Optional[str]
+    priority: Optional[str]
+    notes: Optional[str]
+    status: Optional[str]
+    created_at: str
+    due_date: Optional[str]
+
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized: set = set()
+
+
+def _connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Per-thread connection (sqlite3 connections must stay on their thread)."""
+    path = str(db_path or DB_PATH)
+    conns = getattr(_local, 'conns', None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        conns[path] = conn
+    return conn
+
+
+def message_template(message: Optional[str]) -> str:
+    """Message with its numeric values masked, e.g. 'Critical GPA: #'."""
+    return _NUMBER.sub('#', message or '')
+
+
+def alert_fingerprint(student_id: str, alert_type: str, severity: Optional[str],
+                      message: Optional[str]) -> str:
+    """Stable identity of an open alert, independent of when it was seen."""
+    key = '\x1f'.join((str(student_id), str(alert_type), str(severity or ''), message_template(message)))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _migrate_alert_logs(conn: sqlite3.Connection) -> None:
+    """Add the dedup columns to a pre-fingerprint alert_logs table and collapse duplicates."""
+    columns = {r['name'] for r in conn.execute("PRAGMA table_info(alert_logs)")}
+    if 'fingerprint' not in columns:
+        conn.execute("ALTER TABLE alert_logs ADD COLUMN fingerprint TEXT")
+    if 'last_seen_at' not in columns:
+        conn.execute("ALTER TABLE alert_logs ADD COLUMN last_seen_at TEXT")
+    if 'occurrence_count' not in columns:
+        conn.execute("ALTER TABLE alert_logs ADD COLUMN occurrence_count INTEGER NOT NULL DEFAULT 1")
+    if 'closed_at' not in columns:
+        conn.execute("ALTER TABLE alert_logs ADD COLUMN closed_at TEXT")
+        _rebuild_summaries(conn)
+
+    legacy = conn.execute(
+        "SELECT id, student_id, alert_type, severity, message, created_at, occurrence_count "
+        "FROM alert_logs WHERE fingerprint IS NULL ORDER BY id"
+    ).fetchall()
+    if not legacy:
+        return
+    # fingerprint -> [keep_id, first_seen, last_seen, count]
+    groups: Dict[str, List] = {}
+    for r in conn.execute("SELECT id, fingerprint, created_at, last_seen_at, occurrence_count "
+                          "FROM alert_logs WHERE fingerprint IS NOT NULL"):
+        groups[r['fingerprint']] = [r['id'], r['created_at'], r['last_seen_at'] or r['created_at'], r['occurrence_count']]
+    duplicates = []
+    for r in legacy:
+        fp = alert_fingerprint(r['student_id'], r['alert_type'], r['severity'], r['message'])
+        group = groups.get(fp)
+        if group is None:
+            groups[fp] = [r['id'], r['created_at'], r['created_at'], r['occurrence_count']]
+        else:
+            group[1] = min(group[1], r['created_at'])
+            group[2] = max(group[2], r['created_at'])
+            group[3] += r['occurrence_count']
+            duplicates.append((r['id'],))
+    conn.executemany("DELETE FROM alert_logs WHERE id = ?", duplicates)
+    conn.executemany(
+        "UPDATE alert_logs SET fingerprint = ?, created_at = ?, last_seen_at = ?, occurrence_count = ? WHERE id = ?",
+        [(fp, first, last, count, keep_id) for fp, (keep_id, first, last, count) in groups.items()],
+    )
+    _rebuild_summaries(conn)
+
+
+def _rebuild_summaries(conn: sqlite3.Connection) -> None:
+    """Recompute ``closed_at`` and both counter tables from the full log (migrations only)."""
+    conn.execute(
+        "UPDATE alert_logs SET closed_at = (SELECT MIN(k.acknowledged_at) FROM acknowledgements k "
+        "WHERE k.student_id = alert_logs.student_id AND k.alert_type = alert_logs.alert_type "
+        "AND k.acknowledged_at >= alert_logs.created_at)"
+    )
+    conn.execute("DELETE FROM alert_open_counts")
+    conn.execute(
+        "INSERT INTO alert_open_counts (severity, count) "
+        "SELECT coalesce(severity, ''), COUNT(*) FROM alert_logs WHERE closed_at IS NULL GROUP BY 1"
+    )
+    conn.execute("DELETE FROM alert_daily_counts")
+    conn.execute(
+        "INSERT INTO alert_daily_counts (day, alert_type, count) "
+        "SELECT substr(created_at, 1, 10), alert_type, COUNT(*) FROM alert_logs GROUP BY 1, 2"
+    )
+
+
+def init_db(db_path: Optional[Path] = None) -> None:
+    """Create/migrate the tables if needed (once per process per database file)."""
+    path = str(db_path or DB_PATH)
+    if path in _initialized:
+        return
+    with _init_lock:
+        if path in _initialized:
+            return
+        conn = _connection(db_path)
+        with conn:
+            conn.executescript(SCHEMA)
+        with conn:
+            _migrate_alert_logs(conn)
+            # Fingerprints are unique among open alerts only (older files had a full unique index)
+            conn.execute("DROP INDEX IF EXISTS ux_alert_logs_fingerprint")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ux_alert_logs_open_fingerprint "
+                         "ON alert_logs (fingerprint) WHERE closed_at IS NULL")
+        conn.executescript(TRIGGERS)
+        conn.executescript(INDEXES)
+        conn.execute("PRAGMA optimize")
+        _initialized.add(path)
+
+
+def _now() -> str:
+    return datetime.now().isoformat()
+
+
+# ----------------------------------------------------------------------------
+# Writes
+# ----------------------------------------------------------------------------
+def write_alerts(rows: List[Tuple], db_path: Optional[Path] = None) -> int:
+    """Upsert ``(student_id, alert_type, severity, message, source, created_at)`` rows in one transaction.
+
+    A fingerprint with an open alert only gets ``last_seen_at`` and
+    ``occurrence_count`` bumped; otherwise (new, or acknowledged since) a
+    new alert is inserted.
+    """
+    if not rows:
+        return 0
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO alert_logs (student_id, alert_type, severity, message, source, created_at, "
+            "fingerprint, last_seen_at, occurrence_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT (fingerprint) WHERE closed_at IS NULL DO UPDATE SET "
+            "last_seen_at = excluded.last_seen_at, occurrence_count = occurrence_count + 1",
+            [(*r, alert_fingerprint(r[0], r[1], r[2], r[3]), r[5]) for r in rows],
+        )
+    return len(rows)
+
+
+def acknowledge(student_id: str, alert_type: str, acknowledged_by: Optional[str] = None,
+                note: Optional[str] = None, db_path: Optional[Path] = None) -> int:
+    """Record an acknowledgement; returns its id."""
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO acknowledgements (student_id, alert_type, acknowledged_by, acknowledged_at, note) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (student_id, alert_type, acknowledged_by, _now(), note),
+        )
+    return cur.lastrowid
+
+
+def add_intervention(student_id: str, alert_type: Optional[str] = None, assigned_to: Optional[str] = None,
+                     priority: Optional[str] = None, notes: Optional[str] = None,
+                     status: str = 'Open', due_date: Optional[str] = None,
+                     db_path: Optional[Path] = None) -> int:
+    """Record an intervention; returns its id."""
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        cur = conn.execute(
+            "INSERT INTO interventions (student_id, alert_type, assigned_to, priority, notes, status, created_at, due_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (student_id, alert_type, assigned_to, priority, notes, status, _now(), due_date),
+        )
+    return cur.lastrowid
+
+
+# ----------------------------------------------------------------------------
+# Reads
+# ----------------------------------------------------------------------------
+def get_alerts(student_id: Optional[str] = None, limit: int = 100,
+               db_path: Optional[Path] = None) -> List[AlertLog]:
+    """Most recent alerts, optionally for one student."""
+    init_db(db_path)
+    conn = _connection(db_path)
+    if student_id is None:
+        rows = conn.execute("SELECT * FROM alert_logs ORDER BY id DESC LIMIT ?", (limit,))
+    else:
+        rows = conn.execute("SELECT * FROM alert_logs WHERE student_id = ? ORDER BY id DESC LIMIT ?",
+                            (student_id, limit))
+    return [AlertLog(**dict(r)) for r in rows]
+
+
+def count_alerts(db_path: Optional[Path] = None) -> int:
+    init_db(db_path)
+    return _connection(db_path).execute("SELECT COUNT(*) FROM alert_logs").fetchone()[0]
+
+
+def get_acknowledgements(student_id: str, db_path: Optional[Path] = None) -> List[Acknowledgement]:
+    init_db(db_path)
+    rows = _connection(db_path).execute(
+        "SELECT * FROM acknowledgements WHERE student_id = ? ORDER BY id DESC", (student_id,))
+    return [Acknowledgement(**dict(r)) for r in rows]
+
+
+def get_interventions(student_id: str, db_path: Optional[Path] = None) -> List[Intervention]:
+    init_db(db_path)
+    rows = _connection(db_path).execute(
+        "SELECT * FROM interventions WHERE student_id = ? ORDER BY id DESC", (student_id,))
+    return [Intervention(**dict(r)) for r in rows]
@@ -0,0 +1,215 @@
+"""
+Alert Writer - process-wide background thread that persists rule-engine alerts
+
+The render path only enqueues; one writer thread drains the bounded queue and
+upserts batches through alert_store, so concurrent sessions never contend
+for the SQLite write lock and a page never waits on disk. A whole scoring
+pass can be queued as one item; its rows are built on the writer thread.
+
+MAX_QUEUE bounds queued items, not rows: a single row and a whole pass
+each take one slot. A pass holds no rows of its own, only the entry
+sequence (which the risk snapshot keeps anyway), and the writer builds
+at most BATCH_SIZE of its rows at a time.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import alert_store
+
+
+MAX_QUEUE = 50_000      # items (rows or passes) buffered before new alerts are dropped
+BATCH_SIZE = 2_000      # flush as soon as this many rows are waiting...
+FLUSH_INTERVAL = 1.0    # ...or this many seconds after the first one arrived
+
+_STOP = object()
+
+
+class _Pass:
+    """Rows of one scoring pass, built and written by the writer thread."""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows: Iterable[Tuple]):
+        self.rows = rows
+
+
+class AlertWriter:
+    """Bounded queue + writer thread with size/time based flushing."""
+
+    def __init__(self, max_queue: int = MAX_QUEUE, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, db_path: Optional[Path] = None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.db_path = db_path
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats = {'enqueued': 0, 'written': 0, 'dropped': 0, 'failed': 0, 'batches': 0,
+                       'passes_dropped': 0}
+        self._thread = threading.Thread(target=self._run, name="alert-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Producer side (render threads)
+    # ------------------------------------------------------------------
+    def enqueue(self, rows: Iterable[Tuple], timeout: float = 0.0) -> int:
+        """Queue alert rows without blocking (or for at most ``timeout`` seconds each).
+
+        Rows that do not fit are dropped and counted; returns how many were accepted.
+        """
+        accepted = dropped = 0
+        for row in rows:
+            try:
+                if timeout:
+                    self._queue.put(row, timeout=timeout)
+                else:
+                    self._queue.put_nowait(row)
+                accepted += 1
+            except queue.Full:
+                dropped += 1
+        with self._lock:
+            self._stats['enqueued'] += accepted
+            self._stats['dropped'] += dropped
+        return accepted
+
+    def enqueue_pass(self, rows: Iterable[Tuple]) -> bool:
+        """Queue a lazily built pass as a single item; False (and counted) if the queue is full.
+
+        The pass counts as one item against ``MAX_QUEUE``, however many rows it yields.
+        """
+        try:
+            self._queue.put_nowait(_Pass(rows))
+            return True
+        except queue.Full:
+            with self._lock:
+                self._stats['passes_dropped'] += 1
+            return False
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until everything queued so far is written; True if it finished in time."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Write what is left and stop the thread; gives up after ``timeout`` if the queue stays full."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'queued': self._queue.qsize()}
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _write(self, batch: List[Tuple]) -> None:
+        if not batch:
+            return
+        try:
+            alert_store.write_alerts(batch, self.db_path)
+            with self._lock:
+                self._stats['written'] += len(batch)
+                self._stats['batches'] += 1
+        except Exception:
+            # A bad row (or a database error) fails its batch, never the thread
+            with self._lock:
+                self._stats['failed'] += len(batch)
+        batch.clear()
+
+    def _write_pass(self, rows: Iterable[Tuple]) -> None:
+        rows = iter(rows)
+        while True:
+            try:
+                batch = list(islice(rows, self.batch_size))
+            except Exception:
+                # Building the rows failed; what was written so far stays
+                return
+            if not batch:
+                return
+            with self._lock:
+                self._stats['enqueued'] += len(batch)
+            self._write(batch)
+
+    def _run(self) -> None:
+        batch: List[Tuple] = []
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, _Pass):
+                self._write(batch)
+                deadline = None
+                self._write_pass(item.rows)
+                continue
+            if isinstance(item, threading.Event):
+                self._write(batch)
+                deadline = None
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if len(batch) >= self.batch_size or (deadline is not None and time.monotonic() >= deadline):
+                self._write(batch)
+                deadline = None
+
+
+_writer: Optional[AlertWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> AlertWriter:
+    """The process-wide writer, started on first use and flushed at exit."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AlertWriter()
+                atexit.register(_writer.stop)
+    return _writer
+
+
+def enqueue_alerts(alerts: Iterable[Dict], source: str = 'rule_engine') -> int:
+    """Queue a scoring pass (dicts with student_id/type/severity/message) for the writer."""
+    created_at = datetime.now().isoformat()
+    return get_writer().enqueue(
+        (a['student_id'], a['type'], a.get('severity'), a.get('message'), source, created_at)
+        for a in alerts
+    )
+
+
+def enqueue_entries(entries: Iterable[Dict], source: str = 'rule_engine') -> bool:
+    """Queue every alert of ``get_students_with_alerts`` entries as one pass.
+
+    The entries are only read on the writer thread, so a lazily built
+    ``AlertEntryList`` is never materialized on the render path.
+    """
+    created_at = datetime.now().isoformat()
+    return get_writer().enqueue_pass(
+        (s['student_id'], a['type'], a.get('severity'), a.get('message'), source, created_at)
+        for s in entries for a in s['alerts']
+    )
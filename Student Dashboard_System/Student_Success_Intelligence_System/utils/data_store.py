@@ -0,0 +1,375 @@
+"""
+Student Data Store - one shared, read-only copy of the student dataset per process
+"""
+
+import hashlib
+import io
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (ships with streamlit)
+    _STRING_DTYPE = 'string[pyarrow]'
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _STRING_DTYPE = 'string'
+    _CSV_ENGINE = 'c'
+
+# ``StudentDataset.frame`` hands out shallow copies; with Copy-on-Write (always
+# on from pandas 3) a write to one of them copies first and never reaches the
+# shared data.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DATASET_PATH = DATA_DIR / "student_performance_dataset.csv"
+
+# Explicit dtypes so the parser never has to infer; columns missing from the
+# file are simply ignored by read_csv.
+_TEXT_COLUMNS = ['student_id', 'name', 'major', 'year', 'gender', 'program', 'student_performance']
+_FLOAT_COLUMNS = [
+    'gpa', 'prior_gpa', 'credits', 'avg_session_duration', 'time_spent_on_materials',
+    'quiz_scores_avg', 'assignment_scores_avg', 'final_exam_score',
+    'text_feature_1', 'text_feature_2', 'text_feature_3', 'text_feature_4', 'text_feature_5',
+]
+_INT_COLUMNS = [
+    'age', 'total_logins', 'num_forum_posts', 'num_forum_replies',
+    'late_submissions', 'quiz_attempts',
+]
+
+DTYPES: Dict[str, str] = {
+    **{c: _STRING_DTYPE for c in _TEXT_COLUMNS},
+    **{c: 'float64' for c in _FLOAT_COLUMNS},
+    **{c: 'int64' for c in _INT_COLUMNS},
+}
+
+
+def _mock_frame() -> pd.DataFrame:
+    """Small demo cohort used when the CSV is missing or empty"""
+    frame = pd.DataFrame({
+        'student_id': ['S001', 'S002', 'S003', 'S004', 'S005', 'S006', 'S007', 'S008'],
+        'name': ['John Smith', 'Emily Davis', 'Michael Chen', 'Sarah Johnson', 'David Martinez', 'Jessica Williams', 'Alex Brown', 'Lisa Anderson'],
+        'major': ['Engineering', 'Business', 'Computer Science', 'Arts', 'Engineering', 'Business', 'Computer Science', 'Arts'],
+        'program': ['BSc', 'MSc', 'BSc', 'Diploma', 'BSc', 'MSc', 'BSc', 'Diploma'],
+        'gpa': [2.1, 2.4, 2.8, 3.0, 3.2, 3.5, 2.9, 3.1],
+        'prior_gpa': [2.1, 2.4, 2.8, 3.0, 3.2, 3.5, 2.9, 3.1],
+        'year': ['Junior', 'Sophomore', 'Senior', 'Junior', 'Senior', 'Junior', 'Sophomore', 'Senior'],
+        'graduation_year': [2025, 2026, 2024, 2025, 2024, 2025, 2026, 2024],
+        'credits': [78, 65, 110, 95, 120, 88, 72, 105],
+        'student_performance': ['Pass', 'Fail', 'Pass', 'Pass', 'Pass', 'Pass', 'Fail', 'Pass'],
+    })
+    return frame.astype({c: t for c, t in DTYPES.items() if c in frame.columns})
+
+
+@dataclass(frozen=True)
+class RowChanges:
+    """How a dataset differs from the version it replaced, keyed by student_id.
+
+    ``kept_new``/``kept_old`` are aligned row positions of unchanged students
+    in the new and old frames; ``changed`` holds new-frame positions of
+    inserted or updated students; ``deleted`` the ids that disappeared.
+    """
+    kept_new: np.ndarray
+    kept_old: np.ndarray
+    changed: np.ndarray
+    deleted: frozenset
+
+    def __len__(self) -> int:
+        return len(self.changed) + len(self.deleted)
+
+    def patch(self, old: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+        """Row-aligned frame for the new version from per-row results.
+
+        ``old`` is aligned with the previous frame, ``fresh`` with ``changed``;
+        unchanged rows are copied from ``old``, nothing is recomputed.
+        """
+        parts = [f for f in (old.iloc[self.kept_old], fresh) if len(f)]
+        if not parts:
+            return old.iloc[:0].reset_index(drop=True)
+        combined = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        order = np.argsort(np.concatenate([self.kept_new, self.changed]), kind='stable')
+        return combined.iloc[order].reset_index(drop=True)
+
+
+class StudentDataset:
+    """Immutable snapshot of the student dataset for one data version.
+
+    The parsed frame is shared by every page and session in the process.
+    ``frame`` returns a Copy-on-Write view of it, so a page that adds or
+    overwrites columns changes only its own view, never the shared data.
+    Structures derived from the frame (indexes, aggregates, scores) can be
+    memoized on the dataset with ``derived`` so they are built once per version.
+    ``previous`` is the version this one replaced (kept for one generation),
+    so builders can patch its results with ``changes()`` instead of starting over.
+    """
+
+    def __init__(self, frame: pd.DataFrame, version: int, digest: str,
+                 source: Optional[Path], signature: Optional[Tuple[int, int]],
+                 previous: Optional['StudentDataset'] = None):
+        self._frame = frame
+        self.version = version
+        self.digest = digest
+        self.source = source
+        self.signature = signature
+        self.previous = previous
+        self._derived: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """The dataset as a DataFrame; writes to it stay local to the caller."""
+        return self._frame.copy(deep=False)
+
+    def derived(self, key: str, builder: Callable[['StudentDataset'], Any]) -> Any:
+        """Return ``builder(self)``, computed at most once for this data version."""
+        try:
+            return self._derived[key]
+        except KeyError:
+            pass
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._derived:
+                self._derived[key] = builder(self)
+            return self._derived[key]
+
+    def peek(self, key: str) -> Any:
+        """The memoized ``key`` if it was already built, else None (never builds)."""
+        return self._derived.get(key)
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    # ------------------------------------------------------------------
+    # Student lookups (built once per version)
+    # ------------------------------------------------------------------
+    def _build_positions(self) -> Dict[str, int]:
+        if 'student_id' not in self._frame.columns:
+            return {}
+        ids = self._frame['student_id'].astype(object).tolist()
+        # Walk backwards so a duplicated id maps to its first row, like a scan would
+        return dict(zip(reversed(ids), range(len(ids) - 1, -1, -1)))
+
+    def _build_selector(self) -> Tuple[List[str], Dict[str, str]]:
+        if 'student_id' not in self._frame.columns:
+            return [], {}
+        ids = self._frame['student_id'].astype(object)
+        if 'name' in self._frame.columns:
+            names = self._frame['name'].astype(object).where(self._frame['name'].notna(), None)
+            labels = [f"{i} - {n}" if n else str(i) for i, n in zip(ids, names)]
+        else:
+            labels = [str(i) for i in ids]
+        mapping = dict(zip(labels, ids))
+        return sorted(mapping), mapping
+
+    def position(self, student_id: str) -> Optional[int]:
+        """Row position of ``student_id`` in ``frame`` (None if unknown)."""
+        return self.derived('student_positions', StudentDataset._build_positions).get(student_id)
+
+    def student(self, student_id: str) -> Optional[pd.Series]:
+        """One student's row, found through the id index instead of a column scan."""
+        pos = self.position(student_id)
+        return None if pos is None else self._frame.iloc[pos]
+
+    def selector_options(self) -> Tuple[List[str], Dict[str, str]]:
+        """Sorted ``"<id> - <name>"`` labels for student pickers and the label -> id map."""
+        return self.derived('student_selector', StudentDataset._build_selector)
+
+    # ------------------------------------------------------------------
+    # Change detection against the previous version
+    # ------------------------------------------------------------------
+    def _build_row_hashes(self) -> Optional[pd.Series]:
+        if 'student_id' not in self._frame.columns or self._frame['student_id'].duplicated().any():
+            return None  # rows cannot be matched by id
+        hashes = pd.util.hash_pandas_object(self._frame, index=False, categorize=False).to_numpy()
+        return pd.Series(hashes, index=pd.Index(self._frame['student_id'].astype(object)))
+
+    def row_hashes(self) -> Optional[pd.Series]:
+        """Content hash of every row, indexed by student_id (None if ids are not unique)."""
+        return self.derived('row_hashes', StudentDataset._build_row_hashes)
+
+    def _build_changes(self) -> Optional[RowChanges]:
+        prev = self.previous
+        if prev is None or list(prev._frame.columns) != list(self._frame.columns) \
+                or list(prev._frame.dtypes) != list(self._frame.dtypes):
+            return None
+        new_hashes, old_hashes = self.row_hashes(), prev.row_hashes()
+        if new_hashes is None or old_hashes is None:
+            return None
+        old_pos = old_hashes.index.get_indexer(new_hashes.index)
+        found = old_pos >= 0
+        same = np.zeros(len(new_hashes), dtype=bool)
+        same[found] = old_hashes.to_numpy()[old_pos[found]] == new_hashes.to_numpy()[found]
+        kept_new = np.flatnonzero(same)
+        present = np.zeros(len(old_hashes), dtype=bool)
+        present[old_pos[found]] = True
+        return RowChanges(
+            kept_new=kept_new,
+            kept_old=old_pos[kept_new],
+            changed=np.flatnonzero(~same),
+            deleted=frozenset(old_hashes.index[~present]),
+        )
+
+    def changes(self) -> Optional[RowChanges]:
+        """Inserted, updated and deleted students relative to ``previous``.
+
+        None when there is no previous version or rows cannot be matched
+        (different columns, duplicated ids); callers then rebuild in full.
+        """
+        return self.derived('row_changes', StudentDataset._build_changes)
+
+
+_lock = threading.Lock()
+_datasets: Dict[Path, StudentDataset] = {}
+_watched: Set[Path] = set()
+_versions = itertools.count(1)
+
+# Version pinned for the current script run (see ``pinned_dataset``)
+_pinned: ContextVar[Optional[StudentDataset]] = ContextVar('pinned_dataset', default=None)
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _next_version() -> int:
+    return next(_versions)
+
+
+def read_dataset_file(path: Path) -> Tuple[pd.DataFrame, str]:
+    """Parse and validate the CSV once with explicit dtypes; returns (frame, sha1 digest)."""
+    raw = path.read_bytes()
+    digest = hashlib.sha1(raw).hexdigest()
+    df = pd.read_csv(io.BytesIO(raw), dtype=DTYPES, engine=_CSV_ENGINE)
+    if len(df) == 0:
+        raise ValueError("CSV is empty")
+    if 'student_id' not in df.columns:
+        raise ValueError("CSV has no student_id column")
+    return df, digest
+
+
+def load_version(path: Path, current: Optional[StudentDataset] = None,
+                 signature: Optional[Tuple[int, int]] = None) -> StudentDataset:
+    """Read ``path`` into the version that follows ``current``, without publishing it.
+
+    Returns ``current`` itself (with its signature refreshed) when the
+    content did not change; raises if the file cannot be read or validated.
+    """
+    path = Path(path)
+    signature = signature or _stat_signature(path)
+    frame, digest = read_dataset_file(path)
+    if current is not None and current.digest == digest:
+        current.signature = signature
+        return current
+    return StudentDataset(frame, _next_version(), digest, path, signature, previous=current)
+
+
+def _swap(dataset: StudentDataset) -> None:
+    current = _datasets.get(dataset.source)
+    if current is not None and current is not dataset:
+        current.previous = None  # keep one generation, not the whole chain
+    _datasets[dataset.source] = dataset
+
+
+def publish(dataset: StudentDataset) -> None:
+    """Make ``dataset`` the shared version for its source file (an atomic reference swap).
+
+    Script runs that already hold the old version keep using it; the next
+    ``get_dataset`` call returns the new one.
+    """
+    with _lock:
+        _swap(dataset)
+
+
+def current_dataset(path: Optional[Path] = None) -> Optional[StudentDataset]:
+    """The published version for ``path`` without checking the file (None if never loaded)."""
+    return _datasets.get(Path(path or DATASET_PATH))
+
+
+def watch(path: Optional[Path] = None, enabled: bool = True) -> None:
+    """Mark ``path`` as reloaded by a background watcher (see utils.data_watcher).
+
+    ``get_dataset`` then stops checking the file on the render path and
+    simply returns the published version.
+    """
+    path = Path(path or DATASET_PATH)
+    if enabled:
+        _watched.add(path)
+    else:
+        _watched.discard(path)
+
+
+def get_dataset(path: Optional[Path] = None) -> StudentDataset:
+    """Return the shared dataset, reloading only when the file changed on disk.
+
+    Inside ``pinned_dataset`` the pinned version is returned, so one script
+    run sees one version throughout. For a watched file the published
+    version is returned as is. Otherwise a cheap ``stat`` (mtime + size) is
+    checked on every call; when it differs the file is re-read and its
+    content hash compared, so touching the file without changing it keeps
+    the existing version and its derived caches.
+    """
+    pinned = _pinned.get()
+    if pinned is not None and (path is None or Path(path) == pinned.source):
+        return pinned
+
+    path = Path(path or DATASET_PATH)
+    current = _datasets.get(path)
+    if current is not None and path in _watched:
+        return current
+
+    signature = _stat_signature(path)
+    if current is not None and current.signature == signature:
+        return current
+
+    with _lock:
+        current = _datasets.get(path)
+        if current is not None and current.signature == signature:
+            return current
+        try:
+            dataset = load_version(path, current, signature)
+        except Exception:
+            if current is not None:
+                current.signature = signature  # keep serving the last good version
+                return current
+            dataset = StudentDataset(_mock_frame(), _next_version(), 'mock', path, signature)
+        _swap(dataset)
+        return dataset
+
+
+@contextmanager
+def pinned_dataset(path: Optional[Path] = None) -> Iterator[StudentDataset]:
+    """Pin the current version for the duration of the block (one script run).
+
+    Every ``get_dataset`` call inside the block returns the same version,
+    even if a reload publishes a newer one meanwhile.
+    """
+    token = _pinned.set(get_dataset(path))
+    try:
+        yield _pinned.get()
+    finally:
+        _pinned.reset(token)
+
+
+def load_data() -> pd.DataFrame:
+    """Load student data from CSV or return mock data (shared, read-only frame)"""
+    return get_dataset().frame
+
+
+def data_version() -> int:
+    """Version number of the current dataset; changes whenever the data does."""
+    return get_dataset().version
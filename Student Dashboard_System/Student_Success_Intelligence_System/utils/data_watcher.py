@@ -0,0 +1,159 @@
+"""
+Data Watcher - background hot-reload of the student dataset
+
+One daemon thread per process polls the dataset file. When it changes, the
+new version is read, validated and warmed (risk snapshot, aggregate
+cube, search index, what-if model) off the render thread, and only then swapped
+in as the shared dataset. Script runs that already started keep the old
+version; the next one sees the new version with its caches already built,
+so a refresh costs advisors neither downtime nor a cold-cache stampede.
+Downstream caches key on ``StudentDataset.version``.
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence
+
+from . import data_store
+from .aggregate_cube import aggregate_cube
+from .data_store import StudentDataset
+from .risk_snapshot import risk_snapshot
+from .search_index import search_index
+from .what_if import what_if_model
+
+
+POLL_INTERVAL = float(os.environ.get('DATA_WATCH_INTERVAL', '2.0'))  # seconds; 0 disables the watcher
+
+# Per-version structures built before a new version is published
+WARMERS: Sequence[Callable[[StudentDataset], object]] = (
+    risk_snapshot,
+    aggregate_cube,
+    search_index,
+    what_if_model,
+    StudentDataset.selector_options,
+)
+
+
+class DataWatcher:
+    """Polls one dataset file and publishes each new, warmed version."""
+
+    def __init__(self, path: Optional[Path] = None, interval: float = POLL_INTERVAL,
+                 warmers: Sequence[Callable[[StudentDataset], object]] = WARMERS):
+        self.path = Path(path or data_store.DATASET_PATH)
+        self.interval = interval
+        self.warmers = warmers
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stats = {'checks': 0, 'reloads': 0, 'failures': 0, 'warm_failures': 0}
+        self._last_error: Optional[str] = None
+        self._last_reload_seconds: Optional[float] = None
+        self._pending = None  # signature seen on the last poll, not loaded yet
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+
+    def start(self) -> 'DataWatcher':
+        data_store.watch(self.path)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        data_store.watch(self.path, enabled=False)
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def stats(self) -> Dict:
+        current = data_store.current_dataset(self.path)
+        with self._lock:
+            return {
+                **self._stats,
+                'version': current.version if current is not None else None,
+                'last_error': self._last_error,
+                'last_reload_seconds': self._last_reload_seconds,
+            }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] += 1
+
+    def _warm(self, dataset: StudentDataset) -> None:
+        for warm in self.warmers:
+            try:
+                warm(dataset)
+            except Exception:
+                # A page builds it on first use instead; the data itself is valid
+                self._count('warm_failures')
+
+    def check(self) -> bool:
+        """Poll once; returns True if a new version was published."""
+        self._count('checks')
+        current = data_store.current_dataset(self.path)
+        if current is None:
+            # First version: load it the same way a page would, then warm it
+            self._warm(data_store.get_dataset(self.path))
+            return False
+        signature = data_store._stat_signature(self.path)
+        if signature is None or current.signature == signature:
+            return False
+        if signature != self._pending:
+            # Still being written (or just finished): wait until the file
+            # looks the same on two consecutive polls
+            self._pending = signature
+            return False
+
+        started = time.perf_counter()
+        try:
+            dataset = data_store.load_version(self.path, current, signature)
+            if data_store._stat_signature(self.path) != signature:
+                raise ValueError("file changed while it was read")
+        except Exception as e:
+            # Invalid file: keep serving the current version and retry
+            # once the file changes again
+            current.signature = signature
+            self._count('failures')
+            with self._lock:
+                self._last_error = f"{type(e).__name__}: {e}"
+            return False
+        with self._lock:
+            self._last_error = None
+        if dataset is current:
+            return False  # touched, same content
+
+        self._warm(dataset)
+        data_store.publish(dataset)
+        self._count('reloads')
+        with self._lock:
+            self._last_reload_seconds = round(time.perf_counter() - started, 3)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                self._count('failures')
+                with self._lock:
+                    self._last_error = f"{type(e).__name__}: {e}"
+
+
+_watcher: Optional[DataWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def start_watcher(path: Optional[Path] = None) -> Optional[DataWatcher]:
+    """Start the process-wide watcher once (None when DATA_WATCH_INTERVAL is 0)."""
+    global _watcher
+    if POLL_INTERVAL <= 0:
+        return None
+    if _watcher is None:
+        with _watcher_lock:
+            if _watcher is None:
+                _watcher = DataWatcher(path).start()
+                atexit.register(_watcher.stop)
+    return _watcher
+
+
+def get_watcher() -> Optional[DataWatcher]:
+    return _watcher
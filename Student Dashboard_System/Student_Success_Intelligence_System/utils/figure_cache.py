@@ -0,0 +1,40 @@
+"""
+Figure Cache - finished Plotly figures shared across reruns and sessions
+
+Figures are keyed by (chart id, data version, filter tuple), so a rerun
+that does not change what a chart shows reuses the styled figure instead
+of rebuilding it with plotly.express. Bounded by FIGURE_CACHE_SIZE entries
+with least-recently-used eviction.
+
+Entries are ``plotly.graph_objects.Figure`` objects rather than JSON: given
+a dict, ``st.plotly_chart`` re-validates it into a Figure on every call,
+which costs about a third of building the figure from scratch. Callers
+must not mutate a cached figure.
+"""
+
+import os
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .lru import LRUCache
+
+
+FIGURE_CACHE_SIZE = int(os.environ.get('FIGURE_CACHE_SIZE', '128'))
+
+_cache = LRUCache(FIGURE_CACHE_SIZE)
+
+
+def cached_figure(chart_id: str, data_version: int, filters: Tuple[Hashable, ...],
+                  build: Callable[[], Any]) -> Any:
+    """The figure for this chart/version/filter state, calling ``build()`` only on a miss.
+
+    ``build`` may return None (nothing to plot); that answer is cached too.
+    """
+    return _cache.get_or_compute((chart_id, data_version, tuple(filters)), build)
+
+
+def figure_cache_stats() -> Dict[str, int]:
+    return _cache.stats()
+
+
+def clear_figure_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,170 @@
+"""
+Notification Store - in-app notifications shared by every session (alerts.db)
+
+Rule-engine notifications have a stable id derived from (student, subject,
+message), so re-generating the same notification is a no-op and an
+acknowledgement sticks across sessions and restarts. Notes an advisor
+sends by hand get a fresh id each time, so repeating one always delivers it.
+"""
+
+import hashlib
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict
+
+from .alert_store import _connection, init_db as _init_alert_db
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notifications (
+    id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    message TEXT,
+    advisor TEXT,
+    created_at TEXT NOT NULL,
+    acknowledged_at TEXT,
+    acknowledged_by TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_notifications_student_open ON notifications (student_id, acknowledged_at, created_at);
+CREATE INDEX IF NOT EXISTS ix_notifications_open ON notifications (acknowledged_at, student_id, created_at);
+"""
+
+# (student_id, created_at, id) of the last notification on a page
+Cursor = Tuple[str, str, str]
+
+
+class Notification(TypedDict):
+    id: str
+    student_id: str
+    subject: str
+    message: Optional[str]
+    advisor: Optional[str]
+    created_at: str
+    acknowledged_at: Optional[str]
+    acknowledged_by: Optional[str]
+
+
+_initialized: set = set()
+
+
+def init_db(db_path: Optional[Path] = None) -> None:
+    key = str(db_path)
+    if key in _initialized:
+        return
+    _init_alert_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        conn.executescript(SCHEMA)
+    _initialized.add(key)
+
+
+def notification_id(student_id: str, subject: str, message: Optional[str]) -> str:
+    key = '\x1f'.join((str(student_id), subject or '', message or ''))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def add_notifications(notes: Iterable[Tuple[str, str, str, str]], db_path: Optional[Path] = None) -> int:
+    """Insert ``(student_id, subject, message, advisor)`` tuples in one transaction.
+
+    Notifications that already exist (same stable id) are left untouched;
+    returns the number actually added.
+    """
+    created_at = _now()
+    rows = [(notification_id(sid, subj, msg), sid, subj, msg, advisor, created_at)
+            for sid, subj, msg, advisor in notes]
+    if not rows:
+        return 0
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO notifications (id, student_id, subject, message, advisor, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        return conn.total_changes - before
+
+
+def alert_notes(students_with_alerts: Iterable[Dict], advisor: str = 'Advisor') -> Iterator[Tuple[str, str, str, str]]:
+    """``add_notifications`` tuples for rule-engine output, one per alert."""
+    return (
+        (s.get('student_id'), f"{a.get('type')} - {a.get('severity').upper()}", a.get('message', ''), advisor)
+        for s in students_with_alerts for a in s.get('alerts', [])
+    )
+
+
+def add_notification(student_id: str, subject: str, message: str, advisor: str = 'Advisor',
+                     db_path: Optional[Path] = None) -> Notification:
+    """Insert one manual notification under a new unique id (never deduplicated)."""
+    nid = uuid.uuid4().hex[:20]
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO notifications (id, student_id, subject, message, advisor, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (nid, student_id, subject, message, advisor, _now()),
+        )
+    return get_notification(nid, db_path)
+
+
+def get_notification(nid: str, db_path: Optional[Path] = None) -> Optional[Notification]:
+    init_db(db_path)
+    row = _connection(db_path).execute("SELECT * FROM notifications WHERE id = ?", (nid,)).fetchone()
+    return Notification(**dict(row)) if row else None
+
+
+def notifications_for_student(student_id: str, include_acknowledged: bool = False,
+                              db_path: Optional[Path] = None) -> List[Notification]:
+    init_db(db_path)
+    sql = "SELECT * FROM notifications WHERE student_id = ?"
+    if not include_acknowledged:
+        sql += " AND acknowledged_at IS NULL"
+    sql += " ORDER BY created_at, id"
+    return [Notification(**dict(r)) for r in _connection(db_path).execute(sql, (student_id,))]
+
+
+def open_notifications(after: Optional[Cursor] = None, limit: int = 25,
+                       db_path: Optional[Path] = None) -> Tuple[List[Notification], Optional[Cursor]]:
+    """Unacknowledged notifications grouped by student, one keyset page at a time."""
+    init_db(db_path)
+    sql = "SELECT * FROM notifications WHERE acknowledged_at IS NULL"
+    params: list = []
+    if after is not None:
+        sql += " AND (student_id, created_at, id) > (?, ?, ?)"
+        params += list(after)
+    sql += " ORDER BY student_id, created_at, id LIMIT ?"
+    rows = _connection(db_path).execute(sql, params + [limit + 1]).fetchall()
+    notes = [Notification(**dict(r)) for r in rows[:limit]]
+    cursor = None
+    if len(rows) > limit:
+        last = notes[-1]
+        cursor = (last['student_id'], last['created_at'], last['id'])
+    return notes, cursor
+
+
+def count_open(db_path: Optional[Path] = None) -> int:
+    init_db(db_path)
+    return _connection(db_path).execute(
+        "SELECT COUNT(*) FROM notifications WHERE acknowledged_at IS NULL").fetchone()[0]
+
+
+def acknowledge(nid: str, acknowledged_by: Optional[str] = None, db_path: Optional[Path] = None) -> bool:
+    """Mark a notification acknowledged; False if it does not exist or was already acknowledged."""
+    init_db(db_path)
+    conn = _connection(db_path)
+    with conn:
+        cur = conn.execute(
+            "UPDATE notifications SET acknowledged_at = ?, acknowledged_by = ? "
+            "WHERE id = ? AND acknowledged_at IS NULL",
+            (_now(), acknowledged_by, nid),
+        )
+    return cur.rowcount == 1
+
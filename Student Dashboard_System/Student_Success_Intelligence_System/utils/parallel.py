@@ -0,0 +1,202 @@
+"""
+Parallel - chunked execution backend for cohort-wide scoring
+
+``map_frame(func, frame, *args)`` splits a frame into contiguous row
+chunks, runs ``func(chunk, *args)`` on each and concatenates the results
+in chunk order. For a row-wise ``func`` the output is identical to
+``func(frame, *args)`` whichever backend ran it:
+
+- ``inline``: one call in the calling thread (the default)
+- ``threads``: a thread pool over zero-copy slices of the frame
+- ``processes``: a process pool. The frame is written once as an Arrow IPC
+  file (in /dev/shm where available); each worker memory-maps it and
+  reads only its own rows, and sends its result back the same way, so no
+  chunk is pickled. Without pyarrow, chunks are pickled instead.
+
+Configured with SCORING_BACKEND, SCORING_WORKERS (default: CPU count) and
+SCORING_MIN_ROWS (smaller frames always run inline). A pool that breaks
+(e.g. a worker killed by the OOM killer) is replaced and the map retried
+once; if the new pool breaks too, the map runs inline.
+"""
+
+import atexit
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+except ImportError:  # chunks are pickled to worker processes instead
+    pa = None
+
+
+BACKENDS = ('inline', 'threads', 'processes')
+BACKEND = os.environ.get('SCORING_BACKEND', 'inline').strip().lower()
+WORKERS = int(os.environ.get('SCORING_WORKERS', '0')) or os.cpu_count() or 1
+MIN_ROWS = int(os.environ.get('SCORING_MIN_ROWS', '100000'))
+
+# Arrow files live here while a map runs; RAM-backed on Linux
+_SPOOL_DIR = Path('/dev/shm') if Path('/dev/shm').is_dir() else Path(tempfile.gettempdir())
+
+FrameFunc = Callable[..., pd.DataFrame]
+
+
+def chunk_bounds(n: int, parts: int) -> List[Tuple[int, int]]:
+    """``parts`` contiguous, near-equal (start, stop) row ranges covering ``range(n)``."""
+    parts = max(1, min(parts, n))
+    edges = [n * i // parts for i in range(parts + 1)]
+    return [(edges[i], edges[i + 1]) for i in range(parts) if edges[i] < edges[i + 1]]
+
+
+# ----------------------------------------------------------------------
+# Arrow spool files (processes backend)
+# ----------------------------------------------------------------------
+def _write_arrow(frame: pd.DataFrame, path: Path) -> None:
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _read_arrow(path: Path, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+    """Rows ``start:stop`` of a spooled frame; only those rows are materialized."""
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        if start or stop is not None:
+            table = table.slice(start, (table.num_rows if stop is None else stop) - start)
+        return table.to_pandas()
+
+
+def _restore(frame: pd.DataFrame, dtypes: Dict[str, Any]) -> pd.DataFrame:
+    """Undo Arrow's dtype changes (e.g. object -> string) so results match an inline run."""
+    changed = {c: t for c, t in dtypes.items() if c in frame.columns and frame[c].dtype != t}
+    return frame.astype(changed) if changed else frame
+
+
+def _process_chunk(func: FrameFunc, source: Path, dtypes: Dict[str, Any], start: int, stop: int,
+                   args: Tuple) -> Tuple[str, Dict[str, Any]]:
+    """Worker side: map the input rows, run ``func``, spool the result next to the input."""
+    chunk = _restore(_read_arrow(source, start, stop), dtypes)
+    result = func(chunk, *args)
+    target = source.with_name(f"{source.stem}-{start}.arrow")
+    _write_arrow(result, target)
+    return str(target), dict(result.dtypes)
+
+
+def _pickled_chunk(func: FrameFunc, chunk: pd.DataFrame, args: Tuple) -> pd.DataFrame:
+    return func(chunk, *args)
+
+
+# ----------------------------------------------------------------------
+# Executors (one pool per kind and process, created on first use)
+# ----------------------------------------------------------------------
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(backend: str, workers: int) -> Executor:
+    key = f"{backend}:{workers}"
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if backend == 'threads':
+                pool = ThreadPoolExecutor(workers, thread_name_prefix="scoring")
+            else:
+                # spawn: never fork a process that runs server and writer threads
+                pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+            _pools[key] = pool
+        return pool
+
+
+def _discard(backend: str, workers: int, pool: Executor) -> None:
+    """Drop a broken ``pool`` so the next ``_pool`` call starts a fresh one."""
+    with _pools_lock:
+        if _pools.get(f"{backend}:{workers}") is pool:  # not already replaced by another thread
+            del _pools[f"{backend}:{workers}"]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown() -> None:
+    """Stop every pool started by this process."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def resolve(rows: int, backend: Optional[str] = None, workers: Optional[int] = None) -> Tuple[str, int]:
+    """The (backend, workers) a map over ``rows`` rows would use."""
+    backend = (backend or BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown scoring backend {backend!r}; expected one of {BACKENDS}")
+    workers = max(1, workers or WORKERS)
+    if backend == 'inline' or workers == 1 or rows < MIN_ROWS:
+        return 'inline', 1
+    return backend, workers
+
+
+def _map_chunks(pool: Executor, backend: str, func: FrameFunc, frame: pd.DataFrame,
+                bounds: List[Tuple[int, int]], args: Tuple) -> List[pd.DataFrame]:
+    """Results of ``func`` per chunk on ``pool``, in chunk order."""
+    if backend == 'threads':
+        return list(pool.map(lambda b: func(frame.iloc[b[0]:b[1]], *args), bounds))
+    if pa is None:
+        return list(pool.map(_pickled_chunk, [func] * len(bounds),
+                             [frame.iloc[a:b] for a, b in bounds], [args] * len(bounds)))
+    spool = Path(tempfile.mkdtemp(prefix="scoring-", dir=_SPOOL_DIR))
+    try:
+        source = spool / f"{uuid.uuid4().hex}.arrow"
+        _write_arrow(frame, source)
+        dtypes = dict(frame.dtypes)
+        futures = [pool.submit(_process_chunk, func, source, dtypes, a, b, args) for a, b in bounds]
+        parts = []
+        for future in futures:  # submission order: deterministic merge
+            path, result_dtypes = future.result()
+            parts.append(_restore(_read_arrow(Path(path)), result_dtypes))
+        return parts
+    finally:
+        shutil.rmtree(spool, ignore_errors=True)
+
+
+# ----------------------------------------------------------------------
+# Public API
+# ----------------------------------------------------------------------
+def map_frame(func: FrameFunc, frame: pd.DataFrame, *args: Any,
+              backend: Optional[str] = None, workers: Optional[int] = None) -> pd.DataFrame:
+    """``func(frame, *args)`` computed chunk by chunk on the configured backend.
+
+    ``func`` must be row-wise (one output row per input row, each depending
+    only on its own input row) and, for the processes backend, importable
+    at module level; ``args`` must be picklable. The result is indexed
+    like ``frame`` on every backend.
+    """
+    backend, workers = resolve(len(frame), backend, workers)
+    if backend == 'inline':
+        result = func(frame, *args)
+        result.index = frame.index
+        return result
+    bounds = chunk_bounds(len(frame), workers)
+    parts = None
+    for _attempt in range(2):
+        pool = _pool(backend, workers)
+        try:
+            parts = _map_chunks(pool, backend, func, frame, bounds, args)
+            break
+        except BrokenExecutor:
+            _discard(backend, workers, pool)
+    if parts is None:  # the replacement pool broke as well
+        parts = [func(frame, *args)]
+
+    result = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+    result.index = frame.index
+    return result
@@ -0,0 +1,287 @@
+"""
+Risk Snapshot - per-student scores, labels, flags and alerts, once per data version
+
+Every page and every session reads the same snapshot, so twenty advisors
+cost one scoring pass instead of twenty. The snapshot is memoized on the
+shared StudentDataset; its frames and lists are read-only.
+
+When the CSV is reloaded, only students whose row was inserted, updated or
+deleted go back through the risk and alert pipeline; everyone else's
+results are patched over from the previous version's snapshot.
+
+If precompute_snapshot.py already scored this dataset content under the
+same rules, the stored snapshot is opened instead (see utils.snapshot_store).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import parallel
+from .alert_logic import AlertEntryList, AlertSystem
+from .data_store import RowChanges, StudentDataset, get_dataset
+from .rule_engine import RulePlan, rule_plan
+from .student_profiles import enriched_students
+
+
+MIN_HIGH_RISK = 3  # advisors always see at least this many High-risk students
+
+
+@dataclass(frozen=True)
+class RiskSnapshot:
+    version: int
+    students: pd.DataFrame            # enriched cohort, after auto-flagging
+    students_with_alerts: AlertEntryList  # rule-engine output, most critical first, built when read
+    total_alerts: int
+    auto_flagged: int                 # students promoted to High by MIN_HIGH_RISK
+    report: pd.DataFrame              # Student ID / Risk / Summary rows for reports
+    base_version: Optional[int] = None        # version this one was patched from (None: full build)
+    rescored: Optional[FrozenSet[str]] = None  # ids rescored or dropped when patched
+    rules_version: str = ''                   # digest of the alert rules the snapshot was scored with
+    published: bool = False                   # alerts already logged and notified by the batch job
+
+    @property
+    def alert_keys(self) -> np.ndarray:
+        """(critical, total, score cents) per students_with_alerts entry."""
+        return self.students_with_alerts.keys()
+
+    def top_alerts(self, k: int) -> List[Dict]:
+        """The ``k`` most urgent students; only their dicts are built."""
+        return self.students_with_alerts.top(k)
+
+
+class AlertSelection(AlertEntryList):
+    """Entries picked from other entry lists (e.g. kept and rescored students), in a new order.
+
+    ``sources[source[i]].take([rank[i]])`` is entry ``i``; ``keys`` and
+    ``ids`` are the selected entries' ranking keys and student ids.
+    """
+
+    def __init__(self, sources: List[AlertEntryList], source: np.ndarray, rank: np.ndarray,
+                 keys: np.ndarray, ids: np.ndarray):
+        used = np.unique(source)  # drop sources nothing points into any more
+        self._sources = [sources[i] for i in used.tolist()]
+        self._source = np.searchsorted(used, source)
+        self._rank = rank
+        self._keys = keys
+        self._ids = ids
+
+    @classmethod
+    def empty(cls) -> 'AlertSelection':
+        none = np.zeros(0, dtype=np.intp)
+        return cls([], none, none, np.zeros((0, 3), dtype=np.int64), np.zeros(0, dtype=object))
+
+    @classmethod
+    def select(cls, parts: List[AlertEntryList], masks: List[np.ndarray]) -> 'AlertSelection':
+        """The entries of each part where its mask is set, in part order."""
+        sources, source, rank = [], [], []
+        for part, mask in zip(parts, masks):
+            picked = np.flatnonzero(mask)
+            if isinstance(part, AlertSelection):  # point into its sources, not at it
+                offset = len(sources)
+                sources.extend(part._sources)
+                source.append(part._source[picked] + offset)
+                rank.append(part._rank[picked])
+            else:
+                source.append(np.full(len(picked), len(sources), dtype=np.intp))
+                sources.append(part)
+                rank.append(picked)
+        keys = np.concatenate([part.keys()[mask] for part, mask in zip(parts, masks)])
+        ids = np.concatenate([part.student_ids()[mask] for part, mask in zip(parts, masks)])
+        return cls(sources, np.concatenate(source), np.concatenate(rank), keys, ids)
+
+    def reorder(self, order: np.ndarray) -> 'AlertSelection':
+        return AlertSelection(self._sources, self._source[order], self._rank[order],
+                              self._keys[order], self._ids[order])
+
+    def __len__(self) -> int:
+        return len(self._rank)
+
+    def take(self, ranks: np.ndarray) -> List[Dict]:
+        entries: List[Optional[Dict]] = [None] * len(ranks)
+        source, rank = self._source[ranks], self._rank[ranks]
+        for i in np.unique(source).tolist():
+            where = np.flatnonzero(source == i)
+            for j, entry in zip(where.tolist(), self._sources[i].take(rank[where])):
+                entries[j] = entry
+        return entries
+
+    def keys(self) -> np.ndarray:
+        return self._keys
+
+    def student_ids(self) -> np.ndarray:
+        return self._ids
+
+
+def alert_input_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Columns the rule engine expects, taken from an enriched cohort."""
+    return pd.DataFrame({
+        'student_id': df['student_id'],
+        'name': df['name'] if 'name' in df.columns else df['student_id'],
+        'advisor': 'Advisor',
+        'gpa': df.get('gpa', pd.Series([None]*len(df))),
+        'credits': df.get('credits', pd.Series([0]*len(df))),
+        'warnings': df.get('warnings_count', pd.Series([0]*len(df))),
+        'unpaid_fees': df.get('unpaid_fees', pd.Series([0]*len(df))),
+        'financial_aid_status': df.get('financial_aid_status', pd.Series(['On time']*len(df))),
+        'attendance': df.get('attendance_pct', pd.Series([90]*len(df))),
+        'counseling_visits': df.get('counseling_visits', pd.Series([0]*len(df))),
+        'engagement_score': df.get('engagement_score', pd.Series([60]*len(df))),
+    })
+
+
+def _auto_flag(df: pd.DataFrame) -> int:
+    """Promote the highest scores to High until MIN_HIGH_RISK students are High (edits ``df``)."""
+    try:
+        high_count = int((df['risk_label'] == 'High').sum()) if 'risk_label' in df.columns else 0
+        if high_count >= MIN_HIGH_RISK:
+            return 0
+        needed = MIN_HIGH_RISK - high_count
+        candidates = df.sort_values('risk_score', ascending=False)
+        candidates = candidates[candidates['risk_label'] != 'High']
+        for sid in candidates.head(needed)['student_id'].tolist():
+            df.loc[df['student_id'] == sid, 'risk_label'] = 'High'
+            # boost visible risk_score so they appear at top
+            df.loc[df['student_id'] == sid, 'risk_score'] = max(df['risk_score'].max(), 75)
+        return needed
+    except Exception:
+        # be defensive: ignore if df missing columns
+        return 0
+
+
+def build_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Brief risk summary per student: label plus up to three main risk reasons."""
+    n = len(df)
+
+    def column(name, default):
+        if name not in df.columns:
+            return np.full(n, default, dtype=float)
+        values = pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+        # Missing or zero counts as the default, like ``value or default``
+        return np.where(np.isnan(values) | (values == 0), default, values)
+
+    gpa = pd.to_numeric(df['gpa'], errors='coerce').to_numpy(dtype=float) if 'gpa' in df.columns else np.full(n, np.nan)
+    reasons = [
+        ('Low GPA', gpa < 2.0),
+        ('At-risk GPA', (gpa >= 2.0) & (gpa < 2.5)),
+        ('Unpaid fees', column('unpaid_fees', 0) > 500),
+        ('Low attendance', column('attendance_pct', 100).astype(int) < 80),
+        ('Multiple warnings', column('warnings_count', 0).astype(int) >= 2),
+        ('Low engagement', (column('counseling_visits', 0).astype(int) < 1)
+                           | (column('engagement_score', 100).astype(int) < 50)),
+    ]
+    names = [name for name, _ in reasons]
+    hits = np.column_stack([mask for _, mask in reasons]) if n else np.zeros((0, len(reasons)), dtype=bool)
+    briefs = [', '.join([names[j] for j in np.flatnonzero(row)][:3]) or 'No major risks' for row in hits]
+
+    labels = df['risk_label'].astype(object).to_numpy() if 'risk_label' in df.columns else np.full(n, 'Low', dtype=object)
+    return pd.DataFrame({
+        'Student ID': df['student_id'].to_numpy() if 'student_id' in df.columns else np.full(n, '', dtype=object),
+        'Risk': labels,
+        'Summary': [f"{label} risk — {brief}" for label, brief in zip(labels, briefs)],
+    })
+
+
+def _rank_alerts(frame: pd.DataFrame, plan: RulePlan, persist: bool) -> AlertEntryList:
+    """Ranked rule-engine entries of ``frame``; with ``persist`` the writer thread logs them."""
+    ranked = AlertSystem.rank_students_with_alerts(frame, plan)
+    if persist and len(ranked):
+        try:
+            from . import alert_writer
+            alert_writer.enqueue_entries(ranked)
+        except Exception:
+            pass
+    return ranked
+
+
+def _patch_snapshot(dataset: StudentDataset, previous: RiskSnapshot, enriched: pd.DataFrame,
+                    changes: RowChanges, plan: RulePlan) -> RiskSnapshot:
+    """Rescore only ``changes.changed`` and carry everything else over from ``previous``."""
+    fresh = enriched.iloc[changes.changed].reset_index(drop=True)
+    report = changes.patch(previous.report, build_report(fresh))
+
+    ids = fresh['student_id'].astype(object).tolist()
+    stale = changes.deleted.union(ids)
+    previous_alerts = previous.students_with_alerts
+    keep = ~pd.Index(previous_alerts.student_ids()).isin(list(stale))
+    try:
+        rescored = _rank_alerts(alert_input_frame(fresh), plan, persist=True)
+    except Exception:
+        rescored = AlertSelection.empty()
+
+    # Re-rank the way get_students_with_alerts does, from stored keys: most
+    # critical, most alerts, highest score, then row order in the new frame.
+    # Kept entries still point into the previous lists; nothing is built here
+    merged = AlertSelection.select([previous_alerts, rescored], [keep, np.ones(len(rescored), dtype=bool)])
+    keys = merged.keys()
+    positions = dataset.row_hashes().index.get_indexer(merged.student_ids())
+    order = np.lexsort((positions, -keys[:, 2], -keys[:, 1], -keys[:, 0]))
+
+    students = enriched.copy()
+    auto_flagged = _auto_flag(students)
+
+    return RiskSnapshot(
+        version=dataset.version,
+        students=students,
+        students_with_alerts=merged.reorder(order),
+        total_alerts=previous.total_alerts - int(previous.alert_keys[~keep, 1].sum()) + rescored.total_alerts,
+        auto_flagged=auto_flagged,
+        report=report,
+        base_version=previous.version,
+        rescored=stale,
+        rules_version=plan.digest,
+    )
+
+
+def build_snapshot(dataset: StudentDataset, plan: Optional[RulePlan] = None, persist: bool = True) -> RiskSnapshot:
+    """Score ``dataset`` (or patch the previous version's snapshot).
+
+    With ``persist=False`` the alerts are not handed to the alert writer;
+    the batch job writes them itself. Alert dicts are built lazily: the
+    writer thread reads them all, a page only the ones it shows.
+    """
+    plan = plan or rule_plan()
+    enriched = enriched_students(dataset, plan)
+    base = dataset.previous  # read once: a newer reload may drop the link meanwhile
+    previous = base.peek(f'risk_snapshot:{plan.digest}') if base is not None else None
+    changes = dataset.changes() if previous is not None else None
+    if changes is not None:
+        return _patch_snapshot(dataset, previous, enriched, changes, plan)
+
+    report = parallel.map_frame(build_report, enriched).reset_index(drop=True)
+
+    students = enriched.copy()
+    try:
+        students_with_alerts = _rank_alerts(alert_input_frame(students), plan, persist)
+    except Exception:
+        students_with_alerts = AlertSelection.empty()
+    auto_flagged = _auto_flag(students)
+
+    return RiskSnapshot(
+        version=dataset.version,
+        students=students,
+        students_with_alerts=students_with_alerts,
+        total_alerts=students_with_alerts.total_alerts,
+        auto_flagged=auto_flagged,
+        report=report,
+        rules_version=plan.digest,
+    )
+
+
+def risk_snapshot(dataset: Optional[StudentDataset] = None) -> RiskSnapshot:
+    """The shared snapshot for ``dataset`` (default: current dataset), built once per version.
+
+    Snapshots are keyed by data version and alert-rule digest, so an edit
+    to config/alert_rules.json rescores on the next call. A snapshot stored
+    by the batch job for the same content and rules is opened as is;
+    otherwise, if the version it replaced already has a snapshot for the
+    same rules, only changed students are rescored.
+    """
+    from .snapshot_store import load_snapshot
+
+    plan = rule_plan()
+    dataset = dataset if dataset is not None else get_dataset()
+    return dataset.derived(f'risk_snapshot:{plan.digest}',
+                           lambda ds: load_snapshot(ds, plan) or build_snapshot(ds, plan))
@@ -0,0 +1,375 @@
+"""
+Rule Engine - alert rules and indicator flags compiled from config/alert_rules.json
+
+Rules are data: a field, a comparator, a threshold (or ``any``/``all`` of
+such conditions), a severity and a message template. ``compile_rules``
+turns the file into a ``RulePlan`` that evaluates every rule over a whole
+cohort with NumPy comparisons; each distinct condition is computed once
+per pass, so adding a rule never adds a loop over students.
+
+``rule_plan()`` caches the compiled plan and recompiles it when the file
+changes on disk, so thresholds can be tuned during the term without a
+restart. A file that fails to compile leaves the previous plan in place.
+"""
+
+import hashlib
+import json
+import operator
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from string import Formatter
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+
+RULES_PATH = Path(os.environ.get(
+    'ALERT_RULES_PATH', Path(__file__).resolve().parent.parent / "config" / "alert_rules.json"))
+
+# Severity codes in increasing order of urgency (index into SEVERITY_NAMES)
+SEVERITY_NAMES = ('none', 'warning', 'critical')
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Value kind of every input the rules are evaluated over (the alert inputs of
+# AlertSystem.rule_inputs and the profile columns of enrich_students).
+# Thresholds are checked against it when the file is compiled; a field not
+# listed never matches, since no input supplies it.
+FIELD_KINDS: Dict[str, str] = {
+    **dict.fromkeys(('gpa', 'credits', 'unpaid_fees', 'attendance', 'attendance_pct',
+                     'engagement_score', 'study_hours', 'gpa_drop', 'risk_score'), 'number'),
+    **dict.fromkeys(('warnings', 'warnings_count', 'counseling_visits'), 'int'),
+    **dict.fromkeys(('aid_delayed', 'is_freshman'), 'bool'),
+    **dict.fromkeys(('financial_aid_status', 'housing', 'risk_label'), 'text'),
+}
+_TEXT_OPERATORS = ('==', '!=')
+
+# (field, op, threshold) - the unit a rule condition is built from
+Atom = Tuple[str, str, Any]
+# ('atom', index) | ('any', [nodes]) | ('all', [nodes])
+Node = Tuple[str, Any]
+# (field, op, threshold) -> mask, or None to fall back to a plain comparison
+Comparator = Callable[[str, str, Any], Optional[np.ndarray]]
+
+
+class RuleConfigError(ValueError):
+    """The rule file is not valid JSON or does not describe a valid rule set."""
+
+
+@dataclass(frozen=True)
+class AlertRule:
+    alert_type: str
+    severity: int          # index into SEVERITY_NAMES
+    condition: Node
+    message: str           # str.format template over the rule inputs
+    fields: Tuple[str, ...]  # names the template refers to
+
+
+@dataclass(frozen=True)
+class FlagRule:
+    name: str
+    condition: Node
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+def _check_threshold(field: str, op: str, threshold: Any, where: str) -> None:
+    """Reject a threshold that cannot be compared with the field's values."""
+    kind = FIELD_KINDS.get(field)
+    kind = 'number' if kind == 'int' else kind
+    is_bool = isinstance(threshold, bool)
+    is_number = isinstance(threshold, (int, float)) and not is_bool
+    if kind == 'number' and not is_number:
+        raise RuleConfigError(f"{where}: threshold of {field!r} must be a number, not {threshold!r}")
+    if kind == 'bool' and not is_bool:
+        raise RuleConfigError(f"{where}: threshold of {field!r} must be true or false, not {threshold!r}")
+    if kind == 'text':
+        if not isinstance(threshold, str):
+            raise RuleConfigError(f"{where}: threshold of {field!r} must be a string, not {threshold!r}")
+        if op not in _TEXT_OPERATORS:
+            raise RuleConfigError(f"{where}: {field!r} can only be compared with {' or '.join(_TEXT_OPERATORS)}")
+    if kind is None and not (is_bool or is_number or isinstance(threshold, str)):
+        raise RuleConfigError(f"{where}: threshold must be a number, string or boolean, not {threshold!r}")
+
+
+def _compile_condition(spec: Any, atoms: List[Atom], where: str) -> Node:
+    if not isinstance(spec, Mapping):
+        raise RuleConfigError(f"{where}: a condition must be an object, not {spec!r}")
+    if 'any' in spec or 'all' in spec:
+        kind = 'any' if 'any' in spec else 'all'
+        parts = spec[kind]
+        if not isinstance(parts, list) or not parts:
+            raise RuleConfigError(f"{where}: '{kind}' must be a non-empty list")
+        return kind, [_compile_condition(p, atoms, f"{where}.{kind}[{j}]") for j, p in enumerate(parts)]
+    try:
+        atom = (str(spec['field']), str(spec['op']), spec['threshold'])
+    except KeyError as e:
+        raise RuleConfigError(f"{where}: missing {e.args[0]!r}") from None
+    if atom[1] not in OPERATORS:
+        raise RuleConfigError(f"{where}: unknown comparator {atom[1]!r}")
+    _check_threshold(*atom, where)
+    if atom not in atoms:
+        atoms.append(atom)
+    return 'atom', atoms.index(atom)
+
+
+# Stand-in values per field kind, used to test-format message templates
+# (``_present`` hands a template ints, floats, and 0 for a float zero)
+_SAMPLES = {'number': (0, 0.5), 'int': (0,), 'bool': (False,), 'text': ('',)}
+
+
+def _template_fields(message: str, where: str) -> Tuple[str, ...]:
+    """Input names a message template refers to; it must format with any value of those inputs."""
+    try:
+        fields = tuple(dict.fromkeys(f for _, f, _, _ in Formatter().parse(message) if f))
+        for field in fields:
+            if not field.isidentifier():
+                raise ValueError(f"{{{field}}} must name an input")
+        samples = {f: _SAMPLES.get(FIELD_KINDS.get(f), (None,)) for f in fields}
+        for k in range(max((len(v) for v in samples.values()), default=1)):
+            message.format_map({f: v[k % len(v)] for f, v in samples.items()})
+    except (ValueError, KeyError, IndexError, AttributeError, TypeError) as e:
+        raise RuleConfigError(f"{where}: bad message template: {e}") from None
+    return fields
+
+
+def _entries(config: Mapping, section: str) -> List[Mapping]:
+    entries = config.get(section, [])
+    if not isinstance(entries, list):
+        raise RuleConfigError(f"'{section}' must be a list")
+    for i, spec in enumerate(entries):
+        if not isinstance(spec, Mapping):
+            raise RuleConfigError(f"{section}[{i}]: must be an object, not {spec!r}")
+    return entries
+
+
+def compile_rules(config: Any, digest: str = '') -> 'RulePlan':
+    """Compile a parsed rule file; raises RuleConfigError if it is malformed."""
+    if not isinstance(config, Mapping):
+        raise RuleConfigError("the rule file must hold an object with 'alerts' and 'flags' lists")
+    atoms: List[Atom] = []
+    alerts: List[AlertRule] = []
+    for i, spec in enumerate(_entries(config, 'alerts')):
+        where = f"alerts[{i}]"
+        severity = spec.get('severity')
+        if severity not in SEVERITY_NAMES[1:]:
+            raise RuleConfigError(f"{where}: severity must be one of {SEVERITY_NAMES[1:]}")
+        if 'type' not in spec:
+            raise RuleConfigError(f"{where}: missing 'type'")
+        message = str(spec.get('message', ''))
+        fields = _template_fields(message, where)
+        alerts.append(AlertRule(str(spec['type']), SEVERITY_NAMES.index(severity),
+                                _compile_condition(spec, atoms, where), message, fields))
+    flags: List[FlagRule] = []
+    for i, spec in enumerate(_entries(config, 'flags')):
+        where = f"flags[{i}]"
+        if 'name' not in spec:
+            raise RuleConfigError(f"{where}: missing 'name'")
+        flags.append(FlagRule(str(spec['name']), _compile_condition(spec, atoms, where)))
+    return RulePlan(str(config.get('version', '')), digest, atoms, alerts, flags)
+
+
+# ----------------------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------------------
+def _present(value: Any) -> Any:
+    """Message value: ints stay ints, floats print as floats (zero as ``0``)."""
+    if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(value) or 0
+    return value
+
+
+class RulePlan:
+    """A compiled rule set; evaluates all alert rules and flags in one pass.
+
+    Alert rules are grouped by type in file order. Per student and type the
+    most severe matching rule wins; among rules of that severity the first
+    one in the file supplies the message.
+    """
+
+    def __init__(self, version: str, digest: str, atoms: List[Atom],
+                 alerts: List[AlertRule], flags: List[FlagRule]):
+        self.version = version
+        self.digest = digest
+        self.atoms = atoms
+        self.alert_rules = alerts
+        self.flag_rules = flags
+        self.alert_types: Tuple[str, ...] = tuple(dict.fromkeys(r.alert_type for r in alerts))
+        # Per type: rules ordered most severe first, file order within a severity
+        self.rules_by_type: Dict[str, List[AlertRule]] = {
+            t: sorted((r for r in alerts if r.alert_type == t), key=lambda r: -r.severity)
+            for t in self.alert_types
+        }
+
+    @property
+    def flag_names(self) -> Tuple[str, ...]:
+        return tuple(f.name for f in self.flag_rules)
+
+    def with_thresholds(self, thresholds: Mapping[int, Any]) -> 'RulePlan':
+        """Copy of the plan with the thresholds of some atoms replaced (atom index -> threshold).
+
+        The copy is not tied to a rule file (empty digest); it is meant for
+        simulations, not for keying caches.
+        """
+        atoms = list(self.atoms)
+        for i, threshold in thresholds.items():
+            field, op, _ = atoms[i]
+            atoms[i] = (field, op, threshold)
+        return RulePlan(self.version, '', atoms, self.alert_rules, self.flag_rules)
+
+    def _atom_masks(self, nodes: List[Node], columns: Mapping[str, Any], n: int,
+                    compare: Optional[Comparator] = None) -> Dict[int, np.ndarray]:
+        """One comparison per distinct condition used by ``nodes``."""
+        needed: List[int] = []
+
+        def collect(node: Node) -> None:
+            kind, arg = node
+            if kind == 'atom':
+                needed.append(arg)
+            else:
+                for part in arg:
+                    collect(part)
+
+        for node in nodes:
+            collect(node)
+        masks = {}
+        for i in dict.fromkeys(needed):
+            field, op, threshold = self.atoms[i]
+            mask = compare(field, op, threshold) if compare is not None else None
+            if mask is not None:
+                masks[i] = mask
+                continue
+            values = columns.get(field)
+            if values is None:
+                masks[i] = np.zeros(n, dtype=bool)  # missing input never matches
+                continue
+            with np.errstate(invalid='ignore'):
+                mask = OPERATORS[op](np.asarray(values), threshold)
+            masks[i] = np.broadcast_to(np.asarray(mask, dtype=bool), (n,))
+        return masks
+
+    @staticmethod
+    def _evaluate(node: Node, masks: Dict[int, np.ndarray]) -> np.ndarray:
+        kind, arg = node
+        if kind == 'atom':
+            return masks[arg]
+        parts = [RulePlan._evaluate(p, masks) for p in arg]
+        return np.logical_or.reduce(parts) if kind == 'any' else np.logical_and.reduce(parts)
+
+    def _evaluate_type(self, alert_type: str, masks: Dict[int, np.ndarray], n: int) -> Tuple[np.ndarray, np.ndarray]:
+        rules = self.rules_by_type.get(alert_type, [])
+        if not rules:
+            return np.zeros(n, dtype=np.int8), np.full(n, -1, dtype=np.int16)
+        conditions = [self._evaluate(r.condition, masks) for r in rules]
+        index = np.select(conditions, list(range(len(rules))), -1).astype(np.int16)
+        codes = np.array([r.severity for r in rules] + [0], dtype=np.int8)
+        return codes[index], index  # index -1 picks the trailing 0
+
+    def evaluate(self, columns: Mapping[str, Any], n: int,
+                 alert_types: Optional[Tuple[str, ...]] = None,
+                 compare: Optional[Comparator] = None) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+        """Evaluate the alert rules over ``n`` rows of ``columns``.
+
+        Returns ``(severity, rule)``: alert type -> int8 severity codes, and
+        alert type -> int16 index into ``rules_by_type[type]`` (-1 where no
+        rule matched). ``compare`` may supply condition masks from a faster
+        index than a full comparison (see utils.what_if).
+        """
+        alert_types = self.alert_types if alert_types is None else alert_types
+        nodes = [r.condition for t in alert_types for r in self.rules_by_type.get(t, [])]
+        masks = self._atom_masks(nodes, columns, n, compare)
+        severity, rule = {}, {}
+        for alert_type in alert_types:
+            severity[alert_type], rule[alert_type] = self._evaluate_type(alert_type, masks, n)
+        return severity, rule
+
+    def severity(self, alert_type: str, columns: Mapping[str, Any], n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """``evaluate`` for a single alert type: (severity codes, matched-rule indexes)."""
+        severity, rule = self.evaluate(columns, n, (alert_type,))
+        return severity[alert_type], rule[alert_type]
+
+    def flags(self, columns: Mapping[str, Any], n: int) -> Dict[str, np.ndarray]:
+        """Evaluate the indicator flags (flag name -> bool array)."""
+        masks = self._atom_masks([f.condition for f in self.flag_rules], columns, n)
+        return {f.name: np.array(self._evaluate(f.condition, masks), dtype=bool) for f in self.flag_rules}
+
+    def message(self, alert_type: str, rule_index: int, columns: Mapping[str, Any], i: int) -> str:
+        """Message of the matched rule for row ``i``, formatted from that row's inputs."""
+        rule = self.rules_by_type[alert_type][rule_index]
+        values = {}
+        for field in rule.fields:
+            column = columns.get(field)
+            values[field] = _present(column[i] if np.ndim(column) else column)
+        return rule.message.format_map(values)
+
+
+# ----------------------------------------------------------------------
+# Cached, hot-reloaded plan
+# ----------------------------------------------------------------------
+_lock = threading.Lock()
+_plans: Dict[Path, Tuple[Optional[Tuple[int, int]], RulePlan]] = {}
+_errors: Dict[Path, str] = {}
+
+
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_rules(path: Optional[Path] = None) -> RulePlan:
+    """Read and compile a rule file (uncached)."""
+    path = Path(path or RULES_PATH)
+    raw = path.read_bytes()
+    try:
+        config = json.loads(raw)
+    except ValueError as e:
+        raise RuleConfigError(f"{path.name}: {e}") from None
+    return compile_rules(config, hashlib.sha1(raw).hexdigest()[:12])
+
+
+def rule_plan(path: Optional[Path] = None) -> RulePlan:
+    """The compiled plan for ``path``, recompiled only when the file changed.
+
+    If the file is edited into something invalid, the last good plan keeps
+    serving and the error is available from ``rules_error``.
+    """
+    path = Path(path or RULES_PATH)
+    signature = _stat_signature(path)
+    cached = _plans.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _lock:
+        cached = _plans.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        try:
+            plan = load_rules(path)
+        except Exception as e:  # any compile failure: keep serving the last good plan
+            if cached is None:
+                raise
+            _errors[path] = str(e)
+            _plans[path] = (signature, cached[1])
+            return cached[1]
+        _errors.pop(path, None)
+        _plans[path] = (signature, plan)
+        return plan
+
+
+def rules_error(path: Optional[Path] = None) -> Optional[str]:
+    """Why the last edit of the rule file was rejected (None if it compiled)."""
+    return _errors.get(Path(path or RULES_PATH))
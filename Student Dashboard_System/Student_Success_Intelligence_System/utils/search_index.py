@@ -0,0 +1,286 @@
+"""
+Search Index - prefix + n-gram index over student id, name and major
+
+Built once per data version. ``search`` ranks matches in tiers:
+
+* exact student id
+* prefix of a whole id or name (binary search over a sorted key array)
+* prefix of any word in the name or major
+* substring anywhere (trigram posting lists, then a containment check;
+  one- and two-character queries read their exact unigram/bigram list)
+* typo-tolerant, only when nothing above matched: rows sharing the most
+  trigrams with the query
+
+and returns up to ``limit`` row positions into the dataset frame, best first.
+An optional row ``mask`` restricts every tier, so the limit applies after
+filtering.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pandas string methods are used instead
+    pa = pc = None
+
+from .data_store import StudentDataset, _STRING_DTYPE
+
+
+SEARCH_FIELDS = ('student_id', 'name', 'major')
+DEFAULT_LIMIT = 50
+
+# Trigrams present in more than this share of rows carry little signal for
+# typo-tolerant matching and are skipped there.
+_COMMON_TRIGRAM_SHARE = 0.25
+_VERIFY_CHUNK = 1024
+_BUILD_CHUNK = 100_000
+
+
+def normalize(text) -> str:
+    return ' '.join(str(text).lower().split())
+
+
+def _normalize_column(values: pd.Series) -> np.ndarray:
+    """``normalize`` for a whole column, as a fixed-width unicode array."""
+    text = values.astype(_STRING_DTYPE).fillna('').str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+    return text.to_numpy(dtype=str)
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f" {text} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def _split_words(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Every space-separated word of every value, with the row it came from."""
+    if pc is not None:
+        lists = pc.split_pattern(pa.array(values, type=pa.string()), ' ')
+        words = pc.list_flatten(lists)
+        rows = pc.list_parent_indices(lists).to_numpy().astype(np.int64)
+        keep = pc.greater(pc.utf8_length(words), 0).to_numpy(zero_copy_only=False)
+        return words.to_numpy(zero_copy_only=False).astype(str)[keep], rows[keep]
+    words = pd.Series(values, dtype=object).str.split(' ').explode()
+    words = words[words.str.len() > 0]
+    return words.to_numpy(dtype=str), words.index.to_numpy(dtype=np.int64)
+
+
+def _sorted_keys(keys: List[np.ndarray], positions: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    if not keys:
+        return np.array([], dtype=str), np.array([], dtype=np.int64)
+    k = np.concatenate(keys)
+    p = np.concatenate(positions)
+    order = np.argsort(k, kind='stable')
+    return k[order], p[order]
+
+
+def _gram_code(gram: str) -> int:
+    """Pack up to three code points (21 bits each) into one integer key."""
+    code = 0
+    for ch in gram:
+        code = (code << 21) | ord(ch)
+    return code
+
+
+def _padded_chars(values: np.ndarray) -> np.ndarray:
+    """UTF-32 code points of ``" value "`` per row, zero-filled to a common width."""
+    width = values.dtype.itemsize // 4
+    chars = np.zeros((len(values), width + 2), dtype=np.uint64)
+    chars[:, 0] = ord(' ')
+    if width:
+        chars[:, 1:width + 1] = values.view(np.uint32).reshape(len(values), width)
+    chars[np.arange(len(values)), np.char.str_len(values) + 1] = ord(' ')
+    return chars
+
+
+def _gram_codes(chars: np.ndarray, n: int) -> np.ndarray:
+    """``_gram_code`` of every n-gram (n = 1..3) of each padded row; 0 where there is none.
+
+    Trigrams keep the padding spaces (they mark word boundaries for the typo
+    tier). Shorter grams skip any with a space: a normalized query of one or
+    two characters never has one.
+    """
+    if n == 3:
+        g = (chars[:, :-2] << np.uint64(42)) | (chars[:, 1:-1] << np.uint64(21)) | chars[:, 2:]
+        g[chars[:, 2:] == 0] = 0
+        return g
+    width = chars.shape[1] - n + 1
+    parts = [chars[:, i:i + width] for i in range(n)]
+    g = parts[0].copy()
+    blank = np.zeros(g.shape, dtype=bool)
+    for i, part in enumerate(parts):
+        if i:
+            g = (g << np.uint64(21)) | part
+        blank |= (part == 0) | (part == ord(' '))
+    g[blank] = 0
+    return g
+
+
+def _build_postings(columns: List[np.ndarray], size: int, lengths: Tuple[int, ...] = (3,),
+                    chunk: int = _BUILD_CHUNK) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted unique n-gram codes, CSR offsets and row postings for the padded column values.
+
+    Values are laid out as fixed-width UTF-32 so every n-gram of a chunk of
+    rows is computed with array shifts instead of Python string slicing.
+    Codes of different lengths never collide, so one index can hold several.
+    """
+    parts_codes, parts_rows = [], []
+    for start in range(0, size, chunk):
+        stop = min(start + chunk, size)
+        grams = []
+        for values in columns:
+            chars = _padded_chars(values[start:stop])
+            grams.extend(_gram_codes(chars, n) for n in lengths)
+        if not grams:
+            break
+        # One row of n-gram codes per student; sort and blank repeats so each counts once
+        grams = np.sort(np.hstack(grams), axis=1)
+        grams[:, 1:][grams[:, 1:] == grams[:, :-1]] = 0
+        valid = grams != 0
+        parts_codes.append(grams[valid])
+        parts_rows.append(np.broadcast_to(np.arange(start, stop, dtype=np.int32)[:, None], grams.shape)[valid])
+
+    if not parts_codes:
+        return np.array([], dtype=np.uint64), np.zeros(1, dtype=np.int64), np.array([], dtype=np.int32)
+    codes, rows = np.concatenate(parts_codes), np.concatenate(parts_rows)
+    # Rows are generated in ascending order, so a stable sort keeps every posting list sorted
+    order = np.argsort(codes, kind='stable')
+    codes, rows = codes[order], rows[order]
+    unique, counts = np.unique(codes, return_counts=True)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return unique, offsets, rows
+
+
+class SearchIndex:
+    """Prefix arrays and n-gram postings for one dataset version; see ``search_index``."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.size = len(frame)
+        fields = [f for f in SEARCH_FIELDS if f in frame.columns]
+        columns = {f: _normalize_column(frame[f]) for f in fields}
+        all_rows = np.arange(self.size, dtype=np.int64)
+
+        self._ids: Dict[str, int] = {}
+        if 'student_id' in columns:
+            ids = columns['student_id']
+            self._ids = dict(zip(reversed(ids.tolist()), range(self.size - 1, -1, -1)))
+
+        # Whole-value prefixes (id, name) and word prefixes (name, major words)
+        values = [columns[f] for f in ('student_id', 'name') if f in columns]
+        self._value_keys, self._value_pos = _sorted_keys(values, [all_rows] * len(values))
+        word_keys, word_pos = [], []
+        for f in ('name', 'major'):
+            if f in columns:
+                words, rows = _split_words(columns[f])
+                word_keys.append(words)
+                word_pos.append(rows)
+        self._word_keys, self._word_pos = _sorted_keys(word_keys, word_pos)
+
+        # Values each candidate is checked against for substring matches
+        self._columns = [values.tolist() for values in columns.values()]
+
+        # Postings in CSR form: postings[offsets[i]:offsets[i + 1]] for n-gram code i.
+        # Trigrams (padded) drive substring and typo matching; unigrams and
+        # bigrams answer shorter queries exactly.
+        self._trigrams = _build_postings([columns[f] for f in fields], self.size)
+        self._short_grams = _build_postings([columns[f] for f in fields], self.size, lengths=(1, 2))
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _prefix_range(keys: np.ndarray, prefix: str) -> Tuple[int, int]:
+        lo = int(np.searchsorted(keys, prefix, side='left'))
+        hi = int(np.searchsorted(keys, prefix + '\uffff', side='left'))
+        return lo, hi
+
+    def _posting(self, gram: str) -> np.ndarray:
+        """Rows (ascending) whose values contain ``gram``; trigrams may include padding."""
+        codes, offsets, postings = self._trigrams if len(gram) == 3 else self._short_grams
+        code = np.uint64(_gram_code(gram))
+        i = int(np.searchsorted(codes, code))
+        if i < len(codes) and codes[i] == code:
+            return postings[offsets[i]:offsets[i + 1]]
+        return postings[:0]
+
+    def _substring(self, query: str, needed: int, seen: Dict[int, int],
+                   mask: Optional[np.ndarray] = None) -> List[int]:
+        """Rows containing ``query``, scanning the shortest posting list first."""
+        if len(query) < 3:
+            # The unigram/bigram list is exactly the matching rows
+            candidates, verify = self._posting(query), False
+        else:
+            # Padded (word-boundary) trigrams do not apply to a match mid-word
+            grams = [g for g in _trigrams(query) if g.strip() == g]
+            candidates, verify = min((self._posting(g) for g in grams), key=len), True
+        if len(candidates) == 0:
+            return []
+        found: List[int] = []
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        for start in range(0, len(candidates), _VERIFY_CHUNK):
+            for pos in candidates[start:start + _VERIFY_CHUNK].tolist():
+                if pos not in seen and (not verify or any(query in values[pos] for values in self._columns)):
+                    found.append(pos)
+                    if len(found) >= needed:
+                        return found
+        return found
+
+    def _fuzzy(self, query: str, needed: int, seen: Dict[int, int],
+               mask: Optional[np.ndarray] = None) -> List[int]:
+        """Rows sharing the most padded trigrams with ``query`` (tolerates a typo or two)."""
+        grams = _trigrams(query)
+        postings = [p for p in (self._posting(g) for g in grams)
+                    if 0 < len(p) <= max(1, _COMMON_TRIGRAM_SHARE * self.size)]
+        if not postings:
+            return []
+        hits = np.bincount(np.concatenate(postings), minlength=self.size)
+        threshold = max(1, (len(grams) + 1) // 2)
+        candidates = np.flatnonzero(hits >= threshold if mask is None else (hits >= threshold) & mask)
+        if len(candidates) == 0:
+            return []
+        ranked = candidates[np.argsort(-hits[candidates], kind='stable')]
+        return [p for p in ranked[:needed + len(seen)].tolist() if p not in seen][:needed]
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, fuzzy: bool = True,
+               mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row positions matching ``query``, best match first (at most ``limit``).
+
+        With a boolean ``mask`` (one entry per row) only rows where it is
+        True are returned, and ``limit`` counts those rows only.
+        """
+        q = normalize(query)
+        if not q or limit <= 0:
+            return np.array([], dtype=np.int64)
+        ranked: Dict[int, int] = {}  # position -> tier, in rank order
+
+        def add(positions, tier):
+            for pos in positions:
+                if len(ranked) >= limit:
+                    return
+                ranked.setdefault(int(pos), tier)
+
+        if q in self._ids and (mask is None or mask[self._ids[q]]):
+            add([self._ids[q]], 0)
+        for tier, (keys, pos) in enumerate(((self._value_keys, self._value_pos),
+                                            (self._word_keys, self._word_pos)), start=1):
+            if len(ranked) >= limit:
+                break
+            lo, hi = self._prefix_range(keys, q)
+            matches = pos[lo:hi]
+            if mask is not None:
+                matches = matches[mask[matches]]
+            add(matches[:2 * limit], tier)
+        if len(ranked) < limit:
+            add(self._substring(q, limit - len(ranked), ranked, mask), 3)
+        if fuzzy and not ranked and len(q) >= 4:
+            add(self._fuzzy(q, limit - len(ranked), ranked, mask), 4)
+        return np.fromiter(ranked.keys(), dtype=np.int64, count=len(ranked))
+
+
+def search_index(dataset: StudentDataset) -> SearchIndex:
+    """The dataset's search index, built once per data version."""
+    return dataset.derived('search_index', lambda ds: SearchIndex(ds.frame))
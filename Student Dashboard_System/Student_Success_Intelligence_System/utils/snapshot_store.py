@@ -0,0 +1,243 @@
+"""
+Snapshot Store - precomputed risk snapshots on disk, written by precompute_snapshot.py
+
+A batch run scores the cohort outside Streamlit and writes one versioned
+directory per run under SNAPSHOT_DIR (default data/snapshots):
+
+- ``students.parquet``: enriched cohort after auto-flagging
+- ``report.parquet``: Student ID / Risk / Summary rows
+- ``entries.parquet``: alerted students in rank order, with their ranking keys
+- ``alerts.parquet``: their alerts, in the same order
+- ``manifest.json``: dataset digest, rule digest, counts and timings
+
+Directories are written under a temporary name and renamed into place, and
+``LATEST`` is replaced atomically, so a reader never sees a half-written
+snapshot. The dashboard opens the snapshot matching its dataset content and
+rule digest read-only through memory maps instead of rescoring; alert
+dicts are only built for the entries a page actually reads.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .alert_logic import AlertEntryList
+from .data_store import DATA_DIR, StudentDataset
+from .risk_snapshot import RiskSnapshot
+from .rule_engine import RulePlan
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # snapshots are neither written nor read; the dashboard rescores
+    pa = pq = None
+
+
+SNAPSHOT_DIR = Path(os.environ.get('SNAPSHOT_DIR', DATA_DIR / "snapshots"))
+FORMAT = 1
+KEEP = 3                 # snapshot directories kept by ``prune``
+MANIFEST = "manifest.json"
+LATEST = "LATEST"        # name of the most recently written snapshot directory
+
+_ENTRY_COLUMNS = ['student_id', 'name', 'advisor', 'risk_level', 'overall_score']
+_ALERT_COLUMNS = ['type', 'severity', 'message']
+
+
+class AlertEntries(AlertEntryList):
+    """``students_with_alerts`` of a stored snapshot.
+
+    Backed by the entry and alert tables; each ``get_students_with_alerts``
+    style dict is built when it is read, so opening a snapshot does not
+    depend on how many students have alerts.
+    """
+
+    def __init__(self, entries: pd.DataFrame, alerts: pd.DataFrame):
+        self._entries = entries
+        self._alerts = alerts
+        self._counts = entries['total'].to_numpy(dtype=np.int64)
+        self._offsets = np.concatenate(([0], np.cumsum(self._counts)))
+        self._keys = entries[['critical', 'total', 'cents']].to_numpy(dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def take(self, ranks: np.ndarray) -> List[Dict]:
+        if not len(ranks):
+            return []
+        rows = self._entries.iloc[ranks]
+        counts = self._counts[ranks]
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        # Alert rows of each entry, back to back: offsets[rank] .. offsets[rank] + count
+        alert_rows = np.repeat(self._offsets[ranks] - bounds[:-1], counts) + np.arange(bounds[-1])
+        alerts = self._alerts.iloc[alert_rows]
+        alert_dicts = [{'type': t, 'severity': s, 'message': m}
+                       for t, s, m in zip(*(alerts[c].tolist() for c in _ALERT_COLUMNS))]
+        bounds = bounds.tolist()
+        return [
+            {
+                'student_id': sid,
+                'name': name,
+                'advisor': advisor,
+                'alerts': alert_dicts[bounds[i]:bounds[i + 1]],
+                'risk_level': level,
+                'overall_score': float(score),
+            }
+            for i, (sid, name, advisor, level, score)
+            in enumerate(zip(*(rows[c].tolist() for c in _ENTRY_COLUMNS)))
+        ]
+
+    def keys(self) -> np.ndarray:
+        """Ranking keys (critical, total, score cents) per entry, as stored."""
+        return self._keys
+
+    def student_ids(self) -> np.ndarray:
+        return self._entries['student_id'].to_numpy(dtype=object)
+
+
+def _entry_tables(snapshot: RiskSnapshot) -> Dict[str, pd.DataFrame]:
+    entries = list(snapshot.students_with_alerts)
+    keys = snapshot.alert_keys
+    frame = pd.DataFrame({c: [s[c] for s in entries] for c in _ENTRY_COLUMNS})
+    frame['overall_score'] = frame['overall_score'].astype(float)
+    frame['critical'], frame['total'], frame['cents'] = keys[:, 0], keys[:, 1], keys[:, 2]
+    alerts = pd.DataFrame([(a['type'], a['severity'], a['message']) for s in entries for a in s['alerts']],
+                          columns=_ALERT_COLUMNS)
+    return {'entries': frame, 'alerts': alerts}
+
+
+def _write_parquet(frame: pd.DataFrame, path: Path) -> None:
+    pq.write_table(pa.Table.from_pandas(frame), str(path))
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    return pq.read_table(str(path), memory_map=True).to_pandas()
+
+
+def _read_manifest(directory: Path) -> Optional[Dict]:
+    try:
+        return json.loads((directory / MANIFEST).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+
+def write_snapshot(snapshot: RiskSnapshot, dataset: StudentDataset, plan: RulePlan,
+                   root: Optional[Path] = None, alerts_published: bool = False,
+                   seconds: Optional[float] = None) -> Path:
+    """Write ``snapshot`` as a new versioned directory and point LATEST at it."""
+    if pa is None:
+        raise RuntimeError("writing snapshots requires pyarrow")
+    root = Path(root or SNAPSHOT_DIR)
+    root.mkdir(parents=True, exist_ok=True)
+    created = datetime.now()
+    name = f"{created:%Y%m%d-%H%M%S}-{dataset.digest[:12]}-{plan.digest or 'adhoc'}"
+
+    staging = Path(tempfile.mkdtemp(prefix=".tmp-", dir=root))
+    try:
+        tables = {'students': snapshot.students, 'report': snapshot.report, **_entry_tables(snapshot)}
+        for table, frame in tables.items():
+            _write_parquet(frame, staging / f"{table}.parquet")
+        manifest = {
+            'format': FORMAT,
+            'created_at': created.isoformat(timespec='seconds'),
+            'dataset': {'source': str(dataset.source), 'digest': dataset.digest, 'rows': len(dataset.frame)},
+            'rules': {'version': plan.version, 'digest': plan.digest},
+            'students': len(snapshot.students),
+            'students_with_alerts': len(snapshot.students_with_alerts),
+            'total_alerts': snapshot.total_alerts,
+            'auto_flagged': snapshot.auto_flagged,
+            'alerts_published': alerts_published,
+            'seconds': None if seconds is None else round(seconds, 3),
+        }
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        target, run = root / name, 1
+        while target.exists():  # several runs within one second
+            target, run = root / f"{name}.{run}", run + 1
+        os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = root / f".{LATEST}.tmp"
+    pointer.write_text(target.name, encoding='utf-8')
+    os.replace(pointer, root / LATEST)
+    return target
+
+
+def snapshot_dirs(root: Optional[Path] = None) -> List[Path]:
+    """Snapshot directories under ``root``, newest first."""
+    root = Path(root or SNAPSHOT_DIR)
+    try:
+        dirs = [p for p in root.iterdir() if p.is_dir() and not p.name.startswith('.')]
+    except OSError:
+        return []
+    return sorted(dirs, key=lambda p: p.name, reverse=True)
+
+
+def find_snapshot(digest: str, rules_digest: str, root: Optional[Path] = None) -> Optional[Path]:
+    """The newest snapshot written for this dataset content and rule digest, if any."""
+    root = Path(root or SNAPSHOT_DIR)
+    try:
+        latest = [root / (root / LATEST).read_text(encoding='utf-8').strip()]
+    except OSError:
+        latest = []
+    for directory in latest + snapshot_dirs(root):
+        manifest = _read_manifest(directory)
+        if (manifest is not None and manifest.get('format') == FORMAT
+                and manifest['dataset']['digest'] == digest and manifest['rules']['digest'] == rules_digest):
+            return directory
+    return None
+
+
+def open_snapshot(directory: Path, version: int) -> RiskSnapshot:
+    """Memory-map a stored snapshot as the RiskSnapshot of data ``version``."""
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        raise ValueError(f"{directory.name}: missing or unreadable {MANIFEST}")
+    entries = AlertEntries(_read_parquet(directory / "entries.parquet"),
+                           _read_parquet(directory / "alerts.parquet"))
+    return RiskSnapshot(
+        version=version,
+        students=_read_parquet(directory / "students.parquet"),
+        students_with_alerts=entries,
+        total_alerts=int(manifest['total_alerts']),
+        auto_flagged=int(manifest['auto_flagged']),
+        report=_read_parquet(directory / "report.parquet"),
+        rules_version=manifest['rules']['digest'],
+        published=bool(manifest.get('alerts_published')),
+    )
+
+
+def load_snapshot(dataset: StudentDataset, plan: RulePlan, root: Optional[Path] = None) -> Optional[RiskSnapshot]:
+    """The stored snapshot for ``dataset`` under ``plan``, or None if there is no usable one."""
+    if pa is None or not plan.digest:
+        return None
+    directory = find_snapshot(dataset.digest, plan.digest, root)
+    if directory is None:
+        return None
+    try:
+        snapshot = open_snapshot(directory, dataset.version)
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        return None
+    return snapshot if len(snapshot.students) == len(dataset.frame) else None
+
+
+def prune(root: Optional[Path] = None, keep: int = KEEP) -> List[Path]:
+    """Delete all but the ``keep`` newest snapshots (never the one LATEST names)."""
+    root = Path(root or SNAPSHOT_DIR)
+    try:
+        latest = (root / LATEST).read_text(encoding='utf-8').strip()
+    except OSError:
+        latest = None
+    removed = []
+    for directory in snapshot_dirs(root)[max(keep, 1):]:
+        if directory.name != latest:
+            shutil.rmtree(directory, ignore_errors=True)
+            removed.append(directory)
+    return removed
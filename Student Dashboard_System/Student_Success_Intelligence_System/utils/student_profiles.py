@@ -0,0 +1,242 @@
+"""
+Student Profiles - synthetic advisor attributes and weighted risk
+
+The scalar helpers work on one student row; ``enrich_students`` derives the
+same columns for a whole cohort with NumPy column operations.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import parallel
+from .data_store import StudentDataset
+from .rule_engine import RulePlan, rule_plan
+
+
+_AID_OPTIONS = np.array(['On time', 'Delayed', 'Payment Plan'], dtype=object)
+_HOUSING_OPTIONS = np.array(['Commuter', 'On-campus'], dtype=object)
+_RISK_LABELS = np.array(['Low', 'Medium', 'High'], dtype=object)
+
+# Weighted risk policy: (academic, financial, engagement) weights and the
+# (Medium, High) score cut-offs
+RISK_WEIGHTS = (0.5, 0.3, 0.2)
+RISK_CUTOFFS = (40, 70)
+
+
+def _seed_from_id(student_id: str) -> int:
+    """Deterministic seed derived from student_id (stable across runs)."""
+    return sum(ord(c) for c in str(student_id))
+
+
+def synthesize_student_profile(row: pd.Series) -> dict:
+    """Create synthetic attributes for a student row based on existing fields.
+
+    Returns a dict with attendance_pct, unpaid_fees, counseling_visits,
+    warnings_count, financial_aid_status, engagement_score, gpa_drop,
+    housing, study_hours.
+    """
+    sid = row.get('student_id', '')
+    gpa = row.get('gpa', None)
+    credits = row.get('credits', 0)
+
+    seed = _seed_from_id(sid)
+
+    # Attendance: base around 75, influenced by GPA and seed
+    base_att = 75
+    if gpa is not None and not pd.isna(gpa):
+        base_att += int((gpa - 2.5) * 8)
+    attendance = int(max(30, min(100, base_att + (seed % 11) - 5)))
+
+    # Unpaid fees synthetic (0..1500)
+    unpaid_fees = (seed % 6) * 300  # 0,300,600,...1500
+
+    # Counseling visits 0..4
+    counseling = seed % 5
+
+    # Warnings count 0..3, slightly higher if low GPA
+    warnings = (seed % 4) + (1 if (gpa is not None and gpa < 2.5) else 0)
+
+    # Financial aid status
+    aid_options = ['On time', 'Delayed', 'Payment Plan']
+    financial_aid = aid_options[seed % len(aid_options)]
+
+    # Engagement score 0..100 influenced by GPA
+    eng = 60
+    if gpa is not None and not pd.isna(gpa):
+        eng += int((gpa - 2.5) * 12)
+    engagement = int(max(0, min(100, eng + (seed % 21) - 10)))
+
+    # GPA drop synthetic 0.0 .. 0.8
+    gpa_drop = round((seed % 9) / 10.0, 2)
+
+    # Housing
+    housing = 'Commuter' if (seed % 2 == 0) else 'On-campus'
+
+    # Study hours per week
+    study_hours = int(max(0, min(80, 15 + int((gpa or 2.5) * 6) + (seed % 21) - 10)))
+
+    return {
+        'attendance_pct': attendance,
+        'unpaid_fees': unpaid_fees,
+        'counseling_visits': counseling,
+        'warnings_count': warnings,
+        'financial_aid_status': financial_aid,
+        'engagement_score': engagement,
+        'gpa_drop': gpa_drop,
+        'housing': housing,
+        'study_hours': study_hours,
+        'credits': credits,
+    }
+
+
+def compute_indicator_flags(profile: dict, gpa: float) -> dict:
+    """Compute boolean flags for each rule from the synthetic profile and GPA.
+
+    The flags and their thresholds are the ``flags`` of config/alert_rules.json.
+    """
+    columns = {k: np.array([v]) for k, v in profile.items()}
+    columns['gpa'] = np.array([np.nan if gpa is None else gpa], dtype=np.float64)
+    return {name: bool(mask[0]) for name, mask in rule_plan().flags(columns, 1).items()}
+
+
+def compute_weighted_risk(profile: dict, gpa: float) -> tuple[int, str]:
+    """Return weighted risk score (0-100) and risk label based on academic, financial, engagement."""
+    # Academic component (0..100): lower GPA and GPA drop and low study hours raise risk
+    acad_score = 0
+    if gpa is None or pd.isna(gpa):
+        acad_score = 50
+    else:
+        # map GPA 4.0 -> 0 risk, 0.0 -> 100 risk
+        acad_score = int(max(0, min(100, (3.5 - gpa) / 3.5 * 100)))
+        # increase for large GPA drop
+        acad_score = min(100, acad_score + int(profile['gpa_drop'] * 40))
+        # study hours penalty
+        if profile['study_hours'] < 20:
+            acad_score = min(100, acad_score + 10)
+
+    # Financial component (0..100): unpaid fees scaled + delayed aid penalty
+    fin_score = int(min(100, profile['unpaid_fees'] / 2000 * 100))
+    if profile['financial_aid_status'] == 'Delayed':
+        fin_score = min(100, fin_score + 25)
+
+    # Engagement component (0..100): low engagement -> higher risk
+    eng_score = int(max(0, min(100, 100 - profile['engagement_score'])))
+
+    # Weighted aggregation
+    w_acad, w_fin, w_eng = RISK_WEIGHTS
+    total = int(round(w_acad * acad_score + w_fin * fin_score + w_eng * eng_score))
+
+    if total >= RISK_CUTOFFS[1]:
+        label = 'High'
+    elif total >= RISK_CUTOFFS[0]:
+        label = 'Medium'
+    else:
+        label = 'Low'
+
+    return total, label
+
+
+def seeds_from_ids(student_ids: pd.Series) -> np.ndarray:
+    """Vectorized ``_seed_from_id``: sum of code points of each id."""
+    ids = np.asarray(student_ids.astype(str).tolist(), dtype=np.str_)
+    if ids.dtype.itemsize == 0:
+        return np.zeros(len(ids), dtype=np.int64)
+    # Fixed-width UTF-32: one uint32 per character, zero padded
+    codes = ids.view(np.uint32).reshape(len(ids), -1)
+    return codes.sum(axis=1, dtype=np.int64)
+
+
+def risk_components(gpa: np.ndarray, gpa_drop: np.ndarray, study_hours: np.ndarray,
+                    unpaid_fees: np.ndarray, aid_delayed: np.ndarray,
+                    engagement: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized academic, financial and engagement components (0..100) of ``compute_weighted_risk``."""
+    acad = np.trunc(np.clip((3.5 - gpa) / 3.5 * 100, 0, 100))
+    acad = np.minimum(100, acad + np.trunc(gpa_drop * 40))
+    acad = np.where(study_hours < 20, np.minimum(100, acad + 10), acad)
+    acad = np.where(np.isnan(gpa), 50, acad)
+    fin = np.trunc(np.minimum(100, unpaid_fees / 2000 * 100))
+    fin = np.where(aid_delayed, np.minimum(100, fin + 25), fin)
+    eng = np.trunc(np.clip(100 - engagement, 0, 100))
+    return acad, fin, eng
+
+
+def enrich_students(df: pd.DataFrame, plan: Optional[RulePlan] = None) -> pd.DataFrame:
+    """Return a copy of ``df`` with the synthetic profile, risk and flag columns.
+
+    Column-wise equivalent of calling ``synthesize_student_profile``,
+    ``compute_weighted_risk`` and ``compute_indicator_flags`` on every row;
+    flags are boolean columns named after the flags of the rule ``plan``
+    (default: the current config/alert_rules.json).
+    """
+    n = len(df)
+    seed = seeds_from_ids(df['student_id']) if 'student_id' in df.columns else np.zeros(n, dtype=np.int64)
+    if 'gpa' in df.columns:
+        gpa = pd.to_numeric(df['gpa'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        gpa = np.full(n, np.nan)
+    has_gpa = ~np.isnan(gpa)
+    if 'credits' in df.columns:
+        credits = pd.to_numeric(df['credits'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        credits = np.zeros(n)
+
+    # Profile
+    base_att = 75 + np.where(has_gpa, np.trunc((gpa - 2.5) * 8), 0)
+    attendance = np.clip(base_att + (seed % 11) - 5, 30, 100).astype(np.int64)
+    unpaid_fees = (seed % 6) * 300
+    counseling = seed % 5
+    warnings = (seed % 4) + (gpa < 2.5)
+    aid_delayed = (seed % 3) == 1
+    eng = 60 + np.where(has_gpa, np.trunc((gpa - 2.5) * 12), 0)
+    engagement = np.clip(eng + (seed % 21) - 10, 0, 100).astype(np.int64)
+    gpa_drop = np.round((seed % 9) / 10.0, 2)
+    commuter = (seed % 2) == 0
+    study_gpa = np.where(has_gpa & (gpa != 0), gpa, 2.5)
+    study_hours = np.clip(15 + np.trunc(study_gpa * 6) + (seed % 21) - 10, 0, 80).astype(np.int64)
+
+    # Weighted risk
+    acad, fin, eng_score = risk_components(gpa, gpa_drop, study_hours, unpaid_fees, aid_delayed, engagement)
+    w_acad, w_fin, w_eng = RISK_WEIGHTS
+    risk_score = np.rint(w_acad * acad + w_fin * fin + w_eng * eng_score).astype(np.int64)
+
+    columns = {
+        'attendance_pct': attendance,
+        'unpaid_fees': unpaid_fees,
+        'counseling_visits': counseling,
+        'warnings_count': warnings,
+        'financial_aid_status': _AID_OPTIONS[seed % 3],
+        'engagement_score': engagement,
+        'gpa_drop': gpa_drop,
+        'housing': _HOUSING_OPTIONS[(~commuter).astype(np.int8)],
+        'study_hours': study_hours,
+        'risk_score': risk_score,
+        'risk_label': _RISK_LABELS[(risk_score >= RISK_CUTOFFS[0]).astype(np.int8) + (risk_score >= RISK_CUTOFFS[1])],
+    }
+    # Flags: one vectorized pass over the compiled rules
+    columns.update((plan or rule_plan()).flags({**columns, 'gpa': gpa, 'credits': credits}, n))
+    enriched = pd.DataFrame(columns, index=df.index)
+    base = df.drop(columns=[c for c in enriched.columns if c in df.columns])
+    return pd.concat([base, enriched], axis=1)
+
+
+def _build_enriched(dataset: StudentDataset, plan: RulePlan, key: str) -> pd.DataFrame:
+    base = dataset.previous  # read once: a newer reload may drop the link meanwhile
+    previous = base.peek(key) if base is not None else None
+    changes = dataset.changes() if previous is not None else None
+    if changes is None:
+        return parallel.map_frame(enrich_students, dataset.frame, plan)
+    # Every column depends only on its own row, so unchanged students are reused
+    return changes.patch(previous, parallel.map_frame(enrich_students, dataset.frame.iloc[changes.changed], plan))
+
+
+def enriched_students(dataset: StudentDataset, plan: Optional[RulePlan] = None) -> pd.DataFrame:
+    """``enrich_students`` for a dataset, computed once per data and rule version (read-only).
+
+    After a reload only inserted and updated students are enriched; the
+    rest are copied from the previous version's frame.
+    """
+    plan = plan or rule_plan()
+    key = f'student_profiles:{plan.digest}'
+    return dataset.derived(key, lambda ds: _build_enriched(ds, plan, key))
@@ -0,0 +1,318 @@
+"""
+What-If - re-score the whole cohort under a hypothetical risk policy
+
+A policy is a set of alert-rule thresholds plus the component weights and
+level cut-offs of the two risk scores (the advisor score of
+``compute_weighted_risk`` and the overall score of ``AlertSystem``).
+
+``WhatIfModel`` is built once per data and rule version. It keeps every
+thresholded feature sorted, so a threshold move is answered by binary
+search (``np.searchsorted``) and a scatter of the matching row positions
+instead of a comparison per rule and student. The score components are
+precomputed, so a weight move is three multiply-adds over the cohort.
+Results are cached per policy, so dragging a slider back is free.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .alert_logic import (OVERALL_WEIGHTS, RISK_CUTOFFS as OVERALL_CUTOFFS, SEVERITY_CRITICAL, SEVERITY_NONE,
+                          SEVERITY_WARNING, AlertSystem)
+from .data_store import StudentDataset, get_dataset
+from .lru import LRUCache
+from .risk_snapshot import alert_input_frame
+from .rule_engine import SEVERITY_NAMES, RulePlan, rule_plan
+from .student_profiles import RISK_CUTOFFS, RISK_WEIGHTS, enriched_students, risk_components
+
+
+LEVELS = ('Low', 'Medium', 'High')
+CHANGED_LIMIT = 100  # students listed in the diff whose advisor risk level moved
+
+Weights = Tuple[float, float, float]  # (academic, financial, engagement)
+Cutoffs = Tuple[float, float]         # (Medium, High)
+
+
+@dataclass(frozen=True)
+class Policy:
+    """Hypothetical risk policy; the defaults are the current one."""
+    thresholds: Tuple[Tuple[int, float], ...] = ()  # (rule atom index, threshold) overrides
+    risk_weights: Weights = RISK_WEIGHTS
+    risk_cutoffs: Cutoffs = RISK_CUTOFFS
+    overall_weights: Weights = OVERALL_WEIGHTS
+    overall_cutoffs: Cutoffs = OVERALL_CUTOFFS
+
+
+@dataclass(frozen=True)
+class ThresholdControl:
+    """A numeric rule threshold the simulator can move, with its slider range."""
+    atom: int
+    field: str
+    op: str
+    value: float
+    low: float
+    high: float
+    step: float
+    label: str
+
+
+@dataclass(frozen=True)
+class PolicyResult:
+    risk_score: np.ndarray     # advisor risk score (int, 0..100)
+    risk_level: np.ndarray     # advisor risk level code (index into LEVELS)
+    overall_level: np.ndarray  # AlertSystem risk level code
+    severity: Dict[str, np.ndarray]
+    critical_count: np.ndarray
+    alert_count: np.ndarray
+    matches: Dict[int, int]    # atom index -> students meeting that condition
+
+
+@dataclass(frozen=True)
+class WhatIfDiff:
+    summary: pd.DataFrame      # Metric / Current / What-if / Change
+    rules: pd.DataFrame        # Condition / Current / What-if / Change
+    transitions: pd.DataFrame  # advisor risk level, current (rows) x what-if (columns)
+    changed: pd.DataFrame      # up to CHANGED_LIMIT students whose advisor level moved
+    changed_count: int
+    seconds: float             # time to score the policy and diff it
+
+
+class SortedColumn:
+    """One feature sorted once; ``value <op> threshold`` masks and counts by binary search."""
+
+    def __init__(self, values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        self.size = len(values)
+        self.order = np.argsort(values, kind='stable')
+        self.values = values[self.order]
+        self.valid = self.size - int(np.isnan(self.values).sum())  # NaN sorts last and never matches
+
+    def bounds(self, op: str, threshold: float) -> Optional[Tuple[int, int]]:
+        """Slice of ``order`` that satisfies the condition (None for unsupported comparators)."""
+        valid = self.values[:self.valid]
+        if op == '<':
+            return 0, int(np.searchsorted(valid, threshold, 'left'))
+        if op == '<=':
+            return 0, int(np.searchsorted(valid, threshold, 'right'))
+        if op == '>':
+            return int(np.searchsorted(valid, threshold, 'right')), self.valid
+        if op == '>=':
+            return int(np.searchsorted(valid, threshold, 'left')), self.valid
+        if op == '==':
+            return int(np.searchsorted(valid, threshold, 'left')), int(np.searchsorted(valid, threshold, 'right'))
+        return None
+
+    def count(self, op: str, threshold: float) -> Optional[int]:
+        span = self.bounds(op, threshold)
+        return None if span is None else span[1] - span[0]
+
+    def mask(self, op: str, threshold: float) -> Optional[np.ndarray]:
+        span = self.bounds(op, threshold)
+        if span is None:
+            return None
+        lo, hi = span
+        if 2 * (hi - lo) <= self.size:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.order[lo:hi]] = True
+        else:
+            # Most rows match: clear the complement instead
+            mask = np.ones(self.size, dtype=bool)
+            mask[self.order[:lo]] = False
+            mask[self.order[hi:]] = False
+        return mask
+
+
+def _levels(score: np.ndarray, cutoffs: Cutoffs) -> np.ndarray:
+    return (score >= cutoffs[0]).astype(np.int8) + (score >= cutoffs[1])
+
+
+def _weighted(components: Tuple[np.ndarray, ...], weights: Weights) -> np.ndarray:
+    """Weighted sum of the components; weights are scaled to sum to 1."""
+    total = sum(weights) or 1.0
+    w0, w1, w2 = (w / total for w in weights)
+    return components[0] * w0 + components[1] * w1 + components[2] * w2
+
+
+def _atoms_of(node) -> List[int]:
+    kind, arg = node
+    return [arg] if kind == 'atom' else [i for part in arg for i in _atoms_of(part)]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+
+class WhatIfModel:
+    """Precomputed inputs of one dataset version for live policy simulation; see ``what_if_model``."""
+
+    def __init__(self, frame: pd.DataFrame, plan: RulePlan, cache_size: int = 32):
+        self.plan = plan
+        self.size = len(frame)
+        self.student_ids = frame['student_id'].to_numpy(dtype=object)
+        self.names = frame['name'].to_numpy(dtype=object) if 'name' in frame.columns else self.student_ids
+
+        # Alert rule inputs and the AlertSystem score components
+        self.inputs = AlertSystem.rule_inputs(alert_input_frame(frame))
+        self.overall_components = AlertSystem.component_scores(self.inputs)
+        # Advisor risk components (same inputs enrich_students used)
+        gpa = pd.to_numeric(frame['gpa'], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan) \
+            if 'gpa' in frame.columns else np.full(self.size, np.nan)
+        self.risk_components = risk_components(
+            gpa,
+            frame['gpa_drop'].to_numpy(dtype=np.float64),
+            frame['study_hours'].to_numpy(),
+            frame['unpaid_fees'].to_numpy(dtype=np.float64),
+            (frame['financial_aid_status'] == 'Delayed').to_numpy(dtype=bool),
+            frame['engagement_score'].to_numpy(),
+        )
+
+        self.type_atoms: Dict[str, set] = {
+            t: {i for r in rules for i in _atoms_of(r.condition)} for t, rules in plan.rules_by_type.items()
+        }
+        self.thresholds = self._threshold_controls()
+        self.columns: Dict[str, SortedColumn] = {
+            field: SortedColumn(self.inputs[field]) for field in dict.fromkeys(c.field for c in self.thresholds)
+        }
+        self._cache = LRUCache(cache_size)
+        self.current = self.evaluate(Policy())
+
+    def _threshold_controls(self) -> List[ThresholdControl]:
+        """One control per numeric condition of the alert rules, labelled by the rules using it."""
+        used: Dict[int, List[str]] = {}
+        for rule in self.plan.alert_rules:
+            label = f"{rule.alert_type} {SEVERITY_NAMES[rule.severity]}"
+            for atom in _atoms_of(rule.condition):
+                used.setdefault(atom, [])
+                if label not in used[atom]:
+                    used[atom].append(label)
+
+        controls = []
+        for atom in sorted(used):
+            field, op, threshold = self.plan.atoms[atom]
+            values = self.inputs.get(field)
+            if values is None or not _is_number(threshold) or values.dtype == bool:
+                continue
+            finite = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+            low = float(min(finite.min(), threshold)) if len(finite) else float(threshold)
+            high = float(max(finite.max(), threshold)) if len(finite) else float(threshold)
+            if isinstance(threshold, (int, np.integer)) and np.all(np.mod(finite, 1) == 0):
+                value, low, high, step = int(threshold), int(np.floor(low)), int(np.ceil(high)), 1
+            else:
+                value, step = float(threshold), 0.05 if high - low <= 10 else 1.0
+                low = round(float(np.floor(low / step) * step), 6)
+                high = round(float(np.ceil(high / step) * step), 6)
+            if low == high:
+                high = low + step
+            controls.append(ThresholdControl(atom, field, op, value, low, high, step,
+                                             f"{', '.join(used[atom])}: {field} {op}"))
+        return controls
+
+    def _compare(self, field: str, op: str, threshold: Any) -> Optional[np.ndarray]:
+        column = self.columns.get(field)
+        return column.mask(op, threshold) if column is not None and _is_number(threshold) else None
+
+    def _evaluate(self, policy: Policy) -> PolicyResult:
+        overrides = {i: t for i, t in policy.thresholds if t != self.plan.atoms[i][2]}
+        plan = self.plan.with_thresholds(overrides) if overrides else self.plan
+        base = getattr(self, 'current', None)
+        if base is None:
+            alert_types = plan.alert_types
+        else:
+            # Only alert types whose conditions moved are re-evaluated
+            alert_types = tuple(t for t in plan.alert_types if not self.type_atoms[t].isdisjoint(overrides))
+        if base is not None and not alert_types:
+            severity, critical, alerts = base.severity, base.critical_count, base.alert_count
+        else:
+            severity = dict(base.severity) if base is not None else {}
+            severity.update(plan.evaluate(self.inputs, self.size, alert_types, compare=self._compare)[0])
+            critical = np.zeros(self.size, dtype=np.int8)
+            alerts = np.zeros(self.size, dtype=np.int8)
+            for codes in severity.values():
+                critical += codes == SEVERITY_CRITICAL
+                alerts += codes != SEVERITY_NONE
+
+        risk_score = np.rint(_weighted(self.risk_components, policy.risk_weights)).astype(np.int64)
+        overall = _weighted(self.overall_components, policy.overall_weights)
+        matches = {}
+        for control in self.thresholds:
+            _, op, threshold = plan.atoms[control.atom]
+            matches[control.atom] = self.columns[control.field].count(op, threshold)
+        return PolicyResult(
+            risk_score=risk_score,
+            risk_level=_levels(risk_score, policy.risk_cutoffs),
+            overall_level=_levels(overall, policy.overall_cutoffs),
+            severity=severity,
+            critical_count=critical,
+            alert_count=alerts,
+            matches=matches,
+        )
+
+    def evaluate(self, policy: Policy) -> PolicyResult:
+        """Score the whole cohort under ``policy`` (cached per policy, read-only)."""
+        return self._cache.get_or_compute(policy, lambda: self._evaluate(policy))
+
+    def diff(self, policy: Policy) -> WhatIfDiff:
+        """Side-by-side comparison of ``policy`` with the current policy."""
+        started = time.perf_counter()
+        base, new = self.current, self.evaluate(policy)
+
+        rows = []
+        for name, base_level, new_level in (('advisor score', base.risk_level, new.risk_level),
+                                            ('alert score', base.overall_level, new.overall_level)):
+            before = np.bincount(base_level, minlength=3)
+            after = np.bincount(new_level, minlength=3)
+            for code in (2, 1, 0):
+                rows.append((f"{LEVELS[code]} risk ({name})", before[code], after[code]))
+        rows.append(("Students with a critical alert",
+                     np.count_nonzero(base.critical_count), np.count_nonzero(new.critical_count)))
+        rows.append(("Students with any alert",
+                     np.count_nonzero(base.alert_count), np.count_nonzero(new.alert_count)))
+        for alert_type in self.plan.alert_types:
+            defined = {r.severity for r in self.plan.rules_by_type[alert_type]}
+            for code in (c for c in (SEVERITY_CRITICAL, SEVERITY_WARNING) if c in defined):
+                rows.append((f"{alert_type} {SEVERITY_NAMES[code]}",
+                             np.count_nonzero(base.severity[alert_type] == code),
+                             np.count_nonzero(new.severity[alert_type] == code)))
+        summary = pd.DataFrame(rows, columns=['Metric', 'Current', 'What-if']).astype({'Current': int, 'What-if': int})
+        summary['Change'] = summary['What-if'] - summary['Current']
+
+        overrides = dict(policy.thresholds)
+        rule_rows = []
+        for control in self.thresholds:
+            condition = f"{control.field} {control.op} {control.value:g}"
+            threshold = overrides.get(control.atom, control.value)
+            if threshold != control.value:
+                condition += f" → {threshold:g}"
+            rule_rows.append((condition,
+                              base.matches[control.atom], new.matches[control.atom]))
+        rules = pd.DataFrame(rule_rows, columns=['Condition', 'Current', 'What-if'])
+        rules['Change'] = rules['What-if'] - rules['Current']
+
+        moves = np.bincount(base.risk_level.astype(np.intp) * 3 + new.risk_level, minlength=9).reshape(3, 3)
+        transitions = pd.DataFrame(moves[::-1, ::-1], index=[f"Now {l}" for l in LEVELS[::-1]],
+                                   columns=[f"What-if {l}" for l in LEVELS[::-1]])
+
+        changed = np.flatnonzero(base.risk_level != new.risk_level)
+        shown = changed
+        if len(shown) > CHANGED_LIMIT:
+            # Only the highest what-if scores are listed: partial selection, not a full sort
+            shown = shown[np.argpartition(-new.risk_score[shown], CHANGED_LIMIT - 1)[:CHANGED_LIMIT]]
+        shown = shown[np.lexsort((shown, -new.risk_score[shown]))]
+        changed_df = pd.DataFrame({
+            'Student ID': self.student_ids[shown],
+            'Name': self.names[shown],
+            'Current': [f"{LEVELS[l]} ({s})" for l, s in zip(base.risk_level[shown], base.risk_score[shown])],
+            'What-if': [f"{LEVELS[l]} ({s})" for l, s in zip(new.risk_level[shown], new.risk_score[shown])],
+        })
+        return WhatIfDiff(summary, rules, transitions, changed_df, len(changed),
+                          time.perf_counter() - started)
+
+
+def what_if_model(dataset: Optional[StudentDataset] = None, plan: Optional[RulePlan] = None) -> WhatIfModel:
+    """The what-if model of a dataset version and rule plan, built once."""
+    dataset = dataset if dataset is not None else get_dataset()
+    plan = plan or rule_plan()
+    return dataset.derived(f'what_if:{plan.digest}', lambda ds: WhatIfModel(enriched_students(ds, plan), plan))